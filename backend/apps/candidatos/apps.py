@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class CandidatosConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.candidatos'
+
+    def ready(self):
+        from apps.candidatos import signals  # noqa: F401 (registra los receivers)
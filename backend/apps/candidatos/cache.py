@@ -0,0 +1,35 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from apps.candidatos.models import Partido
+from apps.core.referencia import TablaReferencia
+
+# Partidos en memoria por proceso (ver apps.core.referencia)
+PARTIDOS = TablaReferencia(Partido, "sigla")
+
+
+def _clave_detalle(candidato_id):
+    return f"candidato:detalle:{candidato_id}"
+
+
+def obtener_detalle(candidato_id):
+    """Devuelve el detalle serializado (sin votos en vivo) o None si no está en caché."""
+    return cache.get(_clave_detalle(candidato_id))
+
+
+def guardar_detalle(candidato_id, data):
+    cache.set(
+        _clave_detalle(candidato_id),
+        dict(data),
+        settings.CANDIDATO_DETALLE_CACHE_SEGUNDOS,
+    )
+
+
+def invalidar_detalles(candidato_ids):
+    """
+    Elimina de la caché el detalle de los candidatos indicados al confirmar la
+    transacción en curso (de inmediato si no hay una). Antes del commit, una
+    lectura concurrente volvería a guardar los datos anteriores.
+    """
+    claves = [_clave_detalle(candidato_id) for candidato_id in candidato_ids]
+    transaction.on_commit(lambda: cache.delete_many(claves))
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+from apps.candidatos.models import IndiceBusqueda
+from apps.candidatos.search import actualizar_indice
+
+
+class Command(BaseCommand):
+    help = "Reconstruye el índice de búsqueda (full-text y trigramas) de todos los candidatos"
+
+    def handle(self, *args, **options):
+        actualizar_indice()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Índice de búsqueda actualizado: {IndiceBusqueda.objects.count()} candidatos."
+            )
+        )
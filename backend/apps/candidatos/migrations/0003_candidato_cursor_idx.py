@@ -0,0 +1,17 @@
+# Generated by Django 5.2.7 on 2026-10-18 15:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('candidatos', '0002_alter_candidato_foto_url'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='candidato',
+            index=models.Index(fields=['cargo', 'id'], name='candidatos_cargo_cursor_idx'),
+        ),
+    ]
@@ -0,0 +1,59 @@
+# Generated by Django 5.2.7 on 2026-10-18 15:39
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+import django.db.models.deletion
+from django.contrib.postgres.operations import TrigramExtension, UnaccentExtension
+from django.db import migrations, models
+
+
+def crear_configuracion(apps, schema_editor):
+    """Configuración de texto 'es_unaccent': español, ignorando tildes."""
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute(
+        """
+        DO $$
+        BEGIN
+            IF NOT EXISTS (SELECT 1 FROM pg_ts_config WHERE cfgname = 'es_unaccent') THEN
+                CREATE TEXT SEARCH CONFIGURATION es_unaccent (COPY = spanish);
+                ALTER TEXT SEARCH CONFIGURATION es_unaccent
+                    ALTER MAPPING FOR hword, hword_part, word WITH unaccent, spanish_stem;
+            END IF;
+        END
+        $$;
+        """
+    )
+
+
+def eliminar_configuracion(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute("DROP TEXT SEARCH CONFIGURATION IF EXISTS es_unaccent")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('candidatos', '0003_candidato_cursor_idx'),
+    ]
+
+    operations = [
+        UnaccentExtension(),
+        TrigramExtension(),
+        migrations.RunPython(crear_configuracion, eliminar_configuracion),
+        migrations.CreateModel(
+            name='IndiceBusqueda',
+            fields=[
+                ('candidato', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='busqueda', serialize=False, to='candidatos.candidato', verbose_name='Candidato')),
+                ('documento', django.contrib.postgres.search.SearchVectorField(null=True, verbose_name='Documento de búsqueda')),
+                ('nombre', models.CharField(blank=True, max_length=320, verbose_name='Nombre normalizado')),
+            ],
+            options={
+                'verbose_name': 'Índice de búsqueda',
+                'verbose_name_plural': 'Índices de búsqueda',
+                'db_table': 'candidatos_busqueda',
+                'indexes': [django.contrib.postgres.indexes.GinIndex(fields=['documento'], name='busqueda_documento_gin'), django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass('nombre', name='gin_trgm_ops'), name='busqueda_nombre_trgm')],
+            },
+        ),
+    ]
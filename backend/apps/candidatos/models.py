@@ -1,3 +1,5 @@
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
 from apps.core.models import Region, Cargo, TimeStampedModel
 
@@ -67,6 +69,9 @@ class Candidato(TimeStampedModel):
                 fields=["cargo", "region"]
             ),  # Para búsquedas rápidas por cargo y región
             models.Index(fields=["partido"]),
+            models.Index(
+                fields=["cargo", "id"], name="candidatos_cargo_cursor_idx"
+            ),  # Para paginación por cursor filtrada por cargo
         ]
         # Constraint: Un candidato solo puede postular una vez al mismo cargo en la misma región
         constraints = [
@@ -137,3 +142,40 @@ class Antecedente(TimeStampedModel):
 
     def __str__(self):
         return f"{self.tipo.upper()}: {self.titulo} ({self.candidato.get_full_name()})"
+
+
+class IndiceBusqueda(models.Model):
+    """
+    Índice de búsqueda de un candidato (tabla aparte para no cargar el
+    tsvector en cada consulta de candidatos).
+    - documento: nombres (peso A), partido (B) y antecedentes (C) con la
+      configuración es_unaccent (español sin tildes).
+    - nombre: nombre completo sin tildes y en minúsculas, para trigramas.
+    Lo mantiene apps.candidatos.search; no editar a mano.
+    """
+
+    candidato = models.OneToOneField(
+        Candidato,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="busqueda",
+        verbose_name="Candidato",
+    )
+    documento = SearchVectorField(null=True, verbose_name="Documento de búsqueda")
+    nombre = models.CharField(
+        max_length=320, blank=True, verbose_name="Nombre normalizado"
+    )
+
+    class Meta:
+        db_table = "candidatos_busqueda"
+        verbose_name = "Índice de búsqueda"
+        verbose_name_plural = "Índices de búsqueda"
+        indexes = [
+            GinIndex(fields=["documento"], name="busqueda_documento_gin"),
+            GinIndex(
+                OpClass("nombre", name="gin_trgm_ops"), name="busqueda_nombre_trgm"
+            ),  # Tolerancia a errores de tipeo
+        ]
+
+    def __str__(self):
+        return self.nombre
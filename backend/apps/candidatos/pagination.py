@@ -0,0 +1,15 @@
+from rest_framework.pagination import CursorPagination
+
+
+class CandidatoCursorPagination(CursorPagination):
+    """
+    Paginación por cursor (keyset) para scroll infinito.
+    - Ordena por ID: clave estable y única, la página N cuesta lo mismo que la 1
+      (WHERE id > cursor en lugar de OFFSET) y no hace COUNT(*).
+    - Este orden reemplaza al del listado paginado por número; la vista rechaza
+      ?ordering en este modo.
+    - Se apoya en el índice (cargo, id) de Candidato.
+    """
+
+    ordering = "id"
+    cursor_query_param = "cursor"
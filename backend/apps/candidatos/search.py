@@ -0,0 +1,107 @@
+import re
+import unicodedata
+from django.contrib.postgres.aggregates import StringAgg
+from django.contrib.postgres.lookups import Unaccent
+from django.contrib.postgres.search import (
+    SearchQuery,
+    SearchRank,
+    SearchVector,
+    TrigramWordSimilarity,
+)
+from django.db.models import F, OuterRef, Q, Subquery, TextField, Value
+from django.db.models.functions import Concat, Lower
+from apps.candidatos.models import Antecedente, Candidato, IndiceBusqueda, Partido
+
+# Configuración de texto creada en la migración 0004: español + unaccent
+CONFIG = "es_unaccent"
+MAX_RESULTADOS = 20
+
+
+def normalizar(texto):
+    """'López' -> 'lopez' (sin tildes y en minúsculas, igual que el índice)"""
+    sin_tildes = unicodedata.normalize("NFKD", texto)
+    return "".join(c for c in sin_tildes if not unicodedata.combining(c)).lower()
+
+
+def actualizar_indice(candidato_ids=None):
+    """
+    Recalcula el índice de búsqueda de los candidatos indicados (o de todos).
+    Dos consultas: crea las filas que falten y las actualiza con un solo UPDATE.
+    """
+    candidatos = Candidato.objects.all()
+    if candidato_ids is not None:
+        candidatos = candidatos.filter(id__in=list(candidato_ids))
+
+    IndiceBusqueda.objects.bulk_create(
+        [IndiceBusqueda(candidato_id=cid) for cid in candidatos.values_list("id", flat=True)],
+        ignore_conflicts=True,
+    )
+
+    nombre = Subquery(
+        Candidato.objects.filter(pk=OuterRef("candidato_id"))
+        .annotate(
+            texto=Concat(
+                "nombre", Value(" "), "apellido_paterno", Value(" "), "apellido_materno"
+            )
+        )
+        .values("texto")
+    )
+    partido = Subquery(
+        Partido.objects.filter(candidatos=OuterRef("candidato_id"))
+        .annotate(texto=Concat("sigla", Value(" "), "nombre_partido"))
+        .values("texto")
+    )
+    antecedentes = Subquery(
+        Antecedente.objects.filter(candidato=OuterRef("candidato_id"))
+        .values("candidato")
+        .annotate(
+            texto=StringAgg(
+                Concat("titulo", Value(" "), "descripcion", output_field=TextField()),
+                delimiter=" ",
+            )
+        )
+        .values("texto")
+    )
+
+    IndiceBusqueda.objects.filter(candidato__in=candidatos).update(
+        documento=SearchVector(nombre, config=CONFIG, weight="A")
+        + SearchVector(partido, config=CONFIG, weight="B")
+        + SearchVector(antecedentes, config=CONFIG, weight="C"),
+        nombre=Lower(Unaccent(nombre)),
+    )
+
+
+def buscar_candidatos(texto, queryset):
+    """
+    Búsqueda rankeada sobre el índice:
+    - Full-text con prefijos ("lop" encuentra "López") sobre nombres, partido
+      y antecedentes.
+    - Similitud de trigramas sobre el nombre para tolerar errores ("Lopes").
+
+    Args:
+        texto (str): Lo que escribió el usuario
+        queryset: Queryset base de Candidato (filtros, select_related, etc.)
+    """
+    palabras = re.findall(r"\w+", normalizar(texto))
+    if not palabras:
+        return queryset.none()
+
+    # Las palabras solo tienen caracteres \w: es seguro armar la consulta raw
+    consulta = SearchQuery(
+        " & ".join(f"{palabra}:*" for palabra in palabras),
+        config=CONFIG,
+        search_type="raw",
+    )
+    normalizado = " ".join(palabras)
+
+    return (
+        queryset.filter(
+            Q(busqueda__documento=consulta)
+            | Q(busqueda__nombre__trigram_word_similar=normalizado)
+        )
+        .annotate(
+            relevancia=SearchRank(F("busqueda__documento"), consulta)
+            + TrigramWordSimilarity(normalizado, "busqueda__nombre")
+        )
+        .order_by("-relevancia", "apellido_paterno")[:MAX_RESULTADOS]
+    )
@@ -122,17 +122,30 @@ class CandidatoDetailSerializer(serializers.ModelSerializer):
             return {"id": 0, "nombre_region": "Perú"}
         return None
 
+    def _antecedentes_por_tipo(self, obj):
+        """
+        Agrupa los antecedentes por tipo en una sola pasada.
+        Usa el prefetch de la vista (obj.antecedentes.all()) en lugar de
+        filtrar en la BD, que dispararía una consulta por tipo.
+        """
+        if not hasattr(obj, "_antecedentes_por_tipo"):
+            grupos = {tipo: [] for tipo, _ in Antecedente.TIPO_CHOICES}
+            for antecedente in obj.antecedentes.all():
+                grupos.setdefault(antecedente.tipo, []).append(antecedente)
+            obj._antecedentes_por_tipo = grupos
+        return obj._antecedentes_por_tipo
+
     def get_denuncias(self, obj):
         """Devuelve solo las denuncias del candidato"""
-        denuncias = obj.antecedentes.filter(tipo="denuncia")
+        denuncias = self._antecedentes_por_tipo(obj)["denuncia"]
         return AntecedenteSerializer(denuncias, many=True).data
 
     def get_proyectos(self, obj):
         """Devuelve solo los proyectos del candidato"""
-        proyectos = obj.antecedentes.filter(tipo="proyecto")
+        proyectos = self._antecedentes_por_tipo(obj)["proyecto"]
         return AntecedenteSerializer(proyectos, many=True).data
 
     def get_propuestas(self, obj):
         """Devuelve solo las propuestas del candidato"""
-        propuestas = obj.antecedentes.filter(tipo="propuesta")
+        propuestas = self._antecedentes_por_tipo(obj)["propuesta"]
         return AntecedenteSerializer(propuestas, many=True).data
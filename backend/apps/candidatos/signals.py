@@ -0,0 +1,47 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from apps.candidatos.cache import invalidar_detalles
+from apps.candidatos.models import Antecedente, Candidato, Partido
+from apps.candidatos.search import actualizar_indice
+
+
+def _borrado_en_cascada(origin):
+    """True si el borrado viene de un candidato o partido (el índice se borra solo)."""
+    modelo = getattr(origin, "model", type(origin))
+    return modelo in (Candidato, Partido)
+
+
+@receiver(post_save, sender=Candidato)
+def candidato_guardado(sender, instance, **kwargs):
+    invalidar_detalles([instance.pk])
+    actualizar_indice([instance.pk])
+
+
+@receiver(post_delete, sender=Candidato)
+def candidato_eliminado(sender, instance, **kwargs):
+    invalidar_detalles([instance.pk])
+
+
+@receiver(post_save, sender=Antecedente)
+def antecedente_guardado(sender, instance, **kwargs):
+    invalidar_detalles([instance.candidato_id])
+    actualizar_indice([instance.candidato_id])
+
+
+@receiver(post_delete, sender=Antecedente)
+def antecedente_eliminado(sender, instance, origin=None, **kwargs):
+    invalidar_detalles([instance.candidato_id])
+    if not _borrado_en_cascada(origin):
+        actualizar_indice([instance.candidato_id])
+
+
+@receiver(post_save, sender=Partido)
+def partido_guardado(sender, instance, **kwargs):
+    # El detalle y el índice de cada candidato incluyen los datos de su partido
+    candidato_ids = list(instance.candidatos.values_list("id", flat=True))
+    invalidar_detalles(candidato_ids)
+    actualizar_indice(candidato_ids)
+
+
+# Al borrar un partido sus candidatos se borran en cascada: candidato_eliminado
+# invalida el detalle de cada uno.
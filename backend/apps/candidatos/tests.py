@@ -1,3 +1,136 @@
-from django.test import TestCase
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework_simplejwt.tokens import RefreshToken  # type: ignore
+from apps.candidatos.cache import obtener_detalle
+from apps.candidatos.models import Antecedente, Candidato
+from apps.core.consultas import PresupuestoConsultasTestMixin
+from apps.core.referencia import invalidar_referencias
+from apps.votos.tests import cliente_con_token, crear_eleccion
 
-# Create your tests here.
+
+class PresupuestoCandidatosTests(PresupuestoConsultasTestMixin, TestCase):
+    """Cada endpoint de candidatos se mantiene dentro de su presupuesto_consultas."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.datos = crear_eleccion()
+        cls.presidente = cls.datos["candidatos"]["Presidente"]
+        for tipo in ("denuncia", "proyecto", "propuesta", "propuesta"):
+            Antecedente.objects.create(
+                candidato=cls.presidente,
+                tipo=tipo,
+                titulo=f"Un {tipo}",
+                descripcion="Detalle",
+                fecha="2025-01-15",
+            )
+
+    def setUp(self):
+        cache.clear()
+        invalidar_referencias()
+
+    def test_listado(self):
+        respuesta = self.get_con_presupuesto(reverse("candidatos_list"), {"cargo": "Diputado"})
+
+        self.assertEqual(respuesta.status_code, 200)
+        self.assertEqual(respuesta.json()["count"], 2)
+
+    def test_listado_por_cursor(self):
+        respuesta = self.get_con_presupuesto(
+            reverse("candidatos_list"), {"paginacion": "cursor"}
+        )
+
+        self.assertEqual(respuesta.status_code, 200)
+        self.assertEqual(len(respuesta.json()["results"]), 4)
+        ids = [candidato["id"] for candidato in respuesta.json()["results"]]
+        self.assertEqual(ids, sorted(ids))
+
+    def test_listado_por_cursor_rechaza_ordering(self):
+        respuesta = self.client.get(
+            reverse("candidatos_list"), {"paginacion": "cursor", "ordering": "nombre"}
+        )
+
+        self.assertEqual(respuesta.status_code, 400)
+        self.assertIn("ordering", respuesta.json())
+
+    def test_detalle_sin_cache_y_con_cache(self):
+        ruta = reverse("candidato_detail", args=[self.presidente.id])
+
+        primera = self.get_con_presupuesto(ruta)
+        segunda = self.get_con_presupuesto(ruta)
+
+        self.assertEqual(primera.status_code, 200)
+        self.assertEqual(primera.json(), segunda.json())
+        self.assertEqual(len(primera.json()["propuestas"]), 2)
+        self.assertEqual(len(primera.json()["denuncias"]), 1)
+
+    def test_detalle_con_token(self):
+        self.client = cliente_con_token(self.datos["usuario"])
+
+        respuesta = self.get_con_presupuesto(
+            reverse("candidato_detail", args=[self.presidente.id])
+        )
+
+        self.assertEqual(respuesta.status_code, 200)
+
+    def test_exceder_presupuesto_no_falla_la_peticion(self):
+        # Un token sin claims (emitido antes) agrega la consulta del usuario
+        token = RefreshToken.for_user(self.datos["usuario"]).access_token
+        ruta = reverse("candidato_detail", args=[self.presidente.id])
+
+        with self.assertLogs("apps.core.middleware", "WARNING"):
+            with override_settings(INSTRUMENTACION_MUESTREO=1.0):
+                respuesta = self.client.get(ruta, HTTP_AUTHORIZATION=f"Bearer {token}")
+
+        self.assertEqual(respuesta.status_code, 200)
+
+    def test_partidos(self):
+        self.get_con_presupuesto(reverse("partidos_list"))  # Carga la tabla en memoria
+
+        with self.assertNumQueries(0):
+            respuesta = self.client.get(reverse("partidos_list"))
+
+        self.assertEqual(respuesta.status_code, 200)
+        self.assertEqual(respuesta.json()["results"][0]["sigla"], "PP")
+
+
+class DetalleCacheTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.candidato = crear_eleccion()["candidatos"]["Senador"]
+
+    def setUp(self):
+        cache.clear()
+        self.ruta = reverse("candidato_detail", args=[self.candidato.id])
+        self.client.get(self.ruta)  # Deja el detalle en caché
+
+    def test_invalida_al_confirmar_la_transaccion(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            Antecedente.objects.create(
+                candidato=self.candidato,
+                tipo="proyecto",
+                titulo="Ley de prueba",
+                descripcion="Detalle",
+                fecha="2025-03-01",
+            )
+            # Antes del commit se sigue sirviendo la versión anterior
+            self.assertIsNotNone(obtener_detalle(self.candidato.id))
+
+        for callback in callbacks:
+            callback()
+        self.assertIsNone(obtener_detalle(self.candidato.id))
+        self.assertEqual(len(self.client.get(self.ruta).json()["proyectos"]), 1)
+
+    def test_invalida_al_eliminar_el_partido(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.candidato.partido.delete()
+
+        self.assertIsNone(obtener_detalle(self.candidato.id))
+
+    def test_candidato_desactivado_sin_senales(self):
+        Candidato.objects.filter(pk=self.candidato.pk).update(activo=False)
+
+        respuesta = self.client.get(self.ruta)
+
+        self.assertEqual(respuesta.status_code, 404)
+        self.assertIsNotNone(obtener_detalle(self.candidato.id))  # Sigue en caché
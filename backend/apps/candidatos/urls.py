@@ -3,6 +3,7 @@ from apps.candidatos import views
 
 urlpatterns = [
     path("", views.CandidatoListView.as_view(), name="candidatos_list"),
+    path("buscar/", views.CandidatoBusquedaView.as_view(), name="candidatos_buscar"),
     path("<int:pk>/", views.CandidatoDetailView.as_view(), name="candidato_detail"),
     path("partidos/", views.PartidoListView.as_view(), name="partidos_list"),
 ]
@@ -1,15 +1,23 @@
+from django.http import Http404
 from rest_framework import generics, filters
+from rest_framework.exceptions import ValidationError
 from rest_framework.permissions import AllowAny
-from django.db.models import Count
-from apps.candidatos.models import Candidato, Partido
+from rest_framework.response import Response
+from apps.candidatos.models import Candidato
 from apps.candidatos.serializers import (
     CandidatoListSerializer,
     CandidatoDetailSerializer,
     PartidoSerializer,
 )
+from apps.candidatos.cache import PARTIDOS, guardar_detalle, obtener_detalle
+from apps.candidatos.pagination import CandidatoCursorPagination
+from apps.candidatos.search import buscar_candidatos
+from apps.core.consultas import PresupuestoConsultasMixin
+from apps.core.replicas import en_primaria
+from apps.votos.services import anotar_total_votos, obtener_total_votos
 
 
-class CandidatoListView(generics.ListAPIView):
+class CandidatoListView(PresupuestoConsultasMixin, generics.ListAPIView):
     """
     GET /api/candidatos/
     Lista todos los candidatos con filtros.
@@ -19,11 +27,15 @@ class CandidatoListView(generics.ListAPIView):
     - region: Filtrar por región (solo para Diputados)
     - partido: Filtrar por ID de partido
     - search: Buscar por nombre del candidato
+    - paginacion: 'cursor' para paginación por cursor (scroll infinito, sin COUNT);
+      se navega con los enlaces next/previous. En este modo el orden es por ID
+      (clave del cursor) y no se acepta ?ordering
 
     Ejemplos:
     - /api/candidatos/?cargo=Presidente
     - /api/candidatos/?cargo=Diputado&region=15  (Diputados de Lima)
     - /api/candidatos/?search=Juan
+    - /api/candidatos/?cargo=Diputado&paginacion=cursor
     """
 
     serializer_class = CandidatoListSerializer
@@ -32,18 +44,36 @@ class CandidatoListView(generics.ListAPIView):
     search_fields = ["nombre", "apellido_paterno", "apellido_materno"]
     ordering_fields = ["nombre"]  # solo permitimos ordenar por nombre
     ordering = ["nombre"]  # orden A–Z por defecto
+    presupuesto_consultas = 2  # COUNT + página
+    lectura_replica = True
+
+    @classmethod
+    def presupuesto_para(cls, parametros):
+        # Por cursor no hay COUNT: solo la página
+        if parametros.get("paginacion") == "cursor":
+            return 1
+        return cls.presupuesto_consultas
+
+    @property
+    def paginator(self):
+        """Usa paginación por cursor si se pide con ?paginacion=cursor"""
+        if not hasattr(self, "_paginator") and (
+            self.request.query_params.get("paginacion") == "cursor"
+        ):
+            if "ordering" in self.request.query_params:
+                raise ValidationError(
+                    {"ordering": "La paginación por cursor siempre ordena por ID"}
+                )
+            self._paginator = CandidatoCursorPagination()
+        return super().paginator
 
     def get_queryset(self):
         """
         Queryset con filtros y conteo de votos.
         """
-        queryset = (
-            Candidato.objects.filter(activo=True)
-            .select_related("partido", "cargo", "region")
-            .annotate(
-                total_votos=Count(
-                    "votos_recibidos"
-                )  # Cuenta los votos de cada candidato
+        queryset = anotar_total_votos(  # Conteo materializado (ver apps.votos)
+            Candidato.objects.filter(activo=True).select_related(
+                "partido", "cargo", "region"
             )
         )
 
@@ -65,28 +95,101 @@ class CandidatoListView(generics.ListAPIView):
         return queryset.order_by("partido__sigla", "apellido_paterno")
 
 
-class CandidatoDetailView(generics.RetrieveAPIView):
+class CandidatoBusquedaView(PresupuestoConsultasMixin, generics.ListAPIView):
+    """
+    GET /api/candidatos/buscar/?q=lopez
+    Búsqueda rankeada de candidatos (PostgreSQL full-text + trigramas).
+
+    - Ignora tildes y mayúsculas: "lopez" encuentra "López".
+    - Coincide por prefijo mientras se escribe: "lop" encuentra "López".
+    - Tolera errores de tipeo en el nombre: "Lopes".
+    - Busca también en el partido (sigla y nombre) y en los antecedentes.
+
+    Query params:
+    - q: Texto a buscar (mínimo 2 caracteres)
+    - cargo: Filtrar por cargo (opcional)
+
+    Devuelve los 20 resultados más relevantes, sin paginación.
+    """
+
+    serializer_class = CandidatoListSerializer
+    permission_classes = [AllowAny]
+    pagination_class = None
+    presupuesto_consultas = 1  # Búsqueda
+    lectura_replica = True
+
+    def get_queryset(self):
+        texto = self.request.query_params.get("q", "").strip()
+        if len(texto) < 2:
+            raise ValidationError({"q": "Escribe al menos 2 caracteres"})
+
+        queryset = anotar_total_votos(
+            Candidato.objects.filter(activo=True).select_related(
+                "partido", "cargo", "region"
+            )
+        )
+
+        cargo = self.request.query_params.get("cargo", None)
+        if cargo:
+            queryset = queryset.filter(cargo__nombre_cargo=cargo)
+
+        return buscar_candidatos(texto, queryset)
+
+
+class CandidatoDetailView(PresupuestoConsultasMixin, generics.RetrieveAPIView):
     """
     GET /api/candidatos/{id}/
     Obtiene el detalle completo de un candidato con sus antecedentes.
+
+    La parte estática (datos, partido, antecedentes) se guarda en caché por
+    candidato y se invalida con señales (ver apps.candidatos.signals);
+    total_votos se lee en vivo del conteo en cada petición.
     """
 
-    queryset = (
+    queryset = anotar_total_votos(
         Candidato.objects.filter(activo=True)
         .select_related("partido", "cargo", "region")
         .prefetch_related("antecedentes")
-        .annotate(total_votos=Count("votos_recibidos"))
     )
     serializer_class = CandidatoDetailSerializer
     permission_classes = [AllowAny]
-
-
-class PartidoListView(generics.ListAPIView):
+    presupuesto_consultas = 2  # Candidato + antecedentes
+    lectura_replica = True
+
+    def retrieve(self, request, *args, **kwargs):
+        candidato_id = kwargs["pk"]
+        data = obtener_detalle(candidato_id)
+
+        if data is None:
+            # Lo que se guarda en caché se lee de la primaria (ver en_primaria)
+            with en_primaria():
+                candidato = self.get_object()
+                data = self.get_serializer(candidato).data
+            guardar_detalle(candidato_id, data)
+            total_votos = candidato.total_votos
+        else:
+            # activo se verifica en vivo: update(activo=False) no emite señales
+            total_votos = obtener_total_votos(candidato_id)
+            if total_votos is None:
+                raise Http404
+
+        return Response({**data, "total_votos": total_votos})
+
+
+class PartidoListView(PresupuestoConsultasMixin, generics.ListAPIView):
     """
     GET /api/partidos/
     Lista todos los partidos políticos.
     """
 
-    queryset = Partido.objects.filter(activo=True).order_by("sigla")
     serializer_class = PartidoSerializer
     permission_classes = [AllowAny]
+    presupuesto_consultas = 1  # 0 con la tabla de referencia ya cargada (1 al recargarla)
+    lectura_replica = True
+
+    def get_queryset(self):
+        # Lista en memoria: la paginación de DRF también funciona con listas
+        return sorted(
+            (partido for partido in PARTIDOS.todos() if partido.activo),
+            key=lambda partido: partido.sigla,
+        )
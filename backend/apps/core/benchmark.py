@@ -0,0 +1,86 @@
+import statistics
+import threading
+import time
+from django.db import connection
+
+
+def percentiles(latencias):
+    """
+    Resume una lista de latencias (segundos) en milisegundos.
+
+    Returns:
+        dict: {"p50": ..., "p95": ..., "p99": ..., "max": ...}
+    """
+    if not latencias:
+        return {"p50": None, "p95": None, "p99": None, "max": None}
+
+    ordenadas = sorted(latencias)
+    if len(ordenadas) == 1:
+        cortes = ordenadas * 99
+    else:
+        cortes = statistics.quantiles(ordenadas, n=100, method="inclusive")
+
+    return {
+        "p50": round(cortes[49] * 1000, 3),
+        "p95": round(cortes[94] * 1000, 3),
+        "p99": round(cortes[98] * 1000, 3),
+        "max": round(ordenadas[-1] * 1000, 3),
+    }
+
+
+def ejecutar_concurrente(operacion, hilos, iteraciones):
+    """
+    Ejecuta `operacion(hilo, i)` en paralelo desde varios hilos.
+    Cada hilo usa su propia conexión a la BD y la cierra al terminar.
+
+    Args:
+        operacion (callable): Función a medir, recibe (número de hilo, iteración)
+        hilos (int): Cantidad de hilos concurrentes
+        iteraciones (int): Llamadas por hilo
+
+    Returns:
+        dict: {"operaciones", "errores", "segundos", "por_segundo", "latencia_ms"}
+    """
+    latencias = []
+    errores = []
+    barrera = threading.Barrier(hilos + 1)
+    lock = threading.Lock()
+
+    def trabajador(hilo):
+        propias = []
+        fallidas = 0
+        barrera.wait()
+        try:
+            for i in range(iteraciones):
+                inicio = time.perf_counter()
+                try:
+                    operacion(hilo, i)
+                except Exception:
+                    fallidas += 1
+                    continue
+                propias.append(time.perf_counter() - inicio)
+        finally:
+            connection.close()
+            with lock:
+                latencias.extend(propias)
+                errores.append(fallidas)
+
+    threads = [
+        threading.Thread(target=trabajador, args=(h,)) for h in range(hilos)
+    ]
+    for thread in threads:
+        thread.start()
+
+    barrera.wait()
+    inicio = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    segundos = time.perf_counter() - inicio
+
+    return {
+        "operaciones": len(latencias),
+        "errores": sum(errores),
+        "segundos": round(segundos, 3),
+        "por_segundo": round(len(latencias) / segundos, 1) if segundos else None,
+        "latencia_ms": percentiles(latencias),
+    }
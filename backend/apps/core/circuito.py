@@ -0,0 +1,88 @@
+import threading
+import time
+
+CERRADO = "cerrado"
+ABIERTO = "abierto"
+SEMIABIERTO = "semiabierto"
+
+
+class Circuito:
+    """
+    Circuit breaker para servicios externos (estado por proceso).
+
+    - cerrado: las llamadas pasan; `umbral_fallos` fallos seguidos lo abren.
+    - abierto: las llamadas fallan de inmediato durante `segundos_abierto`.
+    - semiabierto: pasada la espera se permite una sola llamada de prueba;
+      si funciona se cierra, si falla vuelve a abrirse.
+
+    Uso:
+        if not circuito.permitir():
+            raise ServicioNoDisponible()
+        try:
+            llamar_servicio()
+        except ErrorDelServicio:
+            circuito.registrar_fallo()
+            raise
+        circuito.registrar_exito()
+    """
+
+    def __init__(self, nombre, umbral_fallos=5, segundos_abierto=30):
+        self.nombre = nombre
+        self.umbral_fallos = umbral_fallos
+        self.segundos_abierto = segundos_abierto
+        self._estado = CERRADO
+        self._fallos = 0
+        self._abierto_desde = None
+        self._prueba_en_curso = False
+        self._aperturas = 0
+        self._lock = threading.Lock()
+
+    def permitir(self):
+        """True si la llamada puede hacerse ahora."""
+        with self._lock:
+            if self._estado == CERRADO:
+                return True
+            if self._estado == ABIERTO:
+                if time.monotonic() - self._abierto_desde < self.segundos_abierto:
+                    return False
+                self._estado = SEMIABIERTO
+            # Semiabierto: una sola llamada de prueba a la vez
+            if self._prueba_en_curso:
+                return False
+            self._prueba_en_curso = True
+            return True
+
+    def registrar_exito(self):
+        with self._lock:
+            self._estado = CERRADO
+            self._fallos = 0
+            self._prueba_en_curso = False
+
+    def registrar_fallo(self):
+        with self._lock:
+            self._fallos += 1
+            if self._estado == SEMIABIERTO or self._fallos >= self.umbral_fallos:
+                if self._estado != ABIERTO:
+                    self._aperturas += 1
+                self._estado = ABIERTO
+                self._abierto_desde = time.monotonic()
+            self._prueba_en_curso = False
+
+    def estado(self):
+        """
+        Returns:
+            dict: {"nombre", "estado", "fallos_consecutivos", "aperturas",
+            "reintento_en_segundos"}
+        """
+        with self._lock:
+            reintento = None
+            if self._estado == ABIERTO:
+                restante = self.segundos_abierto - (time.monotonic() - self._abierto_desde)
+                reintento = round(max(restante, 0), 1)
+            return {
+                "nombre": self.nombre,
+                "estado": self._estado,
+                "fallos_consecutivos": self._fallos,
+                "aperturas": self._aperturas,
+                "reintento_en_segundos": reintento,
+            }
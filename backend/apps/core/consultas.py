@@ -0,0 +1,85 @@
+from contextlib import contextmanager
+from urllib.parse import parse_qsl, urlsplit
+from django.db import connections
+from django.test.utils import CaptureQueriesContext
+from django.urls import resolve
+
+
+class PresupuestoConsultasExcedido(AssertionError):
+    """Una operación ejecutó más consultas SQL de las declaradas."""
+
+
+@contextmanager
+def presupuesto_consultas(maximo, descripcion="", using="default"):
+    """
+    Falla si el bloque ejecuta más de `maximo` consultas SQL.
+    Pensado para tests y para verificar vistas en desarrollo:
+
+        with presupuesto_consultas(2, "detalle de candidato"):
+            client.get("/api/candidatos/1/")
+
+    Raises:
+        PresupuestoConsultasExcedido: Con el SQL ejecutado, para ubicar el N+1
+    """
+    with CaptureQueriesContext(connections[using]) as capturadas:
+        yield capturadas
+
+    if len(capturadas) > maximo:
+        detalle = "\n".join(
+            f"  {i}. {q['sql']}" for i, q in enumerate(capturadas.captured_queries, 1)
+        )
+        raise PresupuestoConsultasExcedido(
+            f"{descripcion or 'Bloque'} ejecutó {len(capturadas)} consultas "
+            f"(presupuesto: {maximo}):\n{detalle}"
+        )
+
+
+class PresupuestoConsultasMixin:
+    """
+    Mixin para vistas DRF que declara cuántas consultas SQL puede hacer la vista:
+
+        class CandidatoDetailView(PresupuestoConsultasMixin, generics.RetrieveAPIView):
+            presupuesto_consultas = 3
+
+    El presupuesto se hace cumplir en los tests (PresupuestoConsultasTestMixin).
+    En ejecución no corta la petición: InstrumentacionMiddleware registra un
+    warning cuando una petición muestreada lo excede.
+
+    Si el presupuesto depende de los query params (p. ej. el modo de
+    paginación), la vista sobrescribe presupuesto_para().
+    """
+
+    presupuesto_consultas = None
+
+    @classmethod
+    def presupuesto_para(cls, parametros):
+        """Presupuesto de una petición con estos query params."""
+        return cls.presupuesto_consultas
+
+
+def presupuesto_de_ruta(ruta, data=None):
+    """Presupuesto declarado por la vista que atiende `ruta` (None si no declara)."""
+    partes = urlsplit(ruta)
+    funcion = resolve(partes.path).func
+    vista = getattr(funcion, "view_class", None) or getattr(funcion, "cls", None)
+    if not hasattr(vista, "presupuesto_para"):
+        return None
+    return vista.presupuesto_para({**dict(parse_qsl(partes.query)), **(data or {})})
+
+
+class PresupuestoConsultasTestMixin:
+    """
+    Mixin para TestCase: hace fallar el test si un GET excede el presupuesto
+    que declara su vista.
+
+        class CandidatoTests(PresupuestoConsultasTestMixin, TestCase):
+            def test_detalle(self):
+                respuesta = self.get_con_presupuesto(f"/api/candidatos/{id}/")
+    """
+
+    def get_con_presupuesto(self, ruta, data=None, **extra):
+        presupuesto = presupuesto_de_ruta(ruta, data)
+        if presupuesto is None:
+            self.fail(f"La vista de {ruta} no declara presupuesto_consultas")
+        with presupuesto_consultas(presupuesto, f"GET {ruta}"):
+            return self.client.get(ruta, data, **extra)
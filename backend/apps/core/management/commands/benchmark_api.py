@@ -0,0 +1,183 @@
+import json
+import platform
+import threading
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from apps.candidatos.models import Candidato
+from apps.core.benchmark import ejecutar_concurrente
+from apps.core.management.commands.generar_electorado import PREFIJO_DNI
+from apps.usuarios.models import Usuario
+from apps.usuarios.tokens import TokenVotante
+from apps.votos.models import Voto, VotoPendiente
+from apps.votos.services import recalcular_conteos
+
+# Endpoints medidos: nombre -> (método, nombre de URL, query string, estados OK)
+ENDPOINTS = {
+    "votar": ("post", "votar", "", (201, 202)),
+    "resultados": ("get", "resultados_generales", "", (200,)),
+    "candidatos": ("get", "candidatos_list", "?cargo=Presidente", (200,)),
+    "estadisticas": ("get", "estadisticas", "", (200,)),
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Mide latencia (p50/p95/p99), throughput y consultas SQL por petición de "
+        "votar, resultados, candidatos y estadísticas con hilos concurrentes. "
+        "Pensado para correr sobre el electorado de generar_electorado; emite JSON."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--endpoints",
+            nargs="+",
+            choices=list(ENDPOINTS),
+            default=list(ENDPOINTS),
+            help="Endpoints a medir (por defecto todos)",
+        )
+        parser.add_argument(
+            "--hilos",
+            type=int,
+            default=8,
+            help="Clientes concurrentes (por defecto 8)",
+        )
+        parser.add_argument(
+            "--peticiones",
+            type=int,
+            default=200,
+            help="Peticiones por hilo y endpoint (por defecto 200)",
+        )
+        parser.add_argument(
+            "--calentamiento",
+            type=int,
+            default=10,
+            help="Peticiones GET sin medir antes de cada endpoint (cachés en régimen)",
+        )
+        parser.add_argument(
+            "--salida",
+            help="Archivo donde escribir el JSON (por defecto la salida estándar)",
+        )
+
+    def handle(self, *args, **options):
+        hilos, peticiones = options["hilos"], options["peticiones"]
+        total = hilos * peticiones
+
+        votantes = []
+        if "votar" in options["endpoints"]:
+            votantes = self._votantes_disponibles(total)
+
+        candidatos = list(
+            Candidato.objects.filter(activo=True, cargo__nombre_cargo="Presidente").values_list(
+                "id", flat=True
+            )
+        )
+        if not candidatos:
+            raise CommandError("No hay candidatos. Ejecuta primero load_seed.")
+
+        # Un token por votante (votar) y uno compartido para las lecturas
+        lector = votantes[0] if votantes else Usuario.objects.first()
+        if lector is None:
+            raise CommandError("No hay usuarios. Ejecuta primero generar_electorado.")
+        token_lector = str(TokenVotante.for_user(lector).access_token)
+        tokens = [str(TokenVotante.for_user(u).access_token) for u in votantes]
+
+        resultados = {}
+        try:
+            for nombre in options["endpoints"]:
+                metodo, url_nombre, query, esperados = ENDPOINTS[nombre]
+                url = reverse(url_nombre) + query
+
+                if metodo == "get":
+                    cliente = Client(HTTP_AUTHORIZATION=f"Bearer {token_lector}")
+                    for _ in range(options["calentamiento"]):
+                        cliente.get(url)
+
+                resultados[nombre] = self._medir(
+                    metodo, url, esperados, hilos, peticiones, tokens, token_lector, candidatos
+                )
+        finally:
+            if votantes:
+                ids = [u.id for u in votantes]
+                VotoPendiente.objects.filter(usuario_id__in=ids).delete()
+                Voto.objects.filter(
+                    usuario_id__in=ids, cargo__nombre_cargo="Presidente"
+                ).delete()
+                recalcular_conteos()
+
+        informe = {
+            "fecha": timezone.now().isoformat(),
+            "configuracion": {
+                "hilos": hilos,
+                "peticiones_por_hilo": peticiones,
+                "calentamiento": options["calentamiento"],
+            },
+            "entorno": {
+                "python": platform.python_version(),
+                "base_de_datos": connection.vendor,
+                "votos_ingesta": settings.VOTOS_INGESTA,
+                "votos_conteo_shards": settings.VOTOS_CONTEO_SHARDS,
+                "usuarios": Usuario.objects.count(),
+                "votos": Voto.objects.count(),
+            },
+            "endpoints": resultados,
+        }
+
+        contenido = json.dumps(informe, indent=2, ensure_ascii=False)
+        if options["salida"]:
+            with open(options["salida"], "w", encoding="utf-8") as archivo:
+                archivo.write(contenido + "\n")
+            self.stderr.write(f"Informe escrito en {options['salida']}")
+        else:
+            self.stdout.write(contenido)
+
+    def _votantes_disponibles(self, cantidad):
+        """Votantes sintéticos que aún no votaron por Presidente (cada uno vota una vez)."""
+        votantes = list(
+            Usuario.objects.filter(dni__startswith=PREFIJO_DNI)
+            .exclude(votos__cargo__nombre_cargo="Presidente")
+            .order_by("id")[:cantidad]
+        )
+        if len(votantes) < cantidad:
+            raise CommandError(
+                f"Se necesitan {cantidad} votantes sintéticos sin voto presidencial y hay "
+                f"{len(votantes)}. Ejecuta generar_electorado con --participacion menor a 1."
+            )
+        return votantes
+
+    def _medir(self, metodo, url, esperados, hilos, peticiones, tokens, token_lector, candidatos):
+        consultas = []
+        lock = threading.Lock()
+        clientes = {}
+
+        def operacion(hilo, i):
+            cliente = clientes.get(hilo)
+            if cliente is None:
+                cliente = clientes[hilo] = Client()
+
+            with CaptureQueriesContext(connection) as capturadas:
+                if metodo == "post":
+                    respuesta = cliente.post(
+                        url,
+                        {"candidato_id": candidatos[i % len(candidatos)]},
+                        content_type="application/json",
+                        HTTP_AUTHORIZATION=f"Bearer {tokens[hilo * peticiones + i]}",
+                    )
+                else:
+                    respuesta = cliente.get(url, HTTP_AUTHORIZATION=f"Bearer {token_lector}")
+
+            with lock:
+                consultas.append(len(capturadas))
+            if respuesta.status_code not in esperados:
+                raise RuntimeError(respuesta.status_code)
+
+        resultado = ejecutar_concurrente(operacion, hilos, peticiones)
+        resultado["consultas_sql"] = {
+            "promedio": round(sum(consultas) / len(consultas), 2) if consultas else None,
+            "max": max(consultas, default=None),
+        }
+        return resultado
@@ -0,0 +1,164 @@
+import copy
+import threading
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections, connections
+from django.db.utils import load_backend
+from django.test import Client
+from django.urls import reverse
+from apps.core.benchmark import ejecutar_concurrente, percentiles
+from apps.usuarios.models import Usuario
+from apps.usuarios.tokens import TokenVotante
+
+# Endpoints baratos, donde abrir la conexión domina la latencia:
+# nombre -> (nombre de URL, kwargs)
+ENDPOINTS = {
+    "puede_votar": ("puede_votar_cargo", {"cargo_nombre": "Presidente"}),
+    "regiones": ("listar_regiones", {}),
+}
+MODOS = ["directa", "persistente", "pool", "pgbouncer"]
+
+
+class Command(BaseCommand):
+    help = (
+        "Compara los modos de conexión a la BD (DB_CONEXIONES) con peticiones "
+        "concurrentes a endpoints baratos: latencia, throughput, tiempo en abrir "
+        "conexiones y sesiones de PostgreSQL creadas."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--modos",
+            nargs="+",
+            choices=MODOS,
+            default=["directa", "persistente", "pool"],
+            help=(
+                "Modos a medir (por defecto directa, persistente y pool). pgbouncer "
+                "solo tiene sentido con DB_HOST/DB_PORT apuntando a PgBouncer"
+            ),
+        )
+        parser.add_argument(
+            "--endpoints",
+            nargs="+",
+            choices=list(ENDPOINTS),
+            default=list(ENDPOINTS),
+            help="Endpoints a medir (por defecto todos)",
+        )
+        parser.add_argument(
+            "--hilos",
+            type=int,
+            default=4,
+            help="Clientes concurrentes (por defecto 4)",
+        )
+        parser.add_argument(
+            "--peticiones",
+            type=int,
+            default=300,
+            help="Peticiones por hilo, modo y endpoint (por defecto 300)",
+        )
+
+    def handle(self, *args, **options):
+        if connections["default"].vendor != "postgresql":
+            raise CommandError("benchmark_conexiones requiere PostgreSQL.")
+        if "pool" in options["modos"] and settings.DB_POOL["max_size"] < options["hilos"]:
+            raise CommandError(
+                f"DB_POOL_MAX ({settings.DB_POOL['max_size']}) es menor que --hilos: "
+                "los hilos esperarían conexiones libres."
+            )
+
+        usuario = Usuario.objects.filter(is_active=True).first()
+        if usuario is None:
+            raise CommandError("No hay usuarios. Ejecuta primero generar_electorado.")
+        token = str(TokenVotante.for_user(usuario).access_token)
+        # El pool de "default" es compartido: que ninguna conexión previa lo use
+        connections.close_all()
+
+        self.stdout.write(
+            f"{options['hilos']} hilos x {options['peticiones']} peticiones; "
+            f"health checks {'sí' if settings.DATABASES['default']['CONN_HEALTH_CHECKS'] else 'no'}\n"
+        )
+        self.stdout.write(
+            f"{'modo':<12} {'endpoint':<12} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} "
+            f"{'p99 ms':>8} {'connect()':>10} {'ms/connect':>11} {'sesiones':>9}"
+        )
+        for modo in options["modos"]:
+            for nombre in options["endpoints"]:
+                url_nombre, kwargs = ENDPOINTS[nombre]
+                r = self._medir(
+                    modo, reverse(url_nombre, kwargs=kwargs), token, options["hilos"],
+                    options["peticiones"],
+                )
+                latencia = r["latencia_ms"]
+                self.stdout.write(
+                    f"{modo:<12} {nombre:<12} {r['por_segundo']:>8} {latencia['p50']:>8} "
+                    f"{latencia['p95']:>8} {latencia['p99']:>8} {r['conexiones']:>10} "
+                    f"{r['conexion_ms']['p50'] or 0:>11} {r['sesiones']:>9}"
+                    + (f"  ({r['errores']} errores)" if r["errores"] else "")
+                )
+
+        self.stdout.write(
+            "\nconnect() = conexiones abiertas por Django (en pool, tomadas del pool); "
+            "ms/connect = p50 de su duración; sesiones = procesos backend de "
+            "PostgreSQL distintos usados."
+        )
+
+    def _configuracion(self, modo):
+        """Copia de DATABASES["default"] con el modo indicado (igual que en settings)."""
+        configuracion = copy.deepcopy(settings.DATABASES["default"])
+        configuracion["OPTIONS"].pop("pool", None)
+        configuracion["CONN_MAX_AGE"] = 0
+        configuracion["DISABLE_SERVER_SIDE_CURSORS"] = modo == "pgbouncer"
+        if modo in ("persistente", "pgbouncer"):
+            configuracion["CONN_MAX_AGE"] = settings.DB_CONN_MAX_AGE
+        elif modo == "pool":
+            configuracion["OPTIONS"]["pool"] = settings.DB_POOL
+        return configuracion
+
+    def _medir(self, modo, url, token, hilos, peticiones):
+        configuracion = self._configuracion(modo)
+        backend = load_backend(configuracion["ENGINE"])
+        conexiones, sesiones = [], set()
+        lock = threading.Lock()
+        clientes = {}
+
+        def medir_conexion(conexion):
+            conectar = conexion.connect
+
+            def conectar_medido():
+                inicio = time.perf_counter()
+                conectar()
+                duracion = time.perf_counter() - inicio
+                with lock:
+                    conexiones.append(duracion)
+                    sesiones.add(conexion.connection.info.backend_pid)
+
+            conexion.connect = conectar_medido
+
+        def operacion(hilo, i):
+            cliente = clientes.get(hilo)
+            if cliente is None:
+                # Conexión propia del hilo con la configuración del modo
+                conexion = backend.DatabaseWrapper(configuracion, "default")
+                medir_conexion(conexion)
+                connections["default"] = conexion
+                cliente = clientes[hilo] = Client(HTTP_AUTHORIZATION=f"Bearer {token}")
+
+            # El cliente de pruebas no emite request_started/finished hacia
+            # close_old_connections: se replica aquí el ciclo de una petición real
+            close_old_connections()
+            respuesta = cliente.get(url)
+            close_old_connections()
+            if respuesta.status_code != 200:
+                raise RuntimeError(respuesta.status_code)
+
+        try:
+            resultado = ejecutar_concurrente(operacion, hilos, peticiones)
+        finally:
+            if modo == "pool":
+                backend.DatabaseWrapper(configuracion, "default").close_pool()
+
+        resultado["conexiones"] = len(conexiones)
+        resultado["conexion_ms"] = percentiles(conexiones)
+        resultado["sesiones"] = len(sesiones)
+        return resultado
@@ -0,0 +1,296 @@
+import random
+import time
+from datetime import timedelta
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils import timezone
+from apps.candidatos.models import Candidato
+from apps.core.models import Region
+from apps.usuarios.models import Usuario
+from apps.votos.models import Voto, VotoPendiente
+from apps.votos.services import recalcular_conteos
+
+PREFIJO_DNI = "S"  # DNIs sintéticos S0000001... (los reales son solo dígitos)
+
+# Población aproximada por región (miles, censo 2017): reparte el electorado
+POBLACION_REGIONES = {
+    "Amazonas": 380,
+    "Áncash": 1084,
+    "Apurímac": 406,
+    "Arequipa": 1383,
+    "Ayacucho": 617,
+    "Cajamarca": 1342,
+    "Callao": 994,
+    "Cusco": 1206,
+    "Huancavelica": 347,
+    "Huánuco": 722,
+    "Ica": 851,
+    "Junín": 1247,
+    "La Libertad": 1779,
+    "Lambayeque": 1198,
+    "Lima": 9485,
+    "Loreto": 884,
+    "Madre de Dios": 141,
+    "Moquegua": 174,
+    "Pasco": 254,
+    "Piura": 1857,
+    "Puno": 1173,
+    "San Martín": 813,
+    "Tacna": 330,
+    "Tumbes": 225,
+    "Ucayali": 496,
+}
+
+COLUMNAS_USUARIO = [
+    "dni",
+    "nombre",
+    "apellido_paterno",
+    "apellido_materno",
+    "region_id",
+    "rol",
+    "password",
+    "is_active",
+    "is_staff",
+    "is_superuser",
+    "created_at",
+    "updated_at",
+]
+COLUMNAS_VOTO = ["usuario_id", "candidato_id", "cargo_id", "created_at", "updated_at"]
+
+
+class Command(BaseCommand):
+    help = (
+        "Genera un electorado sintético a escala de elección: votantes repartidos por "
+        "población en las 25 regiones y cédulas según una distribución de popularidad "
+        "de candidatos. En PostgreSQL inserta con COPY, por lotes."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--votantes",
+            type=int,
+            default=1_000_000,
+            help="Votantes sintéticos a crear (por defecto 1000000)",
+        )
+        parser.add_argument(
+            "--participacion",
+            type=float,
+            default=0.8,
+            help="Probabilidad de que un votante vote en cada cargo (por defecto 0.8)",
+        )
+        parser.add_argument(
+            "--distribucion",
+            choices=["zipf", "uniforme"],
+            default="zipf",
+            help=(
+                "Popularidad de los candidatos de cada cargo y región: zipf (pocos "
+                "concentran los votos) o uniforme (por defecto zipf)"
+            ),
+        )
+        parser.add_argument(
+            "--exponente",
+            type=float,
+            default=1.0,
+            help="Exponente de la distribución zipf (por defecto 1.0)",
+        )
+        parser.add_argument(
+            "--horas",
+            type=float,
+            default=10,
+            help="Los votos se reparten en las últimas N horas (por defecto 10)",
+        )
+        parser.add_argument(
+            "--lote",
+            type=int,
+            default=50_000,
+            help="Votantes por lote/transacción (por defecto 50000)",
+        )
+        parser.add_argument(
+            "--semilla",
+            type=int,
+            default=2026,
+            help="Semilla aleatoria (misma semilla = mismo electorado)",
+        )
+        parser.add_argument(
+            "--limpiar",
+            action="store_true",
+            help="Elimina el electorado sintético (usuarios y votos) y termina",
+        )
+
+    def handle(self, *args, **options):
+        if options["limpiar"]:
+            self._limpiar()
+            return
+
+        if not 0 <= options["participacion"] <= 1:
+            raise CommandError("--participacion debe estar entre 0 y 1")
+        if options["votantes"] > 9_999_999:
+            raise CommandError("--votantes admite como máximo 9999999 (DNI de 8 caracteres)")
+        if Usuario.objects.filter(dni__startswith=PREFIJO_DNI).exists():
+            raise CommandError(
+                "Ya existe un electorado sintético; elimínalo con --limpiar antes de generar otro."
+            )
+
+        aleatorio = random.Random(options["semilla"])
+        regiones = dict(
+            Region.objects.filter(nombre_region__in=POBLACION_REGIONES).values_list(
+                "nombre_region", "id"
+            )
+        )
+        if len(regiones) < len(POBLACION_REGIONES):
+            raise CommandError("Faltan regiones. Ejecuta primero load_seed.")
+        region_ids = [regiones[nombre] for nombre in POBLACION_REGIONES]
+        pesos_region = list(POBLACION_REGIONES.values())
+
+        cedula = self._armar_cedula(aleatorio, options["distribucion"], options["exponente"])
+        if not cedula:
+            raise CommandError("No hay candidatos activos. Ejecuta primero load_seed.")
+
+        self.stdout.write(
+            f"Generando {options['votantes']} votantes ({options['distribucion']}, "
+            f"participación {options['participacion']:.0%}) con "
+            f"{'COPY' if connection.vendor == 'postgresql' else 'INSERT por lotes'}..."
+        )
+
+        fin = timezone.now()
+        ventana = timedelta(hours=options["horas"]).total_seconds()
+        total_votos = 0
+        inicio = time.perf_counter()
+
+        for desde in range(1, options["votantes"] + 1, options["lote"]):
+            hasta = min(desde + options["lote"], options["votantes"] + 1)
+            with transaction.atomic():
+                ahora = timezone.now()
+                self._copiar(
+                    Usuario,
+                    COLUMNAS_USUARIO,
+                    (
+                        (
+                            f"{PREFIJO_DNI}{n:07d}",
+                            "Votante",
+                            "Sintético",
+                            str(n),
+                            region_id,
+                            "votante",
+                            "!",  # Contraseña inutilizable (sin costo de hash)
+                            True,
+                            False,
+                            False,
+                            ahora,
+                            ahora,
+                        )
+                        for n, region_id in zip(
+                            range(desde, hasta),
+                            aleatorio.choices(region_ids, pesos_region, k=hasta - desde),
+                        )
+                    ),
+                )
+
+                usuarios = Usuario.objects.filter(
+                    dni__gte=f"{PREFIJO_DNI}{desde:07d}",
+                    dni__lte=f"{PREFIJO_DNI}{hasta - 1:07d}",
+                ).values_list("id", "region_id")
+
+                votos = []
+                for usuario_id, region_id in usuarios:
+                    for cargo_id, por_region in cedula.items():
+                        opciones = por_region.get(region_id) or por_region.get(None)
+                        if not opciones or aleatorio.random() >= options["participacion"]:
+                            continue
+                        candidatos, acumulados = opciones
+                        emitido = fin - timedelta(seconds=aleatorio.random() * ventana)
+                        votos.append(
+                            (
+                                usuario_id,
+                                aleatorio.choices(candidatos, cum_weights=acumulados)[0],
+                                cargo_id,
+                                emitido,
+                                emitido,
+                            )
+                        )
+                self._copiar(Voto, COLUMNAS_VOTO, votos)
+                total_votos += len(votos)
+
+            segundos = time.perf_counter() - inicio
+            self.stdout.write(
+                f"  ✓ {hasta - 1} votantes, {total_votos} votos "
+                f"({round((hasta - 1) / segundos)} votantes/s)"
+            )
+
+        self.stdout.write("Recalculando conteos y rollup de votos...")
+        recalcular_conteos()
+        if connection.vendor == "postgresql":
+            # Estadísticas del planner al día tras la carga masiva
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    f"ANALYZE {Usuario._meta.db_table}, {Voto._meta.db_table}"
+                )
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"\nElectorado sintético: {options['votantes']} votantes y {total_votos} "
+                f"votos en {time.perf_counter() - inicio:.1f} s"
+            )
+        )
+
+    def _armar_cedula(self, aleatorio, distribucion, exponente):
+        """
+        Candidatos elegibles por cargo y región con sus pesos acumulados.
+        Presidente y Senador son nacionales (clave None); Diputado, por región.
+        El orden de popularidad se sortea con la semilla.
+
+        Returns:
+            dict: {cargo_id: {region_id | None: ([candidato_id...], [peso acumulado...])}}
+        """
+        grupos = {}
+        for candidato_id, cargo_id, nombre_cargo, region_id in Candidato.objects.filter(
+            activo=True
+        ).values_list("id", "cargo_id", "cargo__nombre_cargo", "region_id").order_by("id"):
+            region = region_id if nombre_cargo == "Diputado" else None
+            grupos.setdefault(cargo_id, {}).setdefault(region, []).append(candidato_id)
+
+        cedula = {}
+        for cargo_id, por_region in grupos.items():
+            for region, candidatos in por_region.items():
+                aleatorio.shuffle(candidatos)
+                acumulados, suma = [], 0
+                for rango in range(1, len(candidatos) + 1):
+                    suma += 1 / rango**exponente if distribucion == "zipf" else 1
+                    acumulados.append(suma)
+                cedula.setdefault(cargo_id, {})[region] = (candidatos, acumulados)
+        return cedula
+
+    def _copiar(self, modelo, columnas, filas):
+        """COPY ... FROM STDIN en PostgreSQL; INSERT por lotes en otros motores."""
+        tabla = modelo._meta.db_table
+        with connection.cursor() as cursor:
+            if connection.vendor == "postgresql":
+                with cursor.copy(f"COPY {tabla} ({', '.join(columnas)}) FROM STDIN") as copia:
+                    for fila in filas:
+                        copia.write_row(fila)
+            else:
+                cursor.executemany(
+                    f"INSERT INTO {tabla} ({', '.join(columnas)}) "
+                    f"VALUES ({', '.join(['%s'] * len(columnas))})",
+                    list(filas),
+                )
+
+    def _limpiar(self):
+        sinteticos = Usuario.objects.filter(dni__startswith=PREFIJO_DNI)
+        VotoPendiente.objects.filter(usuario__in=sinteticos).delete()
+        votos, _ = Voto.objects.filter(usuario__in=sinteticos).delete()
+
+        # Por lotes: delete() carga en memoria los usuarios que borra
+        usuarios = 0
+        while ids := list(sinteticos.values_list("id", flat=True)[:50_000]):
+            usuarios += Usuario.objects.filter(id__in=ids).delete()[1].get(
+                Usuario._meta.label, 0
+            )
+
+        recalcular_conteos()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Electorado sintético eliminado: {usuarios} usuarios y {votos} votos. "
+                "Conteos restaurados."
+            )
+        )
@@ -1,12 +1,53 @@
 import json
 import os
-from django.core.management.base import BaseCommand
+import time
+from contextlib import contextmanager
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
 from apps.core.models import Region, Cargo
+from apps.core.referencia import invalidar_referencias
+from apps.candidatos.cache import invalidar_detalles
 from apps.candidatos.models import Partido, Candidato, Antecedente
+from apps.candidatos.search import actualizar_indice
 from apps.votos.models import Voto
+from apps.votos.particiones import crear_particiones
+from apps.votos.services import recalcular_conteos
 from apps.usuarios.models import Usuario
 from datetime import datetime
 
+# Siempre las mismas 25 regiones (más la región nacional)
+REGIONES_PERU = [
+    "Amazonas",
+    "Áncash",
+    "Apurímac",
+    "Arequipa",
+    "Ayacucho",
+    "Cajamarca",
+    "Callao",
+    "Cusco",
+    "Huancavelica",
+    "Huánuco",
+    "Ica",
+    "Junín",
+    "La Libertad",
+    "Lambayeque",
+    "Lima",
+    "Loreto",
+    "Madre de Dios",
+    "Moquegua",
+    "Pasco",
+    "Piura",
+    "Puno",
+    "San Martín",
+    "Tacna",
+    "Tumbes",
+    "Ucayali",
+    # Región nacional para cargos de alcance país
+    "Perú",
+]
+
+CARGOS_ELECCION = ["Presidente", "Senador", "Diputado"]
+
 
 class Command(BaseCommand):
     help = "Carga datos iniciales desde seed_data.json"
@@ -17,6 +58,14 @@ class Command(BaseCommand):
             action="store_true",
             help="Carga seed_data_with_votes.json en lugar de seed_data.json",
         )
+        parser.add_argument(
+            "--bulk",
+            action="store_true",
+            help=(
+                "Carga masiva en una sola transacción: una consulta por tabla para "
+                "resolver lo existente y bulk_create para el resto (con tiempos por fase)"
+            ),
+        )
 
     def handle(self, *args, **options):
         with_votes = options.get("with_votes", False)
@@ -46,40 +95,16 @@ class Command(BaseCommand):
             self.stdout.write(self.style.ERROR(f"Error al leer JSON: {e}"))
             return
 
+        if options.get("bulk", False):
+            self._cargar_bulk(data, with_votes)
+            self._resumen(with_votes)
+            return
+
         # 1. Crear Regiones (siempre las mismas 25)
         self.stdout.write("Creando regiones...")
-        regiones_data = [
-            "Amazonas",
-            "Áncash",
-            "Apurímac",
-            "Arequipa",
-            "Ayacucho",
-            "Cajamarca",
-            "Callao",
-            "Cusco",
-            "Huancavelica",
-            "Huánuco",
-            "Ica",
-            "Junín",
-            "La Libertad",
-            "Lambayeque",
-            "Lima",
-            "Loreto",
-            "Madre de Dios",
-            "Moquegua",
-            "Pasco",
-            "Piura",
-            "Puno",
-            "San Martín",
-            "Tacna",
-            "Tumbes",
-            "Ucayali",
-            # Región nacional para cargos de alcance país
-            "Perú",
-        ]
 
         regiones = {}
-        for nombre in regiones_data:
+        for nombre in REGIONES_PERU:
             region, created = Region.objects.get_or_create(nombre_region=nombre)
             regiones[nombre] = region
             if created:
@@ -88,11 +113,13 @@ class Command(BaseCommand):
         # 2. Crear Cargos
         self.stdout.write("\nCreando cargos...")
         cargos = {}
-        for cargo_nombre in ["Presidente", "Senador", "Diputado"]:
+        for cargo_nombre in CARGOS_ELECCION:
             cargo, created = Cargo.objects.get_or_create(nombre_cargo=cargo_nombre)
             cargos[cargo_nombre] = cargo
             if created:
                 self.stdout.write(f"  ✓ {cargo_nombre}")
+        # Con votos particionada, cada cargo nuevo necesita su partición
+        crear_particiones()
 
         # 3. Crear Partidos desde JSON
         self.stdout.write("\nCreando partidos...")
@@ -289,7 +316,12 @@ class Command(BaseCommand):
                 self.style.SUCCESS(f"\nTotal de votos creados: {votos_creados}")
             )
 
-        # Resumen final
+            # Los votos simulados se insertan directo: sincronizar conteos materializados
+            recalcular_conteos()
+
+        self._resumen(with_votes)
+
+    def _resumen(self, with_votes):
         self.stdout.write(self.style.SUCCESS("\n Datos cargados exitosamente!"))
         self.stdout.write("\nResumen:")
         self.stdout.write(f"  - Regiones: {Region.objects.count()}")
@@ -314,3 +346,276 @@ class Command(BaseCommand):
             )
 
         self.stdout.write("")
+
+    @contextmanager
+    def _fase(self, nombre):
+        inicio = time.perf_counter()
+        yield
+        self.stdout.write(f"  ⏱ {nombre}: {(time.perf_counter() - inicio) * 1000:.0f} ms")
+
+    def _cargar_bulk(self, data, with_votes):
+        """
+        Misma carga que el modo fila por fila, idempotente y en una sola transacción.
+        Cada tabla: una consulta para resolver lo que ya existe y bulk_create para
+        lo que falta (ignore_conflicts por si otro proceso insertó lo mismo).
+        bulk_create no dispara señales ni full_clean: los datos del seed se
+        consideran válidos y los índices/cachés se actualizan al final.
+        """
+        self.stdout.write("Modo bulk: una transacción, una consulta por tabla\n")
+        inicio = time.perf_counter()
+
+        with transaction.atomic():
+            with self._fase("regiones y cargos"):
+                Region.objects.bulk_create(
+                    [Region(nombre_region=nombre) for nombre in REGIONES_PERU],
+                    ignore_conflicts=True,
+                )
+                Cargo.objects.bulk_create(
+                    [Cargo(nombre_cargo=nombre) for nombre in CARGOS_ELECCION],
+                    ignore_conflicts=True,
+                )
+                regiones = Region.objects.in_bulk(REGIONES_PERU, field_name="nombre_region")
+                cargos = Cargo.objects.in_bulk(CARGOS_ELECCION, field_name="nombre_cargo")
+                crear_particiones()  # Antes de insertar votos (ver apps.votos.particiones)
+
+            with self._fase("partidos"):
+                partidos = self._bulk_partidos(data.get("partidos", []))
+
+            with self._fase("candidatos"):
+                candidatos_dict = self._bulk_candidatos(data, regiones, cargos, partidos)
+
+            with self._fase("antecedentes"):
+                self._bulk_antecedentes(
+                    data.get("antecedentes", []), candidatos_dict
+                )
+
+            if with_votes and data.get("votos_simulados"):
+                with self._fase("usuarios y votos"):
+                    self._bulk_votos(data["votos_simulados"], candidatos_dict, regiones)
+
+                # Los votos se insertan directo: sincronizar conteos materializados
+                with self._fase("conteos"):
+                    recalcular_conteos()
+
+            # bulk_create no dispara las señales que mantienen índice y cachés
+            candidato_ids = [c.id for c in candidatos_dict.values()]
+            with self._fase("índice de búsqueda"):
+                actualizar_indice(candidato_ids)
+
+        # Recién confirmada la transacción, para que otros procesos no recarguen datos viejos
+        invalidar_detalles(candidato_ids)
+        invalidar_referencias()
+
+        self.stdout.write(f"  ⏱ total: {(time.perf_counter() - inicio) * 1000:.0f} ms")
+
+    def _bulk_partidos(self, partidos_data):
+        # sigla no es única en la BD (in_bulk no aplica): se busca por sigla como get_or_create
+        siglas = [p["sigla"] for p in partidos_data]
+        partidos = {p.sigla: p for p in Partido.objects.filter(sigla__in=siglas)}
+        Partido.objects.bulk_create(
+            [
+                Partido(
+                    sigla=p["sigla"],
+                    nombre_partido=p["nombre_partido"],
+                    logo_url=p.get("logo_url"),
+                )
+                for p in partidos_data
+                if p["sigla"] not in partidos
+            ],
+            ignore_conflicts=True,
+        )
+        if len(partidos) < len(set(siglas)):
+            partidos = {p.sigla: p for p in Partido.objects.filter(sigla__in=siglas)}
+        self.stdout.write(f"  ✓ {len(partidos)} partidos")
+        return partidos
+
+    def _bulk_candidatos(self, data, regiones, cargos, partidos):
+        """
+        Crea los candidatos que falten. Como en el modo fila por fila, Presidente y
+        Senador se identifican por nombre y cargo (completando la región si faltaba)
+        y Diputado por nombre, cargo y región.
+        """
+        filas = []  # (cargo, datos del JSON, región)
+        for cargo_nombre, clave_json in (
+            ("Presidente", "candidatos_presidente"),
+            ("Senador", "candidatos_senador"),
+            ("Diputado", "candidatos_diputado"),
+        ):
+            for cand_data in data.get(clave_json, []):
+                region_nombre = cand_data.get("region_nombre")
+                region = regiones[region_nombre] if region_nombre else None
+                filas.append((cargos[cargo_nombre], cand_data, region))
+
+        def clave(nombre, paterno, materno, cargo, region_id):
+            if cargo.nombre_cargo == "Diputado":
+                return (nombre, paterno, materno, cargo.id, region_id)
+            return (nombre, paterno, materno, cargo.id)
+
+        existentes = {}
+        por_id = {cargo.id: cargo for cargo in cargos.values()}
+        for candidato in Candidato.objects.filter(cargo__in=cargos.values()):
+            cargo = por_id[candidato.cargo_id]
+            candidato.cargo = cargo
+            existentes.setdefault(
+                clave(
+                    candidato.nombre,
+                    candidato.apellido_paterno,
+                    candidato.apellido_materno,
+                    cargo,
+                    candidato.region_id,
+                ),
+                candidato,
+            )
+
+        nuevos, sin_region = {}, []
+        for cargo, cand_data, region in filas:
+            k = clave(
+                cand_data["nombre"],
+                cand_data["apellido_paterno"],
+                cand_data["apellido_materno"],
+                cargo,
+                region.id if region else None,
+            )
+            existente = existentes.get(k)
+            if existente is None:
+                if cargo.nombre_cargo == "Diputado" and region is None:
+                    raise CommandError(
+                        f"Diputado sin región: {cand_data['nombre']} {cand_data['apellido_paterno']}"
+                    )
+                nuevos.setdefault(
+                    k,
+                    Candidato(
+                        nombre=cand_data["nombre"],
+                        apellido_paterno=cand_data["apellido_paterno"],
+                        apellido_materno=cand_data["apellido_materno"],
+                        cargo=cargo,
+                        region=region,
+                        partido=partidos[cand_data["partido_sigla"]],
+                        foto_url=cand_data.get("foto_url"),
+                    ),
+                )
+            elif region and existente.region_id is None:
+                existente.region = region
+                sin_region.append(existente)
+
+        Candidato.objects.bulk_create(nuevos.values(), ignore_conflicts=True)
+        Candidato.objects.bulk_update(sin_region, ["region"])
+
+        if nuevos:
+            # ignore_conflicts no devuelve ids: releer los recién insertados
+            for candidato in Candidato.objects.filter(cargo__in=cargos.values()):
+                candidato.cargo = por_id[candidato.cargo_id]
+                existentes.setdefault(
+                    clave(
+                        candidato.nombre,
+                        candidato.apellido_paterno,
+                        candidato.apellido_materno,
+                        candidato.cargo,
+                        candidato.region_id,
+                    ),
+                    candidato,
+                )
+
+        candidatos_dict = {}
+        for cargo, cand_data, region in filas:
+            candidatos_dict[
+                f"{cand_data['nombre']}|{cand_data['apellido_paterno']}|{cand_data['apellido_materno']}"
+            ] = existentes[
+                clave(
+                    cand_data["nombre"],
+                    cand_data["apellido_paterno"],
+                    cand_data["apellido_materno"],
+                    cargo,
+                    region.id if region else None,
+                )
+            ]
+
+        self.stdout.write(f"  ✓ {len(nuevos)} candidatos nuevos de {len(filas)}")
+        return candidatos_dict
+
+    def _bulk_antecedentes(self, antecedentes_data, candidatos_dict):
+        existentes = set(
+            Antecedente.objects.filter(
+                candidato__in=[c.id for c in candidatos_dict.values()]
+            ).values_list("candidato_id", "tipo", "titulo")
+        )
+
+        nuevos = []
+        for ant_data in antecedentes_data:
+            key = f"{ant_data['candidato_nombre']}|{ant_data['candidato_apellido_paterno']}|{ant_data['candidato_apellido_materno']}"
+            candidato = candidatos_dict.get(key)
+            if not candidato:
+                self.stdout.write(
+                    self.style.WARNING(f"Candidato no encontrado para antecedente: {key}")
+                )
+                continue
+
+            clave = (candidato.id, ant_data["tipo"], ant_data["titulo"])
+            if clave in existentes:
+                continue
+            existentes.add(clave)
+            nuevos.append(
+                Antecedente(
+                    candidato=candidato,
+                    tipo=ant_data["tipo"],
+                    titulo=ant_data["titulo"],
+                    descripcion=ant_data["descripcion"],
+                    fecha=datetime.strptime(ant_data["fecha"], "%Y-%m-%d").date(),
+                    fuente_url=ant_data.get("fuente_url"),
+                )
+            )
+
+        Antecedente.objects.bulk_create(nuevos)
+        self.stdout.write(f"  ✓ {len(nuevos)} antecedentes nuevos")
+
+    def _bulk_votos(self, votos_data, candidatos_dict, regiones):
+        """
+        Un usuario ficticio por voto (DNI 00000001, 00000002...), igual que el modo
+        fila por fila. Usuarios y votos existentes se resuelven con una consulta cada uno.
+        """
+        asignados = []  # (dni, candidato)
+        for voto_data in votos_data:
+            key = f"{voto_data['candidato_nombre']}|{voto_data['candidato_apellido_paterno']}|{voto_data['candidato_apellido_materno']}"
+            candidato = candidatos_dict.get(key)
+            if not candidato:
+                self.stdout.write(self.style.WARNING(f"Candidato no encontrado: {key}"))
+                continue
+            for _ in range(voto_data.get("cantidad", 0)):
+                asignados.append((f"{len(asignados) + 1:08d}", candidato))
+
+        dnis = [dni for dni, _ in asignados]
+        usuarios = dict(Usuario.objects.filter(dni__in=dnis).values_list("dni", "id"))
+        nuevos_usuarios = [
+            Usuario(
+                dni=dni,
+                nombre="Votante",
+                apellido_paterno="Ficticio",
+                apellido_materno=str(int(dni)),
+                rol="votante",
+                region=candidato.region
+                if candidato.cargo.nombre_cargo == "Diputado"
+                else regiones["Lima"],
+            )
+            for dni, candidato in asignados
+            if dni not in usuarios
+        ]
+        Usuario.objects.bulk_create(nuevos_usuarios, batch_size=2000, ignore_conflicts=True)
+        if nuevos_usuarios:
+            usuarios = dict(Usuario.objects.filter(dni__in=dnis).values_list("dni", "id"))
+
+        ya_votaron = set(
+            Voto.objects.filter(usuario_id__in=usuarios.values()).values_list(
+                "usuario_id", "cargo_id"
+            )
+        )
+        votos = [
+            Voto(usuario_id=usuarios[dni], candidato=candidato, cargo_id=candidato.cargo_id)
+            for dni, candidato in asignados
+            if (usuarios[dni], candidato.cargo_id) not in ya_votaron
+        ]
+        Voto.objects.bulk_create(votos, batch_size=2000, ignore_conflicts=True)
+
+        self.stdout.write(
+            f"  ✓ {len(nuevos_usuarios)} usuarios y {len(votos)} votos nuevos "
+            f"({len(asignados)} votos simulados)"
+        )
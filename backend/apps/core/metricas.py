@@ -0,0 +1,179 @@
+import bisect
+import re
+import threading
+
+# Límites de los buckets en milisegundos (el último bucket es +Inf)
+BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+# Métricas del proceso: {nombre: Histograma | Contador | Maximo}
+# El nombre es "familia.clave" (p. ej. "http.candidatos_list"): la familia es la
+# métrica de Prometheus y la clave su etiqueta
+_registro = {}
+_registro_guard = threading.Lock()
+
+
+class Histograma:
+    """
+    Histograma de latencias acumulativo y seguro entre hilos (por proceso).
+    Mismo modelo que un histograma de Prometheus: cuentas por bucket, total y suma.
+    """
+
+    def __init__(self, buckets_ms=BUCKETS_MS):
+        self.buckets_ms = tuple(buckets_ms)
+        self._cuentas = [0] * (len(self.buckets_ms) + 1)
+        self._suma_ms = 0.0
+        self._lock = threading.Lock()
+
+    def observar(self, segundos):
+        ms = segundos * 1000
+        indice = bisect.bisect_left(self.buckets_ms, ms)
+        with self._lock:
+            self._cuentas[indice] += 1
+            self._suma_ms += ms
+
+    def resumen(self):
+        """
+        Returns:
+            dict: {"total", "suma_ms", "promedio_ms", "buckets": {"<=5": n, ..., "+Inf": n}}
+            con cuentas acumuladas (observaciones <= límite)
+        """
+        with self._lock:
+            cuentas = list(self._cuentas)
+            suma_ms = self._suma_ms
+
+        total = sum(cuentas)
+        buckets = {}
+        acumulado = 0
+        for limite, cuenta in zip(self.buckets_ms + ("+Inf",), cuentas):
+            acumulado += cuenta
+            buckets[f"<={limite}" if limite != "+Inf" else limite] = acumulado
+
+        return {
+            "total": total,
+            "suma_ms": round(suma_ms, 3),
+            "promedio_ms": round(suma_ms / total, 3) if total else None,
+            "buckets": buckets,
+        }
+
+
+class Contador:
+    """Contador acumulativo seguro entre hilos (counter de Prometheus)."""
+
+    def __init__(self):
+        self._valor = 0
+        self._lock = threading.Lock()
+
+    def sumar(self, valor=1):
+        with self._lock:
+            self._valor += valor
+
+    def resumen(self):
+        return self._valor
+
+
+class Maximo:
+    """Mayor valor observado y un detalle asociado (p. ej. la consulta más lenta)."""
+
+    def __init__(self):
+        self._valor = None
+        self._detalle = None
+        self._lock = threading.Lock()
+
+    def observar(self, valor, detalle):
+        # Lectura sin lock: solo se toma el lock si el valor puede ser un nuevo máximo
+        if self._valor is not None and valor <= self._valor:
+            return
+        with self._lock:
+            if self._valor is None or valor > self._valor:
+                self._valor = valor
+                self._detalle = detalle
+
+    def resumen(self):
+        with self._lock:
+            return {"valor": self._valor, "detalle": self._detalle}
+
+
+def _obtener(nombre, clase):
+    metrica = _registro.get(nombre)
+    if metrica is None:
+        with _registro_guard:
+            metrica = _registro.setdefault(nombre, clase())
+    return metrica
+
+
+def histograma(nombre):
+    """Devuelve (o crea) el histograma registrado con ese nombre."""
+    return _obtener(nombre, Histograma)
+
+
+def contador(nombre):
+    """Devuelve (o crea) el contador registrado con ese nombre."""
+    return _obtener(nombre, Contador)
+
+
+def maximo(nombre):
+    """Devuelve (o crea) el máximo registrado con ese nombre."""
+    return _obtener(nombre, Maximo)
+
+
+def histogramas(prefijo=""):
+    """Resumen de los histogramas registrados cuyo nombre empieza con `prefijo`."""
+    with _registro_guard:
+        seleccion = {
+            n: h
+            for n, h in _registro.items()
+            if n.startswith(prefijo) and isinstance(h, Histograma)
+        }
+    return {nombre: h.resumen() for nombre, h in sorted(seleccion.items())}
+
+
+def _etiqueta(valor):
+    valor = str(valor).replace("\\", "\\\\").replace("\n", " ").replace('"', '\\"')
+    return f'"{valor}"'
+
+
+def exportar_prometheus():
+    """
+    Todas las métricas del proceso en el formato de texto de Prometheus.
+    "familia.clave" se exporta como la métrica `familia` con la etiqueta clave="...":
+    histogramas como <familia>_ms (buckets en ms), contadores como <familia>_total
+    y máximos como <familia>_max. El detalle de los máximos (p. ej. el SQL) no se
+    exporta: como etiqueta crearía una serie nueva por cada valor distinto.
+    """
+    with _registro_guard:
+        metricas = sorted(_registro.items())
+
+    familias = {}
+    for nombre, metrica in metricas:
+        familia, _, clave = nombre.partition(".")
+        familia = re.sub(r"[^a-zA-Z0-9_]", "_", familia)
+        familias.setdefault((familia, type(metrica)), []).append((clave, metrica))
+
+    lineas = []
+    for (familia, clase), miembros in familias.items():
+        if clase is Histograma:
+            lineas.append(f"# TYPE {familia}_ms histogram")
+            for clave, metrica in miembros:
+                resumen = metrica.resumen()
+                for limite, cuenta in resumen["buckets"].items():
+                    le = limite.removeprefix("<=")
+                    lineas.append(
+                        f"{familia}_ms_bucket{{clave={_etiqueta(clave)},le={_etiqueta(le)}}} {cuenta}"
+                    )
+                lineas.append(f"{familia}_ms_sum{{clave={_etiqueta(clave)}}} {resumen['suma_ms']}")
+                lineas.append(f"{familia}_ms_count{{clave={_etiqueta(clave)}}} {resumen['total']}")
+        elif clase is Contador:
+            lineas.append(f"# TYPE {familia}_total counter")
+            for clave, metrica in miembros:
+                lineas.append(
+                    f"{familia}_total{{clave={_etiqueta(clave)}}} {round(metrica.resumen(), 3)}"
+                )
+        else:
+            lineas.append(f"# TYPE {familia}_max gauge")
+            for clave, metrica in miembros:
+                resumen = metrica.resumen()
+                if resumen["valor"] is not None:
+                    lineas.append(
+                        f"{familia}_max{{clave={_etiqueta(clave)}}} {round(resumen['valor'], 3)}"
+                    )
+    return "\n".join(lineas) + "\n"
@@ -0,0 +1,203 @@
+import json
+import logging
+import random
+import time
+from contextlib import ExitStack
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from apps.core.metricas import contador, histograma, maximo
+from apps.core.replicas import (
+    fijar_primaria,
+    iniciar_peticion,
+    marcar_lectura_replica,
+    terminar_peticion,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class _MedidorSQL:
+    """
+    execute_wrapper de Django: cuenta consultas, suma su tiempo y guarda la más lenta.
+    Solo guarda la referencia al SQL (sin parámetros ni formateo) para no costar
+    nada extra por consulta.
+    """
+
+    __slots__ = ("consultas", "segundos", "mas_lenta", "sql_mas_lenta")
+
+    def __init__(self):
+        self.consultas = 0
+        self.segundos = 0.0
+        self.mas_lenta = 0.0
+        self.sql_mas_lenta = None
+
+    def __call__(self, execute, sql, params, many, context):
+        inicio = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duracion = time.perf_counter() - inicio
+            self.consultas += 1
+            self.segundos += duracion
+            if duracion > self.mas_lenta:
+                self.mas_lenta = duracion
+                self.sql_mas_lenta = sql
+
+
+class InstrumentacionMiddleware:
+    """
+    Métricas por vista (exportadas en /api/metricas/, ver apps.core.metricas):
+    - Latencia de todas las peticiones: histograma `http_latencia.<vista>`.
+    - En una muestra (INSTRUMENTACION_MUESTREO) se instala además un execute_wrapper
+      en las conexiones a la BD: consultas, tiempo SQL y la consulta más lenta.
+    - Si la petición excede INSTRUMENTACION_MAX_MS o su presupuesto de consultas
+      (presupuesto_consultas de la vista o INSTRUMENTACION_MAX_CONSULTAS) se
+      registra un warning con los datos en JSON.
+
+    En vistas async las consultas corren en otro hilo (sync_to_async) y no se
+    cuentan; su latencia sí se registra.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.muestreo = settings.INSTRUMENTACION_MUESTREO
+        self.max_segundos = settings.INSTRUMENTACION_MAX_MS / 1000
+        self.max_consultas = settings.INSTRUMENTACION_MAX_CONSULTAS
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+
+        medidor = None
+        inicio = time.perf_counter()
+        if self.muestreo and random.random() < self.muestreo:
+            medidor = _MedidorSQL()
+            with ExitStack() as pila:
+                for conexion in connections.all():
+                    pila.enter_context(conexion.execute_wrapper(medidor))
+                response = self.get_response(request)
+        else:
+            response = self.get_response(request)
+
+        self._registrar(request, time.perf_counter() - inicio, medidor)
+        return response
+
+    async def __acall__(self, request):
+        inicio = time.perf_counter()
+        response = await self.get_response(request)
+        self._registrar(request, time.perf_counter() - inicio, None)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        # Presupuesto declarado por la vista (PresupuestoConsultasMixin)
+        vista = getattr(view_func, "view_class", None) or getattr(view_func, "cls", None)
+        presupuesto_para = getattr(vista, "presupuesto_para", None)
+        request._presupuesto_consultas = (
+            presupuesto_para(request.GET) if presupuesto_para else None
+        )
+
+    def _registrar(self, request, segundos, medidor):
+        coincidencia = getattr(request, "resolver_match", None)
+        vista = coincidencia.view_name if coincidencia else "sin_ruta"
+        histograma(f"http_latencia.{vista}").observar(segundos)
+
+        presupuesto = getattr(request, "_presupuesto_consultas", None)
+        if presupuesto is None:
+            presupuesto = self.max_consultas
+        excede_consultas = False
+        if medidor is not None:
+            contador(f"http_muestreadas.{vista}").sumar()
+            contador(f"http_consultas.{vista}").sumar(medidor.consultas)
+            contador(f"http_sql_ms.{vista}").sumar(medidor.segundos * 1000)
+            if medidor.sql_mas_lenta is not None:
+                maximo(f"http_sql_mas_lenta_ms.{vista}").observar(
+                    medidor.mas_lenta * 1000, medidor.sql_mas_lenta[:300]
+                )
+            excede_consultas = medidor.consultas > presupuesto
+
+        if excede_consultas or segundos > self.max_segundos:
+            datos = {
+                "evento": "presupuesto_excedido",
+                "vista": vista,
+                "metodo": request.method,
+                "ruta": request.path,
+                "ms": round(segundos * 1000, 1),
+                "max_ms": round(self.max_segundos * 1000),
+            }
+            if medidor is not None:
+                datos.update(
+                    consultas=medidor.consultas,
+                    max_consultas=presupuesto,
+                    sql_ms=round(medidor.segundos * 1000, 1),
+                    sql_mas_lenta=medidor.sql_mas_lenta,
+                    sql_mas_lenta_ms=round(medidor.mas_lenta * 1000, 1),
+                )
+            logger.warning(json.dumps(datos, ensure_ascii=False))
+
+
+class ReplicaMiddleware:
+    """
+    Ruteo a réplicas de lectura (ver apps.core.replicas). Sin DATABASE_REPLICAS
+    no se instala y todo va a la primaria.
+    - Los GET/HEAD de vistas marcadas con lectura_replica leen de una réplica.
+    - Tras una petición de escritura exitosa de un usuario autenticado (p. ej.
+      votar), sus lecturas van a la primaria por DB_REPLICA_PRIMARIA_SEGUNDOS:
+      mis_votos ve su voto aunque la réplica esté atrasada. Con varios procesos
+      requiere una caché compartida (CACHE_BACKEND).
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.DATABASE_REPLICAS:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+
+        token = iniciar_peticion(request)
+        try:
+            response = self.get_response(request)
+        finally:
+            terminar_peticion(token)
+        self._fijar_si_escribio(request, response)
+        return response
+
+    async def __acall__(self, request):
+        token = iniciar_peticion(request)
+        try:
+            response = await self.get_response(request)
+        finally:
+            terminar_peticion(token)
+        self._fijar_si_escribio(request, response)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if request.method not in ("GET", "HEAD"):
+            return
+        vista = getattr(view_func, "view_class", None) or getattr(view_func, "cls", None)
+        if getattr(view_func, "lectura_replica", False) or getattr(
+            vista, "lectura_replica", False
+        ):
+            marcar_lectura_replica()
+
+    def _fijar_si_escribio(self, request, response):
+        if request.method in ("GET", "HEAD", "OPTIONS") or response.status_code >= 400:
+            return
+        usuario = getattr(request, "user", None)
+        if usuario is not None and usuario.is_authenticated:
+            fijar_primaria(usuario.pk)
@@ -0,0 +1,122 @@
+import threading
+import time
+import uuid
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from apps.core.models import Cargo, Region
+from apps.core.replicas import en_primaria
+
+# Tablas registradas: {etiqueta del modelo: TablaReferencia}
+_tablas = {}
+
+
+class TablaReferencia:
+    """
+    Copia en memoria (por proceso) de una tabla de referencia casi inmutable,
+    con búsqueda por id y por nombre sin consultar la BD.
+
+    Invalidación:
+    - En este proceso: al confirmar el guardado o borrado de una fila (señales
+      post_save/post_delete).
+    - En los demás procesos: la señal cambia un sello de versión en la caché
+      compartida; cada proceso lo revisa como máximo cada
+      REFERENCIA_VERIFICAR_SEGUNDOS y recarga si cambió. Con la caché en
+      memoria local (LocMem) cada proceso solo ve sus propios cambios.
+    - Los cambios masivos sin señales (update, bulk_create) deben llamar a
+      invalidar() o invalidar_referencias().
+
+    Las instancias devueltas se comparten entre hilos: no modificarlas.
+    """
+
+    def __init__(self, modelo, campo_nombre):
+        self.modelo = modelo
+        self.campo_nombre = campo_nombre
+        self._clave_version = f"referencia:version:{modelo._meta.label_lower}"
+        self._datos = None  # (filas, por_id, por_nombre), se reemplaza entero
+        self._version = None
+        self._verificado = 0.0
+        self._lock = threading.Lock()
+
+        _tablas[modelo._meta.label_lower] = self
+        for senal in (post_save, post_delete):
+            senal.connect(
+                self._al_cambiar,
+                sender=modelo,
+                weak=False,
+                dispatch_uid=f"{self._clave_version}:{senal is post_save}",
+            )
+
+    def todos(self):
+        """Todas las filas, en el orden por defecto del modelo."""
+        return self._cargada()[0]
+
+    def por_id(self, id):
+        return self._cargada()[1].get(id)
+
+    def por_nombre(self, nombre):
+        return self._cargada()[2].get(nombre)
+
+    async def apor_id(self, id):
+        """Versión async de por_id (carga la tabla en un hilo si hace falta)."""
+        datos = self._datos
+        if datos is None or not self._vigente():
+            datos = await sync_to_async(self._cargar)()
+        return datos[1].get(id)
+
+    def invalidar(self):
+        """Descarta la copia local y avisa a los demás procesos."""
+        cache.set(self._clave_version, uuid.uuid4().hex, None)
+        self._datos = None
+
+    def _al_cambiar(self, sender, **kwargs):
+        # Al confirmar: antes, otro proceso recargaría las filas anteriores
+        # con el sello nuevo y las conservaría
+        transaction.on_commit(self.invalidar)
+
+    def _vigente(self):
+        if self._datos is None:
+            return False
+        ahora = time.monotonic()
+        if ahora - self._verificado < settings.REFERENCIA_VERIFICAR_SEGUNDOS:
+            return True
+        self._verificado = ahora
+        return cache.get(self._clave_version) == self._version
+
+    def _cargada(self):
+        datos = self._datos
+        if datos is None or not self._vigente():
+            datos = self._cargar()
+        return datos
+
+    def _cargar(self):
+        with self._lock:
+            datos = self._datos
+            if datos is not None and self._vigente():
+                return datos  # Otro hilo la recargó mientras esperábamos
+            # La versión se lee antes que las filas: un cambio posterior fuerza otra recarga
+            version = cache.get(self._clave_version)
+            # De la primaria: filas de una réplica atrasada quedarían con la versión nueva
+            with en_primaria():
+                filas = list(self.modelo._default_manager.all())
+            datos = (
+                filas,
+                {fila.pk: fila for fila in filas},
+                {getattr(fila, self.campo_nombre): fila for fila in filas},
+            )
+            self._version = version
+            self._verificado = time.monotonic()
+            self._datos = datos
+            return datos
+
+
+def invalidar_referencias():
+    """Invalida todas las tablas registradas (tras cargas masivas)."""
+    for tabla in _tablas.values():
+        tabla.invalidar()
+
+
+REGIONES = TablaReferencia(Region, "nombre_region")
+CARGOS = TablaReferencia(Cargo, "nombre_cargo")
@@ -0,0 +1,200 @@
+import logging
+import random
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DatabaseError, connections
+from apps.core.metricas import contador
+
+logger = logging.getLogger(__name__)
+
+# Estado de la petición en curso (lo instala ReplicaMiddleware)
+_peticion = ContextVar("replicas_peticion", default=None)
+_forzar_primaria = ContextVar("replicas_forzar_primaria", default=False)
+
+# Segundos de retraso de una réplica:
+# - 0 si no es réplica (p. ej. una BD independiente haciendo de réplica en desarrollo)
+#   o si recibe WAL en streaming y ya aplicó todo lo recibido.
+# - NULL si no hay WAL receiver en streaming: lo recibido coincide con lo aplicado
+#   pero la réplica puede estar arbitrariamente atrasada. Sin pg_read_all_stats
+#   solo se ve el pid del receiver (status NULL): basta con que exista.
+# - Si no, el tiempo desde la última transacción aplicada (NULL si aún no aplicó).
+SQL_RETRASO = """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN NOT EXISTS (
+            SELECT 1 FROM pg_stat_wal_receiver
+            WHERE COALESCE(status, 'streaming') = 'streaming'
+        ) THEN NULL
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())
+    END
+"""
+
+
+def lectura_replica(vista):
+    """
+    Decorador para vistas de función: sus GET pueden leer de una réplica.
+
+        @lectura_replica
+        @api_view(["GET"])
+        def resultados_generales(request): ...
+
+    En vistas de clase se declara el atributo `lectura_replica = True`.
+    """
+    vista.lectura_replica = True
+    return vista
+
+
+@contextmanager
+def en_primaria():
+    """
+    Fuerza las lecturas del bloque a la primaria. Para datos que se guardan en
+    caché tras una invalidación: leídos de una réplica atrasada quedarían
+    obsoletos hasta que la caché expire.
+    """
+    token = _forzar_primaria.set(True)
+    try:
+        yield
+    finally:
+        _forzar_primaria.reset(token)
+
+
+def _clave_primaria(usuario_id):
+    return f"replicas:primaria:{usuario_id}"
+
+
+def fijar_primaria(usuario_id):
+    """Las lecturas del usuario van a la primaria por DB_REPLICA_PRIMARIA_SEGUNDOS."""
+    cache.set(_clave_primaria(usuario_id), 1, settings.DB_REPLICA_PRIMARIA_SEGUNDOS)
+
+
+class EstadoPeticion:
+    """Decisión de ruteo de una petición: se elige una sola réplica por petición."""
+
+    __slots__ = ("request", "lectura", "alias")
+
+    def __init__(self, request):
+        self.request = request
+        self.lectura = False  # La vista admite réplica (ver ReplicaMiddleware)
+        self.alias = None  # Se elige en la primera consulta
+
+    def elegir(self):
+        # Tras autenticar, DRF deja el usuario también en el HttpRequest
+        usuario = getattr(self.request, "user", None)
+        if (
+            usuario is not None
+            and usuario.is_authenticated
+            and cache.get(_clave_primaria(usuario.pk))
+        ):
+            return "default"  # Escribió hace poco: leer lo propio (read-your-writes)
+
+        disponibles = REPLICAS.disponibles()
+        if not disponibles:
+            return "default"
+        alias = random.choice(disponibles)
+        contador(f"db_lecturas_replica.{alias}").sumar()
+        return alias
+
+
+def iniciar_peticion(request):
+    """Instala el estado de ruteo de la petición; devuelve el token para reset."""
+    return _peticion.set(EstadoPeticion(request))
+
+
+def terminar_peticion(token):
+    _peticion.reset(token)
+
+
+def marcar_lectura_replica():
+    """La vista de la petición en curso admite leer de una réplica."""
+    estado = _peticion.get()
+    if estado is not None:
+        estado.lectura = True
+
+
+class _Replicas:
+    """
+    Réplicas utilizables según su retraso, medido como máximo cada
+    DB_REPLICA_VERIFICAR_SEGUNDOS por proceso. Una réplica con más de
+    DB_REPLICA_MAX_RETRASO_SEGUNDOS de retraso, o que no responde, queda
+    fuera hasta la siguiente verificación.
+    """
+
+    def __init__(self):
+        self._disponibles = []
+        self._verificado = float("-inf")
+        self._lock = threading.Lock()
+
+    def disponibles(self):
+        if (
+            time.monotonic() - self._verificado >= settings.DB_REPLICA_VERIFICAR_SEGUNDOS
+            and self._lock.acquire(blocking=False)
+        ):
+            # Un solo hilo verifica; el resto sigue con la lista anterior
+            try:
+                self._disponibles = [
+                    alias
+                    for alias in settings.DATABASE_REPLICAS
+                    if self._retraso(alias) <= settings.DB_REPLICA_MAX_RETRASO_SEGUNDOS
+                ]
+                self._verificado = time.monotonic()
+            finally:
+                self._lock.release()
+        return self._disponibles
+
+    def _retraso(self, alias):
+        conexion = connections[alias]
+        if conexion.vendor != "postgresql":
+            return 0.0
+        try:
+            with conexion.cursor() as cursor:
+                cursor.execute(SQL_RETRASO)
+                retraso = cursor.fetchone()[0]
+        except DatabaseError as e:
+            logger.warning("Réplica %s no disponible: %s", alias, e)
+            return float("inf")
+        if retraso is None:
+            logger.warning("Réplica %s sin streaming de WAL, se lee de la primaria", alias)
+            return float("inf")
+        retraso = float(retraso)
+        if retraso > settings.DB_REPLICA_MAX_RETRASO_SEGUNDOS:
+            logger.warning("Réplica %s atrasada %.1f s, se lee de la primaria", alias, retraso)
+        return retraso
+
+
+REPLICAS = _Replicas()
+
+
+class ReplicaRouter:
+    """
+    Router de DATABASE_ROUTERS:
+    - Escrituras y migraciones, siempre en "default" (la primaria).
+    - Lecturas de vistas marcadas con lectura_replica (solo GET/HEAD), en una
+      de DATABASE_REPLICAS, salvo que el usuario haya escrito hace poco
+      (fijar_primaria), dentro de en_primaria() o de una transacción.
+    - Todo lo demás (comandos, workers, vistas sin marcar), en la primaria.
+    """
+
+    def db_for_read(self, model, **hints):
+        estado = _peticion.get()
+        if estado is None or not estado.lectura:
+            return None
+        if _forzar_primaria.get() or connections["default"].in_atomic_block:
+            return "default"
+        if estado.alias is None:
+            estado.alias = estado.elegir()
+        return estado.alias
+
+    def db_for_write(self, model, **hints):
+        # Explícito: sin router Django escribiría en la BD de donde se leyó la instancia
+        return "default"
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True  # Primaria y réplicas tienen los mismos datos
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db not in settings.DATABASE_REPLICAS
@@ -1,3 +1,284 @@
-from django.test import TestCase
+from io import StringIO
+from unittest import mock
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.http import HttpResponse
+from django.db.models import Count, F, Sum
+from django.db.utils import load_backend
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from apps.candidatos.models import Antecedente, Candidato, Partido
+from apps.core import metricas, replicas
+from apps.core.management.commands.benchmark_conexiones import Command as BenchmarkConexiones
+from apps.core.middleware import ReplicaMiddleware
+from apps.core.models import Cargo, Region
+from apps.core.referencia import REGIONES
+from apps.usuarios.models import Usuario
+from apps.votos.models import ConteoCandidato, Voto
 
-# Create your tests here.
+
+class TablaReferenciaTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        REGIONES.invalidar()
+
+    def test_busqueda_sin_consultas_tras_cargar(self):
+        lima = Region.objects.create(nombre_region="Lima")
+        REGIONES.todos()
+
+        with self.assertNumQueries(0):
+            self.assertEqual(REGIONES.por_id(lima.id), lima)
+            self.assertEqual(REGIONES.por_nombre("Lima"), lima)
+
+    def test_invalida_al_confirmar_la_transaccion(self):
+        REGIONES.todos()
+        version = cache.get(REGIONES._clave_version)
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            Region.objects.create(nombre_region="Cusco")
+            # Antes del commit nadie recarga: el sello y la copia siguen igual
+            self.assertEqual(cache.get(REGIONES._clave_version), version)
+            self.assertIsNone(REGIONES.por_nombre("Cusco"))
+
+        for callback in callbacks:
+            callback()
+        self.assertNotEqual(cache.get(REGIONES._clave_version), version)
+        self.assertIsNotNone(REGIONES.por_nombre("Cusco"))
+
+
+class LoadSeedBulkTests(TestCase):
+    def load_seed(self, *argumentos):
+        salida = StringIO()
+        call_command("load_seed", *argumentos, stdout=salida)
+        return salida.getvalue()
+
+    def filas(self):
+        return {
+            modelo.__name__: modelo.objects.count()
+            for modelo in (Region, Cargo, Partido, Candidato, Antecedente, Usuario, Voto)
+        }
+
+    def test_segunda_carga_no_duplica(self):
+        self.load_seed("--bulk", "--with-votes")
+        filas = self.filas()
+
+        salida = self.load_seed("--bulk", "--with-votes")
+
+        self.assertEqual(self.filas(), filas)
+        self.assertIn("✓ 0 candidatos nuevos", salida)
+        self.assertIn("✓ 0 antecedentes nuevos", salida)
+        self.assertIn("✓ 0 usuarios y 0 votos nuevos", salida)
+        self.assertEqual(
+            ConteoCandidato.objects.aggregate(total=Sum("total_votos"))["total"],
+            filas["Voto"],
+        )
+
+    def test_bulk_reconoce_la_carga_fila_por_fila(self):
+        self.load_seed()
+        filas = self.filas()
+
+        salida = self.load_seed("--bulk")
+
+        self.assertEqual(self.filas(), filas)
+        self.assertIn("✓ 0 candidatos nuevos", salida)
+        self.assertIn("✓ 0 antecedentes nuevos", salida)
+
+
+class GenerarElectoradoTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        call_command("load_seed", "--bulk", stdout=StringIO())
+
+    def generar(self, *argumentos):
+        call_command(
+            "generar_electorado", "--votantes", "300", "--lote", "120", *argumentos,
+            stdout=StringIO(),
+        )
+
+    def votos_por_candidato(self):
+        return dict(
+            Voto.objects.filter(usuario__dni__startswith="S")
+            .values_list("candidato_id")
+            .annotate(total=Count("id"))
+        )
+
+    def test_electorado_consistente(self):
+        self.generar("--participacion", "1")
+
+        sinteticos = Usuario.objects.filter(dni__startswith="S")
+        self.assertEqual(sinteticos.count(), 300)
+        votos = Voto.objects.filter(usuario__in=sinteticos)
+        # Un voto por cargo y votante; diputados solo de la región del votante
+        self.assertEqual(votos.count(), votos.values("usuario_id", "cargo_id").distinct().count())
+        self.assertFalse(
+            votos.filter(cargo__nombre_cargo="Diputado")
+            .exclude(candidato__region_id=F("usuario__region_id"))
+            .exists()
+        )
+        self.assertEqual(
+            ConteoCandidato.objects.aggregate(total=Sum("total_votos"))["total"],
+            Voto.objects.count(),
+        )
+
+    def test_misma_semilla_mismo_electorado(self):
+        self.generar("--semilla", "7")
+        primero = self.votos_por_candidato()
+        self.assertTrue(primero)
+
+        with self.assertRaises(CommandError):
+            self.generar("--semilla", "7")  # Ya existe: hay que limpiar antes
+        self.generar("--limpiar")
+        self.assertEqual(self.votos_por_candidato(), {})
+        self.generar("--semilla", "7")
+
+        self.assertEqual(self.votos_por_candidato(), primero)
+
+
+class MetricasTests(SimpleTestCase):
+    @override_settings(METRICAS_TOKEN="", DEBUG=False)
+    def test_sin_token_cerrado_en_produccion(self):
+        respuesta = self.client.get(reverse("metricas"), REMOTE_ADDR="127.0.0.1")
+
+        self.assertEqual(respuesta.status_code, 403)
+
+    @override_settings(METRICAS_TOKEN="", DEBUG=True)
+    def test_sin_token_abierto_en_desarrollo(self):
+        self.assertEqual(self.client.get(reverse("metricas")).status_code, 200)
+
+    @override_settings(METRICAS_TOKEN="secreto", DEBUG=True)
+    def test_con_token_lo_exige(self):
+        sin_token = self.client.get(reverse("metricas"))
+        con_token = self.client.get(
+            reverse("metricas"), HTTP_AUTHORIZATION="Bearer secreto"
+        )
+
+        self.assertEqual((sin_token.status_code, con_token.status_code), (403, 200))
+
+    def test_maximo_sin_etiqueta_de_detalle(self):
+        metricas.maximo("prueba_lenta_ms.vista").observar(12.5, "SELECT * FROM votos")
+
+        texto = metricas.exportar_prometheus()
+
+        self.assertIn('prueba_lenta_ms_max{clave="vista"} 12.5', texto)
+        self.assertNotIn("SELECT", texto)
+
+
+class ModosConexionTests(SimpleTestCase):
+    """Configuraciones de DB_CONEXIONES que arma benchmark_conexiones."""
+
+    databases = {"default"}  # Conexiones propias, sin escribir
+
+    def conectar(self, configuracion):
+        conexion = load_backend(configuracion["ENGINE"]).DatabaseWrapper(configuracion, "default")
+        with conexion.cursor() as cursor:
+            cursor.execute("SELECT pg_backend_pid()")
+            pid = cursor.fetchone()[0]
+        conexion.close()
+        return conexion, pid
+
+    def test_configuracion_por_modo(self):
+        configuraciones = {
+            modo: BenchmarkConexiones()._configuracion(modo)
+            for modo in ("directa", "persistente", "pool", "pgbouncer")
+        }
+
+        self.assertEqual(configuraciones["directa"]["CONN_MAX_AGE"], 0)
+        self.assertEqual(configuraciones["persistente"]["CONN_MAX_AGE"], settings.DB_CONN_MAX_AGE)
+        self.assertEqual(configuraciones["pool"]["CONN_MAX_AGE"], 0)
+        self.assertEqual(configuraciones["pool"]["OPTIONS"]["pool"], settings.DB_POOL)
+        self.assertTrue(configuraciones["pgbouncer"]["DISABLE_SERVER_SIDE_CURSORS"])
+        for modo in ("directa", "persistente", "pgbouncer"):
+            self.assertNotIn("pool", configuraciones[modo]["OPTIONS"])
+
+    def test_pool_reutiliza_sus_sesiones(self):
+        configuracion = BenchmarkConexiones()._configuracion("pool")
+        conexion, _ = self.conectar(configuracion)
+        self.addCleanup(conexion.close_pool)
+        conexion.pool.wait()  # Abiertas las min_size conexiones iniciales
+
+        sesiones = {self.conectar(configuracion)[1] for _ in range(10)}
+
+        # close() devuelve la conexión al pool: no se abren sesiones nuevas
+        self.assertLessEqual(len(sesiones), conexion.pool.get_stats()["pool_size"])
+        self.assertLess(len(sesiones), 10)
+
+    def test_directa_abre_una_sesion_por_conexion(self):
+        configuracion = BenchmarkConexiones()._configuracion("directa")
+
+        sesiones = {self.conectar(configuracion)[1] for _ in range(3)}
+
+        self.assertEqual(len(sesiones), 3)
+
+
+@override_settings(DATABASE_REPLICAS=["replica1"])
+class RuteoReplicasTests(SimpleTestCase):
+    """Decisiones de ReplicaRouter dentro de ReplicaMiddleware (sin conectarse)."""
+
+    def setUp(self):
+        cache.clear()
+        parche = mock.patch.object(replicas.REPLICAS, "disponibles", return_value=["replica1"])
+        parche.start()
+        self.addCleanup(parche.stop)
+        self.usuario = Usuario(pk=41, dni="99999941")
+
+    def peticion(self, metodo="get", usuario=None, lectura_replica=True, status=200):
+        """
+        Ejecuta una petición por el middleware.
+
+        Returns:
+            str | None: Alias que el router eligió para leer durante la petición
+        """
+        elegido = {}
+
+        def vista(request):
+            elegido["alias"] = replicas.ReplicaRouter().db_for_read(Candidato)
+            return HttpResponse(status=status)
+
+        vista.lectura_replica = lectura_replica
+
+        def get_response(request):
+            middleware.process_view(request, vista, (), {})
+            return vista(request)
+
+        middleware = ReplicaMiddleware(get_response)
+        request = getattr(RequestFactory(), metodo)("/")
+        if usuario is not None:
+            request.user = usuario
+        middleware(request)
+        return elegido["alias"]
+
+    def test_get_marcado_lee_de_la_replica(self):
+        self.assertEqual(self.peticion(), "replica1")
+        self.assertIsNone(self.peticion(lectura_replica=False))
+        self.assertIsNone(self.peticion("post", lectura_replica=True, status=201))
+
+    def test_tras_escribir_el_usuario_lee_de_la_primaria(self):
+        self.peticion("post", self.usuario, status=201)
+
+        self.assertEqual(self.peticion(usuario=self.usuario), "default")
+        otro = Usuario(pk=42, dni="99999942")
+        self.assertEqual(self.peticion(usuario=otro), "replica1")
+
+    def test_escritura_fallida_no_fija_la_primaria(self):
+        self.peticion("post", self.usuario, status=400)
+
+        self.assertEqual(self.peticion(usuario=self.usuario), "replica1")
+
+
+class RetrasoReplicaTests(SimpleTestCase):
+    databases = {"default"}
+
+    def retraso(self, sql=None):
+        with mock.patch.object(replicas, "SQL_RETRASO", sql or replicas.SQL_RETRASO):
+            return replicas.REPLICAS._retraso("default")
+
+    def test_primaria_sin_retraso(self):
+        self.assertEqual(self.retraso(), 0.0)
+
+    def test_sin_streaming_no_se_usa(self):
+        with self.assertLogs("apps.core.replicas", "WARNING"):
+            self.assertEqual(self.retraso("SELECT NULL::float"), float("inf"))
+
+    def test_retraso_medido(self):
+        self.assertEqual(self.retraso("SELECT 1.5"), 1.5)
@@ -1,3 +1,26 @@
-from django.shortcuts import render
+import hmac
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseForbidden
+from django.views.decorators.http import require_GET
+from apps.core.metricas import exportar_prometheus
 
-# Create your views here.
+
+@require_GET
+def metricas(request):
+    """
+    GET /api/metricas/
+    Métricas de este proceso en formato de texto de Prometheus (latencia, consultas
+    y tiempo SQL por vista, RENIEC). Endpoint interno: exige
+    "Authorization: Bearer <METRICAS_TOKEN>". Sin METRICAS_TOKEN solo responde
+    con DEBUG activo (desarrollo); en producción queda cerrado.
+    """
+    if settings.METRICAS_TOKEN:
+        esperado = f"Bearer {settings.METRICAS_TOKEN}"
+        if not hmac.compare_digest(request.headers.get("Authorization", ""), esperado):
+            return HttpResponseForbidden()
+    elif not settings.DEBUG:
+        return HttpResponseForbidden()
+
+    return HttpResponse(
+        exportar_prometheus(), content_type="text/plain; version=0.0.4; charset=utf-8"
+    )
@@ -0,0 +1,109 @@
+import json
+from django.db import IntegrityError
+from django.http import JsonResponse
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_POST
+from rest_framework import status
+from rest_framework.exceptions import APIException, ValidationError
+from apps.core.referencia import REGIONES
+from apps.usuarios.models import Usuario
+from apps.usuarios.serializers import (  # type: ignore
+    RegistroFormatoSerializer,
+    UsuarioSerializer,
+    ValidarDNISerializer,
+)
+from apps.usuarios.services import ReniecService
+from apps.usuarios.tokens import obtener_tokens
+
+# Vistas async (ASGI) de validación de DNI y registro.
+# Mientras esperan a RENIEC no ocupan un hilo: un solo worker ASGI puede
+# sostener cientos de registros en curso. Responden igual que las vistas
+# DRF equivalentes de views.py (DRF no soporta vistas async).
+
+
+def _leer_json(request):
+    try:
+        datos = json.loads(request.body or b"{}")
+    except ValueError:
+        raise ValidationError({"detail": "JSON inválido"})
+    if not isinstance(datos, dict):
+        raise ValidationError({"detail": "Se esperaba un objeto JSON"})
+    return datos
+
+
+def _respuesta_error(error):
+    """Misma forma que el manejador de excepciones de DRF."""
+    if isinstance(error, ValidationError):
+        return JsonResponse(error.detail, status=error.status_code, safe=False)
+    return JsonResponse({"detail": error.detail}, status=error.status_code)
+
+
+@csrf_exempt
+@require_POST
+async def validar_dni(request):
+    """
+    POST /api/usuarios/async/validar-dni/
+    Versión async de /api/usuarios/validar-dni/ (mismo body y respuesta).
+    """
+    try:
+        serializer = ValidarDNISerializer(data=_leer_json(request))
+        serializer.is_valid(raise_exception=True)
+
+        datos = await ReniecService.aconsultar_dni(serializer.validated_data["dni"])
+    except APIException as e:
+        return _respuesta_error(e)
+
+    return JsonResponse(datos, status=status.HTTP_200_OK)
+
+
+@csrf_exempt
+@require_POST
+async def registro(request):
+    """
+    POST /api/usuarios/async/registro/
+    Versión async de /api/usuarios/registro/ (mismo body y respuesta).
+
+    Verifica el DNI y la región con el ORM async, espera a RENIEC con el
+    cliente httpx y crea el usuario con Usuario.objects.acreate_user.
+    """
+    try:
+        serializer = RegistroFormatoSerializer(data=_leer_json(request))
+        serializer.is_valid(raise_exception=True)
+        dni = serializer.validated_data["dni"]
+
+        if await Usuario.objects.filter(dni=dni).aexists():
+            raise ValidationError({"dni": ["Este DNI ya está registrado"]})
+
+        region = await REGIONES.apor_id(serializer.validated_data["region_id"])
+        if region is None:
+            raise ValidationError({"region_id": ["La región seleccionada no existe"]})
+
+        datos_reniec = await ReniecService.aconsultar_dni(dni)
+
+        try:
+            usuario = await Usuario.objects.acreate_user(
+                dni=dni,
+                nombre=datos_reniec["nombre"],
+                apellido_paterno=datos_reniec["apellido_paterno"],
+                apellido_materno=datos_reniec["apellido_materno"],
+                region=region,
+                password=serializer.validated_data["password"],
+                rol="votante",  # Los usuarios registrados son votantes
+            )
+        except IntegrityError:
+            # Otra petición registró el mismo DNI mientras esperábamos a RENIEC
+            raise ValidationError({"dni": ["Este DNI ya está registrado"]})
+    except APIException as e:
+        return _respuesta_error(e)
+
+    # Generar tokens JWT para login automático
+    tokens = obtener_tokens(usuario)
+
+    return JsonResponse(
+        {
+            "user": UsuarioSerializer(usuario).data,
+            "tokens": tokens,
+            "message": "Usuario registrado exitosamente",
+        },
+        status=status.HTTP_201_CREATED,
+    )
@@ -0,0 +1,38 @@
+from rest_framework_simplejwt.authentication import JWTAuthentication  # type: ignore
+from rest_framework_simplejwt.exceptions import InvalidToken  # type: ignore
+from rest_framework_simplejwt.settings import api_settings  # type: ignore
+from apps.usuarios.models import Usuario
+from apps.usuarios.tokens import CLAIMS_USUARIO
+
+
+class JWTSinConsultaAuthentication(JWTAuthentication):
+    """
+    Autenticación JWT sin consultar la BD en cada petición.
+
+    Arma el usuario con los claims del token (id, dni, rol, region_id) como
+    una instancia de Usuario con el resto de campos diferidos: sirve para
+    filtros y FKs (usuario=request.user) y para puede_votar(); si una vista
+    lee otro campo (nombre, is_staff...), Django lo carga de la BD al acceder.
+
+    Los claims reflejan al usuario cuando se emitió el token, como máximo
+    ACCESS_TOKEN_LIFETIME: al renovar (RefreshVotanteSerializer) se relee de la
+    BD. Las vistas que necesitan datos frescos (p. ej. perfil) deben leer el
+    usuario de la BD. Los tokens sin claims (emitidos antes) se resuelven con la
+    BD como siempre.
+    """
+
+    def get_user(self, validated_token):
+        if not all(claim in validated_token for claim in CLAIMS_USUARIO):
+            return super().get_user(validated_token)
+
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken("El token no identifica a ningún usuario")
+
+        # is_active: RefreshVotanteSerializer no renueva tokens de usuarios inactivos
+        claims = {"id": user_id, "is_active": True}
+        claims.update((claim, validated_token[claim]) for claim in CLAIMS_USUARIO)
+        # from_db asigna los valores en el orden de los campos del modelo
+        campos = [f.attname for f in Usuario._meta.concrete_fields if f.attname in claims]
+        return Usuario.from_db("default", campos, [claims[campo] for campo in campos])
@@ -0,0 +1,51 @@
+from django.conf import settings
+from django.contrib.auth.hashers import (
+    Argon2PasswordHasher,
+    PBKDF2PasswordHasher,
+    ScryptPasswordHasher,
+)
+
+# Hashers con costo configurable por variables de entorno (ver settings.py).
+# Conservan el nombre de algoritmo de Django, así verifican los hashes ya
+# guardados; si los parámetros cambian, Django re-hashea la contraseña en el
+# siguiente login correcto (must_update + check_password).
+
+
+class PBKDF2AjustadoHasher(PBKDF2PasswordHasher):
+    """PBKDF2-SHA256 con PASSWORD_PBKDF2_ITERACIONES iteraciones."""
+
+    @property
+    def iterations(self):
+        return settings.PASSWORD_PBKDF2_ITERACIONES
+
+
+class Argon2AjustadoHasher(Argon2PasswordHasher):
+    """Argon2id con costo en tiempo, memoria (KiB) y paralelismo configurables."""
+
+    @property
+    def time_cost(self):
+        return settings.PASSWORD_ARGON2_TIEMPO
+
+    @property
+    def memory_cost(self):
+        return settings.PASSWORD_ARGON2_MEMORIA_KIB
+
+    @property
+    def parallelism(self):
+        return settings.PASSWORD_ARGON2_PARALELISMO
+
+
+class ScryptAjustadoHasher(ScryptPasswordHasher):
+    """scrypt con N (work_factor), r y p configurables. Memoria: 128 * N * r bytes."""
+
+    @property
+    def work_factor(self):
+        return settings.PASSWORD_SCRYPT_N
+
+    @property
+    def block_size(self):
+        return settings.PASSWORD_SCRYPT_R
+
+    @property
+    def parallelism(self):
+        return settings.PASSWORD_SCRYPT_P
@@ -0,0 +1,71 @@
+import time
+from django.conf import settings
+from django.contrib.auth.hashers import get_hasher
+from django.core.management.base import BaseCommand
+from django.utils.module_loading import import_string
+
+CONTRASENA = "contraseña-de-prueba"
+
+
+class Command(BaseCommand):
+    help = (
+        "Mide cada hasher de contraseñas con los parámetros actuales: "
+        "ms por verificación y logins/seg por núcleo (un solo hilo)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--repeticiones",
+            type=int,
+            default=20,
+            help="Verificaciones por hasher (por defecto 20)",
+        )
+
+    def handle(self, *args, **options):
+        repeticiones = options["repeticiones"]
+        preferido = get_hasher().algorithm
+
+        self.stdout.write(
+            f"{'hasher':<15} {'parámetros':<28} {'ms/hash':>9} {'ms/login':>9} "
+            f"{'logins/s/núcleo':>16}"
+        )
+        for ruta in settings.PASSWORD_HASHERS:
+            hasher = import_string(ruta)()
+            try:
+                inicio = time.perf_counter()
+                encoded = hasher.encode(CONTRASENA, hasher.salt())
+                ms_hash = (time.perf_counter() - inicio) * 1000
+            except ValueError as e:
+                # p. ej. argon2-cffi no instalado
+                self.stdout.write(f"{hasher.algorithm:<15} no disponible: {e}")
+                continue
+
+            inicio = time.perf_counter()
+            for _ in range(repeticiones):
+                hasher.verify(CONTRASENA, encoded)
+            ms_login = (time.perf_counter() - inicio) * 1000 / repeticiones
+
+            nombre = hasher.algorithm + (" *" if hasher.algorithm == preferido else "")
+            self.stdout.write(
+                f"{nombre:<15} {self._parametros(hasher):<28} {ms_hash:>9.1f} "
+                f"{ms_login:>9.1f} {1000 / ms_login:>16.1f}"
+            )
+
+        self.stdout.write(
+            "\n* = PASSWORD_HASHER actual. Capacidad de login aproximada: "
+            "logins/s/núcleo x núcleos de la flota."
+        )
+
+    def _parametros(self, hasher):
+        if hasher.algorithm == "argon2":
+            return (
+                f"t={hasher.time_cost} m={hasher.memory_cost}KiB "
+                f"p={hasher.parallelism}"
+            )
+        if hasher.algorithm == "scrypt":
+            memoria_mib = 128 * hasher.work_factor * hasher.block_size / 2**20
+            return (
+                f"N={hasher.work_factor} r={hasher.block_size} "
+                f"p={hasher.parallelism} ({memoria_mib:.0f}MiB)"
+            )
+        return f"iteraciones={hasher.iterations}"
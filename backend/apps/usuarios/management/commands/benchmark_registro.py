@@ -0,0 +1,142 @@
+import asyncio
+import time
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.test import AsyncClient, Client, override_settings
+from django.urls import reverse
+from apps.core.benchmark import ejecutar_concurrente, percentiles
+from apps.core.models import Region
+from apps.usuarios.models import Usuario
+from apps.usuarios.reniec_fake import ServidorReniecFake
+from apps.usuarios.services import _clave_cache
+
+PREFIJO_DNI = "98"  # DNIs ficticios 98000001... (8 dígitos, RENIEC simulado los acepta)
+
+
+class Command(BaseCommand):
+    help = (
+        "Compara registros/seg sostenidos de la vista síncrona (WSGI, un hilo por "
+        "worker) contra la vista async (ASGI, un solo event loop) con un RENIEC "
+        "simulado lento. Crea usuarios ficticios y los elimina al terminar."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--registros",
+            type=int,
+            default=400,
+            help="Registros por modo (por defecto 400)",
+        )
+        parser.add_argument(
+            "--hilos",
+            type=int,
+            default=8,
+            help="Hilos del servidor WSGI simulado (por defecto 8)",
+        )
+        parser.add_argument(
+            "--concurrencia",
+            type=int,
+            default=200,
+            help="Registros en curso a la vez en el modo ASGI (por defecto 200)",
+        )
+        parser.add_argument(
+            "--latencia",
+            type=int,
+            default=300,
+            help="Latencia simulada de RENIEC en ms (por defecto 300)",
+        )
+
+    def handle(self, *args, **options):
+        hilos = options["hilos"]
+        por_hilo = max(1, options["registros"] // hilos)
+        total = por_hilo * hilos
+
+        region = Region.objects.first()
+        if region is None:
+            raise CommandError("No hay regiones. Ejecuta primero load_seed.")
+        if Usuario.objects.filter(dni__startswith=PREFIJO_DNI).exists():
+            raise CommandError(
+                "Ya existen usuarios de benchmark; elimínalos antes de continuar."
+            )
+
+        dnis = [f"{PREFIJO_DNI}{n:06d}" for n in range(1, total * 2 + 1)]
+        sincronos, asincronos = dnis[:total], dnis[total:]
+
+        def cuerpo(dni):
+            return {"dni": dni, "region_id": region.id, "password": "benchmark"}
+
+        # El hasher más barato: se mide la espera a RENIEC, no el hash
+        with ServidorReniecFake(latencia=options["latencia"] / 1000) as servidor, override_settings(
+            RENIEC_API_URL=servidor.url,
+            PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"],
+        ):
+            try:
+                # WSGI: cada hilo es un worker que atiende una petición a la vez
+                url = reverse("registro")
+
+                def registrar(hilo, i):
+                    respuesta = Client().post(
+                        url, cuerpo(sincronos[hilo * por_hilo + i]), content_type="application/json"
+                    )
+                    if respuesta.status_code != 201:
+                        raise RuntimeError(respuesta.content)
+
+                wsgi = ejecutar_concurrente(registrar, hilos, por_hilo)
+
+                # ASGI: un solo event loop con muchas peticiones en curso
+                asgi = asyncio.run(
+                    self._registrar_async(
+                        reverse("registro_async"),
+                        [cuerpo(dni) for dni in asincronos],
+                        options["concurrencia"],
+                    )
+                )
+            finally:
+                Usuario.objects.filter(dni__in=dnis).delete()
+                cache.delete_many([_clave_cache(dni) for dni in dnis])
+
+        self.stdout.write(
+            f"\n{total} registros por modo, RENIEC a {options['latencia']} ms, "
+            f"{servidor.consultas} consultas a RENIEC\n"
+        )
+        self.stdout.write(
+            f"{'modo':<32} {'registros/s':>12} {'errores':>8} {'p50 ms':>8} {'p99 ms':>8}"
+        )
+        for nombre, resultado in (
+            (f"WSGI ({hilos} hilos)", wsgi),
+            (f"ASGI (1 loop, {options['concurrencia']} en curso)", asgi),
+        ):
+            latencia = resultado["latencia_ms"]
+            self.stdout.write(
+                f"{nombre:<32} {resultado['por_segundo']:>12} {resultado['errores']:>8} "
+                f"{latencia['p50']:>8} {latencia['p99']:>8}"
+            )
+        self.stdout.write("Usuarios ficticios eliminados.")
+
+    async def _registrar_async(self, url, cuerpos, concurrencia):
+        cliente = AsyncClient()
+        semaforo = asyncio.Semaphore(concurrencia)
+        latencias = []
+        errores = 0
+
+        async def registrar(datos):
+            nonlocal errores
+            async with semaforo:
+                inicio = time.perf_counter()
+                respuesta = await cliente.post(url, datos, content_type="application/json")
+                if respuesta.status_code != 201:
+                    errores += 1
+                    return
+                latencias.append(time.perf_counter() - inicio)
+
+        inicio = time.perf_counter()
+        await asyncio.gather(*(registrar(datos) for datos in cuerpos))
+        segundos = time.perf_counter() - inicio
+
+        return {
+            "operaciones": len(latencias),
+            "errores": errores,
+            "segundos": round(segundos, 3),
+            "por_segundo": round(len(latencias) / segundos, 1) if segundos else None,
+            "latencia_ms": percentiles(latencias),
+        }
@@ -0,0 +1,89 @@
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.test import override_settings
+from rest_framework.exceptions import ValidationError
+from apps.core.benchmark import ejecutar_concurrente
+from apps.usuarios.reniec_fake import ServidorReniecFake
+from apps.usuarios.services import ReniecService, _clave_cache
+
+
+class Command(BaseCommand):
+    help = (
+        "Mide la caché de RENIEC contra un servidor RENIEC local simulado: "
+        "consultas a RENIEC, tasa de aciertos y latencia con y sin caché."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--hilos",
+            type=int,
+            default=8,
+            help="Consultas concurrentes (por defecto 8)",
+        )
+        parser.add_argument(
+            "--consultas",
+            type=int,
+            default=400,
+            help="Consultas por modo (por defecto 400)",
+        )
+        parser.add_argument(
+            "--dnis",
+            type=int,
+            default=20,
+            help="DNI distintos consultados (por defecto 20, 1 de cada 10 inexistente)",
+        )
+        parser.add_argument(
+            "--latencia",
+            type=int,
+            default=100,
+            help="Latencia simulada de RENIEC en ms (por defecto 100)",
+        )
+
+    def handle(self, *args, **options):
+        hilos = options["hilos"]
+        por_hilo = max(1, options["consultas"] // hilos)
+        # Los DNI que empiezan con 0 no existen en el servidor simulado
+        dnis = [
+            f"0{n:07d}" if n % 10 == 0 else f"{70000000 + n}"
+            for n in range(1, options["dnis"] + 1)
+        ]
+
+        def consultar(funcion):
+            def operacion(hilo, i):
+                # Todos los hilos piden el mismo DNI a la vez (peor caso)
+                try:
+                    funcion(dnis[i % len(dnis)])
+                except ValidationError:
+                    pass  # DNI inexistente: respuesta válida
+
+            return operacion
+
+        resultados = []
+        with ServidorReniecFake(latencia=options["latencia"] / 1000) as servidor:
+            with override_settings(RENIEC_API_URL=servidor.url):
+                for nombre, funcion in (
+                    ("sin caché", ReniecService._consultar_api),
+                    ("con caché", ReniecService.consultar_dni),
+                ):
+                    cache.delete_many([_clave_cache(dni) for dni in dnis])
+                    servidor.consultas = 0
+                    resultado = ejecutar_concurrente(consultar(funcion), hilos, por_hilo)
+                    resultado["reniec"] = servidor.consultas
+                    resultados.append((nombre, resultado))
+        cache.delete_many([_clave_cache(dni) for dni in dnis])
+
+        self.stdout.write(
+            f"\n{por_hilo * hilos} consultas por modo, {hilos} hilos, "
+            f"{len(dnis)} DNI, RENIEC a {options['latencia']} ms\n"
+        )
+        self.stdout.write(
+            f"{'modo':<12} {'RENIEC':>7} {'aciertos':>9} {'consultas/s':>12} "
+            f"{'p50 ms':>8} {'p99 ms':>8}"
+        )
+        for nombre, resultado in resultados:
+            aciertos = 1 - resultado["reniec"] / resultado["operaciones"]
+            latencia = resultado["latencia_ms"]
+            self.stdout.write(
+                f"{nombre:<12} {resultado['reniec']:>7} {aciertos:>9.1%} "
+                f"{resultado['por_segundo']:>12} {latencia['p50']:>8} {latencia['p99']:>8}"
+            )
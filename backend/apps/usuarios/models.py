@@ -1,3 +1,4 @@
+from asgiref.sync import sync_to_async
 from django.contrib.auth.models import (
     AbstractBaseUser,
     BaseUserManager,
@@ -38,6 +39,33 @@ class UsuarioManager(BaseUserManager):
         user.save(using=self._db)
         return user
 
+    async def acreate_user(
+        self,
+        dni,
+        nombre,
+        apellido_paterno,
+        apellido_materno,
+        region,
+        password=None,
+        **extra_fields,
+    ):
+        """Versión async de create_user (vistas ASGI)."""
+        if not dni:
+            raise ValueError("El DNI es obligatorio")
+
+        user = self.model(
+            dni=dni,
+            nombre=nombre,
+            apellido_paterno=apellido_paterno,
+            apellido_materno=apellido_materno,
+            region=region,
+            **extra_fields,
+        )
+        # Hashear es CPU puro: en un hilo aparte para no bloquear el event loop
+        await sync_to_async(user.set_password, thread_sensitive=False)(password)
+        await user.asave(using=self._db)
+        return user
+
     def create_superuser(
         self, dni, nombre, apellido_paterno, apellido_materno, region, password=None
     ):
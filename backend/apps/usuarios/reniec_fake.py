@@ -0,0 +1,93 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+
+class _Servidor(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 1024  # Aguanta cientos de conexiones simultáneas
+
+
+class ServidorReniecFake:
+    """
+    Servidor HTTP local que imita la API de RENIEC (formato de decolecta)
+    para medir la caché sin depender del servicio real.
+
+    - DNI que empiezan con "0": responde 404 (no existe).
+    - Cualquier otro DNI: responde 200 con nombres ficticios.
+    - Con `fallando = True` responde 503 a todo (para probar el circuito).
+    - Con `malformado = True` responde 200 con un cuerpo que no es JSON.
+    - Cada respuesta tarda `latencia` segundos.
+
+    Uso:
+        with ServidorReniecFake(latencia=0.2) as servidor:
+            with override_settings(RENIEC_API_URL=servidor.url):
+                ...
+            servidor.consultas  # Peticiones recibidas
+    """
+
+    def __init__(self, latencia=0.1, puerto=0):
+        self.latencia = latencia
+        self.consultas = 0
+        self.fallando = False
+        self.malformado = False
+        self._lock = threading.Lock()
+        self._servidor = _Servidor(("127.0.0.1", puerto), self._handler())
+        self._hilo = None
+
+    @property
+    def url(self):
+        host, puerto = self._servidor.server_address[:2]
+        return f"http://{host}:{puerto}/v1/reniec/dni"
+
+    def _handler(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                with fake._lock:
+                    fake.consultas += 1
+                time.sleep(fake.latencia)
+
+                dni = parse_qs(urlparse(self.path).query).get("numero", [""])[0]
+                if fake.fallando:
+                    self._responder(503, {"message": "service unavailable"})
+                elif fake.malformado:
+                    self._responder(200, "<html>Bad Gateway</html>", json_=False)
+                elif dni.startswith("0"):
+                    self._responder(404, {"message": "not found"})
+                else:
+                    self._responder(
+                        200,
+                        {
+                            "first_name": "CIUDADANO",
+                            "first_last_name": "DE PRUEBA",
+                            "second_last_name": dni,
+                            "document_number": dni,
+                        },
+                    )
+
+            def _responder(self, codigo, cuerpo, json_=True):
+                contenido = (json.dumps(cuerpo) if json_ else cuerpo).encode()
+                self.send_response(codigo)
+                self.send_header("Content-Type", "application/json" if json_ else "text/html")
+                self.send_header("Content-Length", str(len(contenido)))
+                self.end_headers()
+                self.wfile.write(contenido)
+
+            def log_message(self, *args):
+                pass  # Sin logs por petición
+
+        return Handler
+
+    def __enter__(self):
+        self._hilo = threading.Thread(target=self._servidor.serve_forever, daemon=True)
+        self._hilo.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._servidor.shutdown()
+        self._servidor.server_close()
+        self._hilo.join()
@@ -1,6 +1,11 @@
 from rest_framework import serializers
+from rest_framework_simplejwt.exceptions import AuthenticationFailed  # type: ignore
+from rest_framework_simplejwt.serializers import TokenRefreshSerializer  # type: ignore
+from rest_framework_simplejwt.settings import api_settings  # type: ignore
 from apps.usuarios.models import Usuario
+from apps.usuarios.tokens import TokenVotante
 from apps.core.models import Region
+from apps.core.referencia import REGIONES
 from apps.usuarios.services import ReniecService
 
 
@@ -40,10 +45,10 @@ class UsuarioSerializer(serializers.ModelSerializer):
         return obj.get_full_name()
 
 
-class RegistroSerializer(serializers.Serializer):
+class RegistroFormatoSerializer(serializers.Serializer):
     """
-    Serializer para registrar un nuevo usuario.
-    Consulta RENIEC automáticamente con el DNI.
+    Formato de los datos de registro, sin consultas a la BD.
+    Lo usan las vistas async, que validan contra la BD con el ORM async.
     """
 
     dni = serializers.CharField(max_length=8, min_length=8)
@@ -51,9 +56,20 @@ class RegistroSerializer(serializers.Serializer):
     password = serializers.CharField(write_only=True, min_length=6)
 
     def validate_dni(self, value):
-        """Valida que el DNI tenga formato correcto y no esté registrado"""
         if not value.isdigit():
             raise serializers.ValidationError("El DNI debe contener solo números")
+        return value
+
+
+class RegistroSerializer(RegistroFormatoSerializer):
+    """
+    Serializer para registrar un nuevo usuario.
+    Consulta RENIEC automáticamente con el DNI.
+    """
+
+    def validate_dni(self, value):
+        """Valida que el DNI tenga formato correcto y no esté registrado"""
+        value = super().validate_dni(value)
 
         # Verificar si ya existe un usuario con este DNI
         if Usuario.objects.filter(dni=value).exists():
@@ -63,9 +79,7 @@ class RegistroSerializer(serializers.Serializer):
 
     def validate_region_id(self, value):
         """Valida que la región exista"""
-        try:
-            Region.objects.get(id=value)
-        except Region.DoesNotExist:
+        if REGIONES.por_id(value) is None:
             raise serializers.ValidationError("La región seleccionada no existe")
         return value
 
@@ -81,7 +95,7 @@ class RegistroSerializer(serializers.Serializer):
         datos_reniec = ReniecService.consultar_dni(dni)
 
         # Obtener la región
-        region = Region.objects.get(id=region_id)
+        region = REGIONES.por_id(region_id)
 
         # Crear el usuario con los datos de RENIEC
         usuario = Usuario.objects.create_user(
@@ -109,3 +123,38 @@ class ValidarDNISerializer(serializers.Serializer):
         if not value.isdigit():
             raise serializers.ValidationError("El DNI debe contener solo números")
         return value
+
+
+class RefreshVotanteSerializer(TokenRefreshSerializer):
+    """
+    Renovación de tokens (POST /api/usuarios/token/refresh/) que relee al
+    usuario de la BD: los claims de TokenVotante (dni, rol, region_id) se
+    emiten de nuevo con los datos actuales y un usuario desactivado ya no
+    puede renovar. Los refresh tokens sin claims (emitidos antes) reciben
+    tokens con claims.
+    """
+
+    token_class = TokenVotante
+
+    def validate(self, attrs):
+        refresh = self.token_class(attrs["refresh"])
+
+        usuario = Usuario.objects.filter(
+            **{api_settings.USER_ID_FIELD: refresh.get(api_settings.USER_ID_CLAIM)}
+        ).first()
+        if not api_settings.USER_AUTHENTICATION_RULE(usuario):
+            raise AuthenticationFailed(
+                "El usuario no existe o está inactivo", code="user_inactive"
+            )
+
+        nuevo = self.token_class.for_user(usuario)
+        data = {"access": str(nuevo.access_token)}
+
+        if api_settings.ROTATE_REFRESH_TOKENS:
+            if api_settings.BLACKLIST_AFTER_ROTATION:
+                try:
+                    refresh.blacklist()
+                except AttributeError:
+                    pass  # App token_blacklist no instalada
+            data["refresh"] = str(nuevo)
+        return data
@@ -1,6 +1,136 @@
+import asyncio
+import threading
+import time
+import weakref
+import httpx
 import requests  # type: ignore
 from django.conf import settings
+from django.core.cache import cache
+from requests.adapters import HTTPAdapter  # type: ignore
+from rest_framework import status
 from rest_framework.exceptions import ValidationError, APIException
+from urllib3.util.retry import Retry
+from apps.core.circuito import Circuito
+from apps.core.metricas import histograma
+
+# Sesión HTTP compartida (pool de conexiones keep-alive), se crea al primer uso
+_sesion = None
+_sesion_guard = threading.Lock()
+
+# Abre el circuito tras fallos seguidos de RENIEC y responde 503 sin llamarlo
+circuito_reniec = Circuito(
+    "reniec",
+    umbral_fallos=settings.RENIEC_CIRCUITO_FALLOS,
+    segundos_abierto=settings.RENIEC_CIRCUITO_SEGUNDOS,
+)
+
+# Consultas a RENIEC en curso dentro del proceso: {dni: _ConsultaEnCurso}
+_en_curso = {}
+_en_curso_guard = threading.Lock()
+
+# Versión async: un cliente httpx y un mapa {dni: tarea} de consultas en curso por event loop
+_clientes_async = weakref.WeakKeyDictionary()
+_en_curso_async = weakref.WeakKeyDictionary()
+
+
+class _ConsultaEnCurso:
+    """Consulta compartida: un hilo la hace y los demás esperan su resultado."""
+
+    def __init__(self):
+        self.lista = threading.Event()
+        self.datos = None
+        self.error = None
+
+
+def _clave_cache(dni):
+    return f"reniec:dni:{dni}"
+
+
+def _obtener_sesion():
+    """
+    Sesión con pool de conexiones a RENIEC y reintentos con backoff.
+    Solo se reintentan errores de conexión y respuestas 502/503/504; un
+    timeout de lectura no se reintenta (ya esperamos demasiado).
+    """
+    global _sesion
+    with _sesion_guard:
+        if _sesion is None:
+            reintentos = Retry(
+                total=settings.RENIEC_REINTENTOS,
+                read=0,
+                backoff_factor=settings.RENIEC_BACKOFF_SEGUNDOS,
+                status_forcelist=(502, 503, 504),
+                allowed_methods=("GET",),
+                raise_on_status=False,
+            )
+            adaptador = HTTPAdapter(
+                pool_connections=1,
+                pool_maxsize=settings.RENIEC_POOL_CONEXIONES,
+                max_retries=reintentos,
+            )
+            sesion = requests.Session()
+            sesion.mount("https://", adaptador)
+            sesion.mount("http://", adaptador)
+            if settings.RENIEC_API_TOKEN:
+                sesion.headers["Authorization"] = f"Bearer {settings.RENIEC_API_TOKEN}"
+            _sesion = sesion
+        return _sesion
+
+
+def _obtener_cliente_async():
+    """
+    Cliente httpx con pool keep-alive para el event loop actual (las conexiones
+    async no se pueden compartir entre loops). httpx reintenta solo errores de
+    conexión; los 502/503/504 se reintentan en _allamar_api.
+    """
+    loop = asyncio.get_running_loop()
+    cliente = _clientes_async.get(loop)
+    if cliente is None:
+        headers = {}
+        if settings.RENIEC_API_TOKEN:
+            headers["Authorization"] = f"Bearer {settings.RENIEC_API_TOKEN}"
+        cliente = httpx.AsyncClient(
+            headers=headers,
+            timeout=httpx.Timeout(
+                settings.RENIEC_TIMEOUT_LECTURA, connect=settings.RENIEC_TIMEOUT_CONEXION
+            ),
+            limits=httpx.Limits(
+                max_connections=settings.RENIEC_POOL_CONEXIONES_ASYNC,
+                max_keepalive_connections=settings.RENIEC_POOL_CONEXIONES_ASYNC,
+            ),
+            transport=httpx.AsyncHTTPTransport(retries=settings.RENIEC_REINTENTOS),
+        )
+        _clientes_async[loop] = cliente
+    return cliente
+
+
+def _espera_maxima():
+    """Peor caso de una consulta a RENIEC, contando reintentos."""
+    intentos = settings.RENIEC_REINTENTOS + 1
+    return intentos * (settings.RENIEC_TIMEOUT_CONEXION + settings.RENIEC_TIMEOUT_LECTURA)
+
+
+def _registrar_resultado(resultado, inicio):
+    """Latencia al histograma reniec.<resultado> y éxito/fallo al circuito."""
+    histograma(f"reniec.{resultado}").observar(time.perf_counter() - inicio)
+    if resultado == "error":
+        circuito_reniec.registrar_fallo()
+    else:
+        circuito_reniec.registrar_exito()
+
+
+def _marcar_error_leido(futuro):
+    # Evita el aviso "exception was never retrieved" si nadie más esperaba
+    if not futuro.cancelled():
+        futuro.exception()
+
+
+class ReniecNoDisponible(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = (
+        "El servicio de RENIEC no está disponible. Intenta nuevamente en unos minutos."
+    )
+    default_code = "reniec_no_disponible"
 
 
 class ReniecService:
@@ -12,7 +142,16 @@ class ReniecService:
     @staticmethod
     def consultar_dni(dni):
         """
-        Consulta el DNI en la API de RENIEC.
+        Consulta el DNI en RENIEC usando la caché.
+
+        - Las respuestas válidas se guardan RENIEC_CACHE_SEGUNDOS y los DNI
+          inexistentes (400/404) RENIEC_CACHE_NEGATIVO_SEGUNDOS, así validar y
+          luego registrar el mismo DNI consulta a RENIEC una sola vez.
+        - Si varios hilos del proceso consultan el mismo DNI a la vez, solo uno
+          llama a RENIEC y los demás reciben su resultado.
+        - Los errores del servicio (5xx, timeouts) no se guardan.
+        - Si RENIEC viene fallando, el circuito está abierto y se responde 503
+          de inmediato (ver circuito_reniec).
 
         Args:
             dni (str): Número de DNI a consultar (8 dígitos)
@@ -28,66 +167,236 @@ class ReniecService:
 
         Raises:
             ValidationError: Si el DNI no existe o es inválido
-            APIException: Si hay error en el servicio de RENIEC
+            ReniecNoDisponible: Si hay error en el servicio de RENIEC (503)
         """
-        # Validar formato de DNI
+        ReniecService._validar_formato(dni)
+
+        clave = _clave_cache(dni)
+        guardado = cache.get(clave)
+        if guardado is not None:
+            return ReniecService._resolver(guardado)
+
+        with _en_curso_guard:
+            consulta = _en_curso.get(dni)
+            responsable = consulta is None
+            if responsable:
+                consulta = _en_curso[dni] = _ConsultaEnCurso()
+
+        if not responsable:
+            # Otro hilo ya está consultando este DNI: esperar su resultado
+            if not consulta.lista.wait(_espera_maxima() + 1):
+                raise ReniecNoDisponible()
+            if consulta.error is not None:
+                raise consulta.error
+            return ReniecService._resolver(consulta.datos)
+
+        try:
+            guardado, segundos = ReniecService._entrada_cache(
+                *ReniecService._consultar_api(dni)
+            )
+            cache.set(clave, guardado, segundos)
+            consulta.datos = guardado
+        except Exception as e:
+            consulta.error = e
+            raise
+        finally:
+            with _en_curso_guard:
+                _en_curso.pop(dni, None)
+            consulta.lista.set()
+
+        return ReniecService._resolver(guardado)
+
+    @staticmethod
+    async def aconsultar_dni(dni):
+        """
+        Versión async de consultar_dni para las vistas ASGI: misma caché y
+        mismo circuito, pero espera a RENIEC sin ocupar un hilo. Las consultas
+        simultáneas del mismo DNI en el event loop comparten una sola llamada.
+        """
+        ReniecService._validar_formato(dni)
+
+        clave = _clave_cache(dni)
+        guardado = await cache.aget(clave)
+        if guardado is not None:
+            return ReniecService._resolver(guardado)
+
+        en_curso = _en_curso_async.setdefault(asyncio.get_running_loop(), {})
+        tarea = en_curso.get(dni)
+        if tarea is None:
+            # La consulta corre en su propia tarea: si la petición que la inició
+            # se cancela (cliente desconectado), sigue para las demás
+            tarea = en_curso[dni] = asyncio.ensure_future(
+                ReniecService._aconsultar_y_guardar(dni, clave)
+            )
+            tarea.add_done_callback(lambda _: en_curso.pop(dni, None))
+            tarea.add_done_callback(_marcar_error_leido)
+
+        # shield: cancelar esta petición no cancela la consulta compartida
+        return ReniecService._resolver(await asyncio.shield(tarea))
+
+    @staticmethod
+    async def _aconsultar_y_guardar(dni, clave):
+        """Consulta RENIEC y guarda la respuesta en la caché; devuelve la entrada."""
+        guardado, segundos = ReniecService._entrada_cache(
+            *await ReniecService._aconsultar_api(dni)
+        )
+        await cache.aset(clave, guardado, segundos)
+        return guardado
+
+    @staticmethod
+    def _validar_formato(dni):
         if not dni or len(dni) != 8 or not dni.isdigit():
             raise ValidationError({"dni": "El DNI debe tener 8 dígitos numéricos"})
 
+    @staticmethod
+    def _entrada_cache(datos, no_encontrado):
+        """Entrada de caché y su duración para una respuesta de RENIEC."""
+        if no_encontrado:
+            return {"no_encontrado": no_encontrado}, settings.RENIEC_CACHE_NEGATIVO_SEGUNDOS
+        return {"datos": datos}, settings.RENIEC_CACHE_SEGUNDOS
+
+    @staticmethod
+    def _resolver(guardado):
+        """Convierte una entrada de la caché en datos o en ValidationError."""
+        if "no_encontrado" in guardado:
+            raise ValidationError({"dni": guardado["no_encontrado"]})
+        return dict(guardado["datos"])
+
+    @staticmethod
+    def _consultar_api(dni):
+        """
+        Llama a la API de RENIEC (sin caché) a través del circuito, y registra
+        la latencia en los histogramas reniec.ok / reniec.no_encontrado /
+        reniec.error.
+
+        Returns:
+            tuple: (datos, None) si el DNI existe o (None, mensaje) si RENIEC
+            responde que no existe (400/404)
+
+        Raises:
+            ReniecNoDisponible: Si el circuito está abierto o RENIEC falla
+        """
+        if not circuito_reniec.permitir():
+            raise ReniecNoDisponible()
+
+        inicio = time.perf_counter()
+        resultado = "error"
+        try:
+            datos, no_encontrado = ReniecService._llamar_api(dni)
+            resultado = "no_encontrado" if no_encontrado else "ok"
+            return datos, no_encontrado
+        finally:
+            _registrar_resultado(resultado, inicio)
+
+    @staticmethod
+    async def _aconsultar_api(dni):
+        """Versión async de _consultar_api."""
+        if not circuito_reniec.permitir():
+            raise ReniecNoDisponible()
+
+        inicio = time.perf_counter()
+        resultado = "error"
+        try:
+            datos, no_encontrado = await ReniecService._allamar_api(dni)
+            resultado = "no_encontrado" if no_encontrado else "ok"
+            return datos, no_encontrado
+        finally:
+            _registrar_resultado(resultado, inicio)
+
+    @staticmethod
+    def _llamar_api(dni):
+        """Petición HTTP a RENIEC; ver _consultar_api."""
         try:
             # URL de la API de RENIEC (ejemplo: https://api.decolecta.com/v1/reniec/dni?numero=46027896)
             url = f"{settings.RENIEC_API_URL}?numero={dni}"
 
-            # Headers si la API requiere token de autenticación
-            headers = {}
-            if settings.RENIEC_API_TOKEN:
-                headers["Authorization"] = f"Bearer {settings.RENIEC_API_TOKEN}"
-
-            # Hacer petición GET a la API (timeout de 10 segundos)
-            response = requests.get(url, headers=headers, timeout=10)
-
-            # Manejar respuestas según código HTTP
-            if response.status_code == 200:
-                data = response.json()
-
-                # Normalizar datos de la API al formato de nuestro modelo
-                return {
-                    "nombre": data.get("first_name", "").strip(),
-                    "apellido_paterno": data.get("first_last_name", "").strip(),
-                    "apellido_materno": data.get("second_last_name", "").strip(),
-                    "dni": data.get("document_number", dni).strip(),
-                }
-
-            elif response.status_code == 400:
-                # DNI no existe en RENIEC
-                raise ValidationError(
-                    {"dni": "El DNI ingresado no se encuentra registrado en RENIEC"}
-                )
-
-            elif response.status_code == 404:
-                raise ValidationError({"dni": "DNI no encontrado"})
-
-            else:
-                # Otro error del servidor de RENIEC
-                raise APIException(
-                    f"Error al consultar RENIEC (código {response.status_code})",
-                    code=503,
-                )
+            # GET por la sesión compartida (reutiliza conexiones; el token va en la sesión)
+            response = _obtener_sesion().get(
+                url,
+                timeout=(settings.RENIEC_TIMEOUT_CONEXION, settings.RENIEC_TIMEOUT_LECTURA),
+            )
+
+            return ReniecService._interpretar_respuesta(
+                dni, response.status_code, response.json
+            )
 
         except requests.exceptions.Timeout:
-            # La API de RENIEC tardó más de 10 segundos
-            raise APIException(
-                "El servicio de RENIEC no responde. Intenta nuevamente en unos minutos.",
-                code=503,
+            # La API de RENIEC tardó más que RENIEC_TIMEOUT_LECTURA
+            raise ReniecNoDisponible(
+                "El servicio de RENIEC no responde. Intenta nuevamente en unos minutos."
             )
 
         except requests.exceptions.ConnectionError:
             # No hay conexión a internet o el servicio está caído
-            raise APIException(
-                "No se pudo conectar con el servicio de RENIEC. Verifica tu conexión.",
-                code=503,
+            raise ReniecNoDisponible(
+                "No se pudo conectar con el servicio de RENIEC. Verifica tu conexión."
             )
 
         except requests.exceptions.RequestException as e:
             # Cualquier otro error de requests
-            raise APIException(f"Error al consultar RENIEC: {str(e)}", code=503)
+            raise ReniecNoDisponible(f"Error al consultar RENIEC: {str(e)}")
+
+    @staticmethod
+    async def _allamar_api(dni):
+        """Petición HTTP async a RENIEC; ver _consultar_api."""
+        url = f"{settings.RENIEC_API_URL}?numero={dni}"
+        cliente = _obtener_cliente_async()
+        try:
+            for intento in range(settings.RENIEC_REINTENTOS + 1):
+                response = await cliente.get(url)
+                if response.status_code not in (502, 503, 504):
+                    break
+                if intento < settings.RENIEC_REINTENTOS:
+                    await asyncio.sleep(settings.RENIEC_BACKOFF_SEGUNDOS * 2**intento)
+
+            return ReniecService._interpretar_respuesta(
+                dni, response.status_code, response.json
+            )
+
+        except httpx.TimeoutException:
+            raise ReniecNoDisponible(
+                "El servicio de RENIEC no responde. Intenta nuevamente en unos minutos."
+            )
+
+        except httpx.ConnectError:
+            raise ReniecNoDisponible(
+                "No se pudo conectar con el servicio de RENIEC. Verifica tu conexión."
+            )
+
+        except httpx.HTTPError as e:
+            raise ReniecNoDisponible(f"Error al consultar RENIEC: {str(e)}")
+
+    @staticmethod
+    def _interpretar_respuesta(dni, codigo, leer_json):
+        """
+        Traduce la respuesta HTTP de RENIEC (síncrona o async).
+
+        Returns:
+            tuple: (datos, None) o (None, mensaje) si el DNI no existe
+        """
+        # Manejar respuestas según código HTTP
+        if codigo == 200:
+            try:
+                data = leer_json()
+            except ValueError:
+                # Cuerpo que no es JSON (p. ej. página de error de un proxy)
+                raise ReniecNoDisponible("RENIEC devolvió una respuesta inválida.")
+
+            # Normalizar datos de la API al formato de nuestro modelo
+            return {
+                "nombre": data.get("first_name", "").strip(),
+                "apellido_paterno": data.get("first_last_name", "").strip(),
+                "apellido_materno": data.get("second_last_name", "").strip(),
+                "dni": data.get("document_number", dni).strip(),
+            }, None
+
+        elif codigo == 400:
+            # DNI no existe en RENIEC
+            return None, "El DNI ingresado no se encuentra registrado en RENIEC"
+
+        elif codigo == 404:
+            return None, "DNI no encontrado"
+
+        else:
+            # Otro error del servidor de RENIEC
+            raise ReniecNoDisponible(f"Error al consultar RENIEC (código {codigo})")
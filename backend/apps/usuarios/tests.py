@@ -1,3 +1,205 @@
-from django.test import TestCase
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from rest_framework.exceptions import ValidationError
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken  # type: ignore
+from apps.core.circuito import Circuito
+from apps.core.models import Region
+from apps.usuarios import services
+from apps.usuarios.authentication import JWTSinConsultaAuthentication
+from apps.usuarios.models import Usuario
+from apps.usuarios.reniec_fake import ServidorReniecFake
+from apps.usuarios.services import ReniecService
+from apps.usuarios.tokens import obtener_tokens
+from apps.votos.tests import crear_eleccion
 
-# Create your tests here.
+
+class ReniecFakeTestMixin:
+    """RENIEC simulado local, caché vacía y circuito cerrado en cada test."""
+
+    latencia = 0.05
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.reniec = ServidorReniecFake(latencia=self.latencia).__enter__()
+        self.addCleanup(self.reniec.__exit__, None, None, None)
+
+        configuracion = override_settings(RENIEC_API_URL=self.reniec.url, RENIEC_REINTENTOS=0)
+        configuracion.enable()
+        self.addCleanup(configuracion.disable)
+
+        # Circuito cerrado y sesión HTTP nueva (toma RENIEC_REINTENTOS de arriba)
+        for nombre, valor in (("circuito_reniec", Circuito("reniec")), ("_sesion", None)):
+            parche = mock.patch.object(services, nombre, valor)
+            parche.start()
+            self.addCleanup(parche.stop)
+
+
+class ReniecCacheTests(ReniecFakeTestMixin, SimpleTestCase):
+    def test_segunda_consulta_sale_de_la_cache(self):
+        primera = ReniecService.consultar_dni("46027896")
+        segunda = ReniecService.consultar_dni("46027896")
+
+        self.assertEqual(primera, segunda)
+        self.assertEqual(primera["dni"], "46027896")
+        self.assertEqual(self.reniec.consultas, 1)
+
+    def test_dni_inexistente_se_guarda_como_negativo(self):
+        for _ in range(3):
+            with self.assertRaises(ValidationError):
+                ReniecService.consultar_dni("01234567")
+
+        self.assertEqual(self.reniec.consultas, 1)
+
+    @override_settings(RENIEC_CACHE_NEGATIVO_SEGUNDOS=0)
+    def test_negativo_sin_cache(self):
+        for _ in range(2):
+            with self.assertRaises(ValidationError):
+                ReniecService.consultar_dni("01234567")
+
+        self.assertEqual(self.reniec.consultas, 2)
+
+    def test_errores_del_servicio_no_se_guardan(self):
+        self.reniec.fallando = True
+        with self.assertRaises(services.ReniecNoDisponible):
+            ReniecService.consultar_dni("46027896")
+
+        self.reniec.fallando = False
+        self.assertEqual(ReniecService.consultar_dni("46027896")["dni"], "46027896")
+        self.assertEqual(self.reniec.consultas, 2)
+
+
+class ReniecCoalescenciaTests(ReniecFakeTestMixin, SimpleTestCase):
+    latencia = 0.3
+
+    def test_consultas_simultaneas_comparten_una_llamada(self):
+        with ThreadPoolExecutor(max_workers=8) as hilos:
+            resultados = list(hilos.map(ReniecService.consultar_dni, ["46027896"] * 8))
+
+        self.assertEqual(len({r["dni"] for r in resultados}), 1)
+        self.assertEqual(self.reniec.consultas, 1)
+
+    def test_error_compartido_con_los_que_esperan(self):
+        self.reniec.fallando = True
+
+        def consultar(_):
+            try:
+                ReniecService.consultar_dni("46027896")
+            except services.ReniecNoDisponible:
+                return "503"
+
+        with ThreadPoolExecutor(max_workers=4) as hilos:
+            resultados = list(hilos.map(consultar, range(4)))
+
+        self.assertEqual(resultados, ["503"] * 4)
+        self.assertEqual(self.reniec.consultas, 1)
+
+
+class ReniecAsyncTests(ReniecFakeTestMixin, SimpleTestCase):
+    latencia = 0.3
+
+    async def test_consultas_simultaneas_comparten_una_llamada(self):
+        resultados = await asyncio.gather(
+            *(ReniecService.aconsultar_dni("46027896") for _ in range(8))
+        )
+
+        self.assertEqual(len({r["dni"] for r in resultados}), 1)
+        self.assertEqual(self.reniec.consultas, 1)
+
+    async def test_cancelar_la_primera_peticion_no_cancela_a_las_demas(self):
+        primera = asyncio.ensure_future(ReniecService.aconsultar_dni("46027896"))
+        await asyncio.sleep(0.05)  # La primera ya llamó a RENIEC
+        segunda = asyncio.ensure_future(ReniecService.aconsultar_dni("46027896"))
+        await asyncio.sleep(0)
+
+        primera.cancel()
+        datos = await segunda
+
+        self.assertEqual(datos["dni"], "46027896")
+        with self.assertRaises(asyncio.CancelledError):
+            await primera
+        self.assertEqual(self.reniec.consultas, 1)
+        self.assertIsNotNone(await cache.aget(services._clave_cache("46027896")))
+
+
+class ReniecRespuestaInvalidaTests(ReniecFakeTestMixin, SimpleTestCase):
+    def setUp(self):
+        super().setUp()
+        self.reniec.malformado = True
+
+    def test_sincrona(self):
+        with self.assertRaises(services.ReniecNoDisponible):
+            ReniecService.consultar_dni("46027896")
+
+    async def test_async(self):
+        with self.assertRaises(services.ReniecNoDisponible):
+            await ReniecService.aconsultar_dni("46027896")
+
+    async def test_vista_async_responde_503(self):
+        respuesta = await self.async_client.post(
+            reverse("validar_dni_async"), {"dni": "46027896"}, content_type="application/json"
+        )
+
+        self.assertEqual(respuesta.status_code, 503)
+
+
+class TokenConClaimsTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.usuario = crear_eleccion()["usuario"]
+
+    def refrescar(self, refresh):
+        return self.client.post(
+            reverse("token_refresh"), {"refresh": refresh}, content_type="application/json"
+        )
+
+    def usuario_del_token(self, access):
+        autenticacion = JWTSinConsultaAuthentication()
+        return autenticacion.get_user(autenticacion.get_validated_token(access))
+
+    def test_usuario_armado_con_los_claims_sin_consultas(self):
+        access = obtener_tokens(self.usuario)["access"]
+
+        with self.assertNumQueries(0):
+            usuario = self.usuario_del_token(access)
+            self.assertEqual(
+                (usuario.pk, usuario.dni, usuario.rol, usuario.region_id, usuario.is_active),
+                (self.usuario.pk, "99999991", "votante", self.usuario.region_id, True),
+            )
+            self.assertTrue(usuario.puede_votar())
+
+        self.assertEqual(usuario.nombre, "María")  # Campo diferido: se carga al leerlo
+
+    def test_refresh_relee_los_datos_del_usuario(self):
+        refresh = obtener_tokens(self.usuario)["refresh"]
+        cusco = Region.objects.get(nombre_region="Cusco")
+        Usuario.objects.filter(pk=self.usuario.pk).update(region=cusco, rol="invitado")
+
+        respuesta = self.refrescar(refresh)
+
+        self.assertEqual(respuesta.status_code, 200)
+        usuario = self.usuario_del_token(respuesta.json()["access"])
+        self.assertEqual((usuario.region_id, usuario.rol), (cusco.id, "invitado"))
+        self.assertIn("refresh", respuesta.json())  # ROTATE_REFRESH_TOKENS
+
+    def test_usuario_desactivado_no_renueva(self):
+        refresh = obtener_tokens(self.usuario)["refresh"]
+        Usuario.objects.filter(pk=self.usuario.pk).update(is_active=False)
+
+        respuesta = self.refrescar(refresh)
+
+        self.assertEqual(respuesta.status_code, 401)
+
+    def test_refresh_sin_claims_recibe_claims(self):
+        legado = str(RefreshToken.for_user(self.usuario))
+
+        respuesta = self.refrescar(legado)
+
+        self.assertEqual(respuesta.status_code, 200)
+        tokens = respuesta.json()
+        for token in (AccessToken(tokens["access"]), RefreshToken(tokens["refresh"])):
+            self.assertEqual(token["region_id"], self.usuario.region_id)
@@ -0,0 +1,27 @@
+from rest_framework_simplejwt.tokens import RefreshToken  # type: ignore
+
+# Claims del usuario que viajan en el token (los copia también el access token)
+CLAIMS_USUARIO = ("dni", "rol", "region_id")
+
+
+class TokenVotante(RefreshToken):
+    """
+    Refresh token con los datos del usuario que necesitan las vistas de
+    votación, para que JWTSinConsultaAuthentication no consulte la BD.
+    """
+
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        for claim in CLAIMS_USUARIO:
+            token[claim] = getattr(user, claim)
+        return token
+
+
+def obtener_tokens(usuario):
+    """
+    Returns:
+        dict: {"access": "...", "refresh": "..."} para el usuario
+    """
+    refresh = TokenVotante.for_user(usuario)
+    return {"access": str(refresh.access_token), "refresh": str(refresh)}
@@ -1,6 +1,6 @@
 from django.urls import path
 from rest_framework_simplejwt.views import TokenRefreshView
-from apps.usuarios import views
+from apps.usuarios import async_views, views
 
 urlpatterns = [
     # Endpoints de autenticación
@@ -13,4 +13,8 @@ urlpatterns = [
     path("validar-dni/", views.validar_dni, name="validar_dni"),
     path("perfil/", views.perfil, name="perfil"),
     path("regiones/", views.listar_regiones, name="listar_regiones"),
+    path("reniec/estado/", views.estado_reniec, name="estado_reniec"),
+    # Versiones async (servir con un servidor ASGI, p. ej. uvicorn)
+    path("async/registro/", async_views.registro, name="registro_async"),
+    path("async/validar-dni/", async_views.validar_dni, name="validar_dni_async"),
 ]
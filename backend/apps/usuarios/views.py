@@ -1,16 +1,17 @@
 from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
-from rest_framework.permissions import AllowAny, IsAuthenticated
-from rest_framework_simplejwt.tokens import RefreshToken # type: ignore
+from rest_framework.permissions import AllowAny, IsAdminUser, IsAuthenticated
 from apps.usuarios.models import Usuario
 from apps.usuarios.serializers import ( # type: ignore
     UsuarioSerializer,
     RegistroSerializer,
     ValidarDNISerializer,
 )
-from apps.usuarios.services import ReniecService
-from apps.core.models import Region
+from apps.usuarios.services import ReniecService, circuito_reniec
+from apps.usuarios.tokens import obtener_tokens
+from apps.core.metricas import histogramas
+from apps.core.referencia import REGIONES
 from apps.core.serializers import RegionSerializer  # type: ignore
 
 
@@ -68,12 +69,12 @@ def registro(request):
     usuario = serializer.save()
 
     # Generar tokens JWT para login automático
-    refresh = RefreshToken.for_user(usuario)
+    tokens = obtener_tokens(usuario)
 
     return Response(
         {
             "user": UsuarioSerializer(usuario).data,
-            "tokens": {"access": str(refresh.access_token), "refresh": str(refresh)},
+            "tokens": tokens,
             "message": "Usuario registrado exitosamente",
         },
         status=status.HTTP_201_CREATED,
@@ -89,7 +90,9 @@ def perfil(request):
 
     Headers: Authorization: Bearer <access_token>
     """
-    serializer = UsuarioSerializer(request.user)
+    # Datos frescos de la BD (request.user solo trae los claims del token)
+    usuario = Usuario.objects.select_related("region").get(pk=request.user.pk)
+    serializer = UsuarioSerializer(usuario)
     return Response(serializer.data)
 
 
@@ -100,8 +103,7 @@ def listar_regiones(request):
     GET /api/usuarios/regiones/
     Lista todas las regiones disponibles para el registro.
     """
-    regiones = Region.objects.all()
-    serializer = RegionSerializer(regiones, many=True)
+    serializer = RegionSerializer(REGIONES.todos(), many=True)
     return Response(serializer.data)
 
 
@@ -128,24 +130,49 @@ def login(request):
         )
 
     try:
-        usuario = Usuario.objects.get(dni=dni)
+        # La región viene en el mismo SELECT (la respuesta la incluye)
+        usuario = Usuario.objects.select_related("region").get(dni=dni)
     except Usuario.DoesNotExist:
         return Response(
             {"error": "Usuario no encontrado"}, status=status.HTTP_404_NOT_FOUND
         )
 
-    # Verificar contraseña
+    # Verificar contraseña (si el hash usa otro algoritmo o costo que
+    # PASSWORD_HASHER, Django lo re-hashea y guarda aquí mismo)
     if not usuario.check_password(password):
         return Response(
             {"error": "Contraseña incorrecta"}, status=status.HTTP_401_UNAUTHORIZED
         )
 
     # Generar tokens JWT
-    refresh = RefreshToken.for_user(usuario)
+    tokens = obtener_tokens(usuario)
 
     return Response(
         {
             "user": UsuarioSerializer(usuario).data,
-            "tokens": {"access": str(refresh.access_token), "refresh": str(refresh)},
+            "tokens": tokens,
+        }
+    )
+
+
+@api_view(["GET"])
+@permission_classes([IsAdminUser])  # Solo staff
+def estado_reniec(request):
+    """
+    GET /api/usuarios/reniec/estado/
+    Estado del circuito de RENIEC y latencias de sus respuestas (de este proceso).
+
+    Response: {
+        "circuito": {"estado": "cerrado", "fallos_consecutivos": 0, ...},
+        "latencia_ms": {
+            "reniec.ok": {"total": 120, "promedio_ms": 85.2, "buckets": {...}},
+            "reniec.error": {...}
+        }
+    }
+    """
+    return Response(
+        {
+            "circuito": circuito_reniec.estado(),
+            "latencia_ms": histogramas("reniec."),
         }
     )
@@ -0,0 +1,51 @@
+from django.http import JsonResponse, StreamingHttpResponse
+from django.views.decorators.http import require_GET
+from rest_framework import status
+from apps.core.models import Cargo
+from apps.core.referencia import REGIONES
+from apps.votos.stream import PING, HubResultados
+
+# Vistas async (ASGI) de votos. Con WSGI cada conexión abierta ocuparía
+# un hilo: el stream de resultados solo tiene sentido detrás de uvicorn.
+
+
+@require_GET
+async def resultados_stream(request):
+    """
+    GET /api/votos/resultados/stream/
+    Resultados en vivo por Server-Sent Events.
+
+    Query params:
+    - cargo: Filtrar por cargo específico
+    - region: Filtrar por región (solo para Diputados)
+
+    Eventos:
+    - snapshot: al conectar, {"version", "generado", "candidatos": {id: total_votos}}
+    - delta: como máximo uno por RESULTADOS_STREAM_SEGUNDOS, solo los candidatos
+      que cambiaron desde el último evento recibido
+    - comentario "ping" cada PING_SEGUNDOS sin cambios
+    """
+    cargo = request.GET.get("cargo") or None
+    region = request.GET.get("region") or None
+
+    # Mismas validaciones que /api/votos/resultados/
+    if cargo and cargo not in dict(Cargo.CARGO_CHOICES):
+        return JsonResponse({"error": "Cargo no válido"}, status=status.HTTP_400_BAD_REQUEST)
+    if region and not (region.isdigit() and await REGIONES.apor_id(int(region))):
+        return JsonResponse({"error": "Región no válida"}, status=status.HTTP_400_BAD_REQUEST)
+    region = int(region) if region else None
+
+    async def eventos():
+        suscripcion, snapshot = await HubResultados.actual().suscribir(cargo, region)
+        # Django cancela el generador cuando el cliente se desconecta
+        try:
+            yield snapshot
+            while True:
+                yield await suscripcion.siguiente() or PING
+        finally:
+            suscripcion.cerrar()
+
+    respuesta = StreamingHttpResponse(eventos(), content_type="text/event-stream")
+    respuesta["Cache-Control"] = "no-cache"
+    respuesta["X-Accel-Buffering"] = "no"  # nginx: no acumular el stream
+    return respuesta
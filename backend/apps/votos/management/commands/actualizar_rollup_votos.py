@@ -0,0 +1,42 @@
+import time
+from django.core.management.base import BaseCommand
+from apps.votos.services import actualizar_rollup_votos
+
+
+class Command(BaseCommand):
+    help = "Acumula los votos nuevos en el rollup de votos por minuto (estadísticas y ritmo)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--intervalo",
+            type=float,
+            default=10,
+            help="Segundos entre actualizaciones (por defecto 10)",
+        )
+        parser.add_argument(
+            "--una-vez",
+            action="store_true",
+            help="Actualiza una sola vez y termina",
+        )
+        parser.add_argument(
+            "--completo",
+            action="store_true",
+            help="Reconstruye el rollup desde toda la tabla votos (con --una-vez)",
+        )
+
+    def handle(self, *args, **options):
+        intervalo = options["intervalo"]
+
+        if options["una_vez"]:
+            filas = actualizar_rollup_votos(completo=options["completo"])
+            self.stdout.write(self.style.SUCCESS(f"{filas} minutos actualizados."))
+            return
+
+        self.stdout.write(f"Actualizando el rollup cada {intervalo}s (Ctrl+C para salir)...")
+        try:
+            while True:
+                inicio = time.monotonic()
+                actualizar_rollup_votos()
+                time.sleep(max(0.0, intervalo - (time.monotonic() - inicio)))
+        except KeyboardInterrupt:
+            self.stdout.write("\nActualizador del rollup detenido.")
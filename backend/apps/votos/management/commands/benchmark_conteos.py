@@ -0,0 +1,93 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from apps.candidatos.models import Candidato
+from apps.core.benchmark import ejecutar_concurrente
+from apps.votos.services import consolidar_shards, incrementar_conteo, recalcular_conteos
+
+
+class Command(BaseCommand):
+    help = (
+        "Mide votos/seg del conteo con varios votantes concurrentes sobre el mismo "
+        "candidato, comparando conteo directo contra shards. Al terminar los conteos "
+        "se reconstruyen desde la tabla votos."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--concurrencia",
+            type=int,
+            nargs="+",
+            default=[1, 8, 64],
+            help="Niveles de concurrencia a medir (por defecto 1 8 64)",
+        )
+        parser.add_argument(
+            "--shards",
+            type=int,
+            nargs="+",
+            default=[0, 16],
+            help="Cantidades de shards a comparar; 0 = conteo directo (por defecto 0 16)",
+        )
+        parser.add_argument(
+            "--votos-por-hilo",
+            type=int,
+            default=200,
+            help="Incrementos que emite cada hilo (por defecto 200)",
+        )
+        parser.add_argument(
+            "--candidato",
+            type=int,
+            help="ID del candidato a usar (por defecto el primer Presidente activo)",
+        )
+        parser.add_argument(
+            "--confirmar",
+            action="store_true",
+            help=(
+                "Permite ejecutarlo con DEBUG=False: mientras corre, los resultados "
+                "publicados muestran los votos ficticios"
+            ),
+        )
+
+    def handle(self, *args, **options):
+        if not (settings.DEBUG or options["confirmar"]):
+            raise CommandError(
+                "benchmark_conteos suma votos ficticios al conteo real hasta terminar. "
+                "Con DEBUG=False requiere --confirmar."
+            )
+
+        candidato_id = options.get("candidato") or (
+            Candidato.objects.filter(activo=True, cargo__nombre_cargo="Presidente")
+            .values_list("id", flat=True)
+            .first()
+        )
+        if not candidato_id:
+            raise CommandError("No hay candidatos. Ejecuta primero load_seed.")
+
+        votos_por_hilo = options["votos_por_hilo"]
+        self.stdout.write(
+            f"Candidato {candidato_id}, {votos_por_hilo} votos por hilo\n"
+        )
+        self.stdout.write(f"{'shards':>7} {'hilos':>6} {'votos/s':>10} {'p50 ms':>8} {'p99 ms':>8}")
+
+        try:
+            for shards in options["shards"]:
+                for hilos in options["concurrencia"]:
+
+                    def votar(hilo, i, shards=shards):
+                        # Misma transacción que tendría un voto real
+                        with transaction.atomic():
+                            incrementar_conteo(candidato_id, shards=shards)
+
+                    resultado = ejecutar_concurrente(votar, hilos, votos_por_hilo)
+                    latencia = resultado["latencia_ms"]
+                    self.stdout.write(
+                        f"{shards:>7} {hilos:>6} {resultado['por_segundo']:>10} "
+                        f"{latencia['p50']:>8} {latencia['p99']:>8}"
+                        + (f"  ({resultado['errores']} errores)" if resultado["errores"] else "")
+                    )
+                consolidar_shards()
+        finally:
+            # Deshacer los votos ficticios: el conteo vuelve a coincidir con votos
+            recalcular_conteos()
+
+        self.stdout.write(self.style.SUCCESS("\nConteos restaurados desde la tabla votos."))
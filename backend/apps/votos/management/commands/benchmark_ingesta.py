@@ -0,0 +1,142 @@
+import threading
+import time
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from apps.candidatos.models import Candidato
+from apps.core.benchmark import ejecutar_concurrente
+from apps.core.models import Region
+from apps.usuarios.models import Usuario
+from apps.votos.models import Voto, VotoPendiente
+from apps.votos.services import (
+    emitir_voto,
+    encolar_voto,
+    procesar_cola_votos,
+    recalcular_conteos,
+)
+
+PREFIJO_DNI = "B"  # DNIs ficticios B0000001... (los reales son solo dígitos)
+
+
+class Command(BaseCommand):
+    help = (
+        "Compara votos/seg sostenidos de la ingesta síncrona contra la cola asíncrona. "
+        "Crea votantes ficticios y los elimina (con sus votos) al terminar."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--votos",
+            type=int,
+            default=2000,
+            help="Votos por modo (por defecto 2000)",
+        )
+        parser.add_argument(
+            "--hilos",
+            type=int,
+            default=8,
+            help="Votantes concurrentes (por defecto 8)",
+        )
+        parser.add_argument(
+            "--lote",
+            type=int,
+            default=500,
+            help="Tamaño de lote del worker asíncrono (por defecto 500)",
+        )
+
+    def handle(self, *args, **options):
+        hilos = options["hilos"]
+        por_hilo = max(1, options["votos"] // hilos)
+        total = por_hilo * hilos
+
+        candidatos = list(
+            Candidato.objects.select_related("cargo").filter(
+                activo=True, cargo__nombre_cargo="Presidente"
+            )
+        )
+        region = Region.objects.first()
+        if not candidatos or region is None:
+            raise CommandError("No hay candidatos. Ejecuta primero load_seed.")
+
+        if Usuario.objects.filter(dni__startswith=PREFIJO_DNI).exists():
+            raise CommandError(
+                "Ya existen votantes de benchmark; elimínalos antes de continuar."
+            )
+
+        self.stdout.write(f"Creando {total * 2} votantes ficticios...")
+        usuarios = self._crear_votantes(total * 2, region)
+        sincronos, asincronos = usuarios[:total], usuarios[total:]
+
+        try:
+            # Modo síncrono: INSERT + conteo por petición
+            def votar_sincrono(hilo, i):
+                usuario = sincronos[hilo * por_hilo + i]
+                emitir_voto(usuario, candidatos[i % len(candidatos)])
+
+            sincrono = ejecutar_concurrente(votar_sincrono, hilos, por_hilo)
+
+            # Modo asíncrono: encolar + un worker drenando en paralelo
+            def votar_asincrono(hilo, i):
+                usuario = asincronos[hilo * por_hilo + i]
+                encolar_voto(usuario, candidatos[i % len(candidatos)])
+
+            terminado = threading.Event()
+            persistidos = []
+
+            def worker():
+                try:
+                    while True:
+                        registrados, rechazados = procesar_cola_votos(options["lote"])
+                        persistidos.append(registrados)
+                        if not (registrados or rechazados):
+                            if terminado.is_set():
+                                break
+                            time.sleep(0.05)
+                finally:
+                    connection.close()
+
+            hilo_worker = threading.Thread(target=worker)
+            inicio = time.perf_counter()
+            hilo_worker.start()
+            asincrono = ejecutar_concurrente(votar_asincrono, hilos, por_hilo)
+            terminado.set()
+            hilo_worker.join()
+            drenado = time.perf_counter() - inicio
+        finally:
+            self._limpiar(usuarios)
+
+        self.stdout.write(f"\n{total} votos por modo, {hilos} hilos\n")
+        self.stdout.write(f"{'modo':<22} {'votos/s':>10} {'p50 ms':>8} {'p99 ms':>8}")
+        for nombre, resultado in (
+            ("síncrono (201)", sincrono),
+            ("asíncrono, aceptados", asincrono),
+        ):
+            latencia = resultado["latencia_ms"]
+            self.stdout.write(
+                f"{nombre:<22} {resultado['por_segundo']:>10} "
+                f"{latencia['p50']:>8} {latencia['p99']:>8}"
+            )
+        self.stdout.write(
+            f"{'asíncrono, persistidos':<22} {round(sum(persistidos) / drenado, 1):>10}"
+        )
+
+    def _crear_votantes(self, cantidad, region):
+        usuarios = []
+        for n in range(1, cantidad + 1):
+            usuario = Usuario(
+                dni=f"{PREFIJO_DNI}{n:07d}",
+                nombre="Votante",
+                apellido_paterno="Benchmark",
+                apellido_materno=str(n),
+                region=region,
+            )
+            usuario.set_unusable_password()  # Evita el costo de hashear
+            usuarios.append(usuario)
+        return Usuario.objects.bulk_create(usuarios, batch_size=1000)
+
+    def _limpiar(self, usuarios):
+        ids = [u.id for u in usuarios]
+        VotoPendiente.objects.filter(usuario_id__in=ids).delete()
+        Voto.objects.filter(usuario_id__in=ids).delete()
+        Usuario.objects.filter(id__in=ids).delete()
+        recalcular_conteos()
+        self.stdout.write("Votantes ficticios eliminados y conteos restaurados.")
@@ -0,0 +1,223 @@
+import asyncio
+import json
+import random
+import resource
+import threading
+import time
+from urllib.parse import urlencode, urlsplit
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from apps.candidatos.models import Candidato
+from apps.core.benchmark import percentiles
+from apps.votos.services import incrementar_conteo, recalcular_conteos
+
+
+class Command(BaseCommand):
+    help = (
+        "Generador de carga del stream de resultados (SSE): abre muchas conexiones "
+        "ociosas contra un servidor ASGI en marcha, opcionalmente suma votos al "
+        "conteo y mide conexiones sostenidas, eventos recibidos y retraso de entrega."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--url",
+            default="http://127.0.0.1:8000/api/votos/resultados/stream/",
+            help="URL del stream (servidor ASGI, p. ej. uvicorn config.asgi:application)",
+        )
+        parser.add_argument(
+            "--conexiones",
+            type=int,
+            default=10000,
+            help="Suscriptores simultáneos (por defecto 10000)",
+        )
+        parser.add_argument(
+            "--segundos",
+            type=int,
+            default=30,
+            help="Duración de la medición con todas las conexiones abiertas (por defecto 30)",
+        )
+        parser.add_argument(
+            "--incrementos",
+            type=int,
+            default=0,
+            help=(
+                "Votos por segundo sumados al conteo durante la medición (por defecto 0). "
+                "Usa la misma BD que el servidor; al terminar se ejecuta recalcular_conteos."
+            ),
+        )
+        parser.add_argument(
+            "--cargo",
+            help="Suscribirse solo a un cargo (por defecto todos)",
+        )
+        parser.add_argument(
+            "--confirmar",
+            action="store_true",
+            help=(
+                "Permite --incrementos con DEBUG=False: mientras corre, los resultados "
+                "publicados muestran los votos ficticios"
+            ),
+        )
+
+    def handle(self, *args, **options):
+        if options["incrementos"] and not (settings.DEBUG or options["confirmar"]):
+            raise CommandError(
+                "--incrementos suma votos ficticios al conteo real hasta terminar. "
+                "Con DEBUG=False requiere --confirmar."
+            )
+
+        # Cada conexión es un descriptor de archivo
+        blando, duro = resource.getrlimit(resource.RLIMIT_NOFILE)
+        if blando < options["conexiones"] + 100:
+            resource.setrlimit(resource.RLIMIT_NOFILE, (duro, duro))
+            if duro < options["conexiones"] + 100:
+                raise CommandError(
+                    f"El límite de archivos abiertos ({duro}) no alcanza; sube `ulimit -n`."
+                )
+
+        url = options["url"]
+        if options["cargo"]:
+            url += "?" + urlencode({"cargo": options["cargo"]})
+
+        candidatos = []
+        if options["incrementos"]:
+            candidatos = list(Candidato.objects.filter(activo=True).values_list("id", flat=True))
+            if not candidatos:
+                raise CommandError("No hay candidatos activos. Ejecuta primero load_seed.")
+
+        detener = threading.Event()
+        votos = threading.Thread(
+            target=self._sumar_votos, args=(candidatos, options["incrementos"], detener)
+        )
+        try:
+            resultado = asyncio.run(
+                self._medir(url, options["conexiones"], options["segundos"], votos, detener)
+            )
+        finally:
+            detener.set()
+            if votos.is_alive():
+                votos.join()
+            if options["incrementos"]:
+                recalcular_conteos()
+
+        self.stdout.write(
+            f"\n{resultado['abiertas']}/{options['conexiones']} conexiones abiertas "
+            f"en {resultado['segundos_conexion']} s ({resultado['fallidas']} fallidas, "
+            f"{resultado['cortadas']} cortadas durante la medición)"
+        )
+        self.stdout.write(
+            f"Conexión hasta snapshot (ms): p50 {resultado['conexion_ms']['p50']} "
+            f"p99 {resultado['conexion_ms']['p99']}"
+        )
+        self.stdout.write(
+            f"{resultado['deltas']} eventos delta y {resultado['pings']} pings en "
+            f"{options['segundos']} s ({resultado['deltas_por_segundo']} deltas/s)"
+        )
+        self.stdout.write(
+            f"Retraso de entrega desde la lectura del conteo (ms): "
+            f"p50 {resultado['retraso_ms']['p50']} p99 {resultado['retraso_ms']['p99']} "
+            f"max {resultado['retraso_ms']['max']}"
+        )
+        if options["incrementos"]:
+            self.stdout.write("Conteos restaurados con recalcular_conteos.")
+
+    def _sumar_votos(self, candidatos, por_segundo, detener):
+        if not por_segundo:
+            return
+        try:
+            while not detener.wait(1 / por_segundo):
+                incrementar_conteo(random.choice(candidatos))
+        finally:
+            connection.close()
+
+    async def _medir(self, url, conexiones, segundos, votos, detener):
+        partes = urlsplit(url)
+        ruta = partes.path + (f"?{partes.query}" if partes.query else "")
+        peticion = (
+            f"GET {ruta} HTTP/1.1\r\nHost: {partes.netloc}\r\n"
+            "Accept: text/event-stream\r\n\r\n"
+        ).encode()
+        estado = {
+            "abiertas": 0,
+            "fallidas": 0,
+            "cortadas": 0,
+            "deltas": 0,
+            "pings": 0,
+            "midiendo": False,
+        }
+        conexion, retrasos = [], []
+        listas = asyncio.Event()
+
+        async def suscriptor():
+            inicio = time.perf_counter()
+            try:
+                lector, escritor = await asyncio.open_connection(
+                    partes.hostname, partes.port or 80, limit=2**20
+                )
+                escritor.write(peticion)
+                cabecera = await lector.readuntil(b"\r\n\r\n")
+                if b" 200 " not in cabecera.split(b"\r\n", 1)[0]:
+                    raise ConnectionError(cabecera.split(b"\r\n", 1)[0])
+            except (OSError, asyncio.IncompleteReadError, ConnectionError):
+                estado["fallidas"] += 1
+                return
+
+            evento = None
+            try:
+                # uvicorn envía cada evento en un chunk: las líneas no se parten
+                while True:
+                    linea = await lector.readline()
+                    if not linea:
+                        break
+                    if linea.startswith(b"event: "):
+                        evento = linea[7:].strip()
+                    elif linea.startswith(b"data: "):
+                        if evento == b"snapshot":
+                            conexion.append(time.perf_counter() - inicio)
+                            estado["abiertas"] += 1
+                            if estado["abiertas"] + estado["fallidas"] == conexiones:
+                                listas.set()
+                        elif estado["midiendo"]:
+                            estado["deltas"] += 1
+                            retrasos.append(time.time() - json.loads(linea[6:])["generado"])
+                    elif linea.startswith(b": ping") and estado["midiendo"]:
+                        estado["pings"] += 1
+            finally:
+                if estado["midiendo"]:
+                    estado["cortadas"] += 1
+                escritor.close()
+
+        inicio = time.perf_counter()
+        tareas = []
+        for _ in range(conexiones):
+            tareas.append(asyncio.create_task(suscriptor()))
+            if len(tareas) % 500 == 0:
+                await asyncio.sleep(0)  # No abrir todas en la misma iteración del loop
+        try:
+            await asyncio.wait_for(listas.wait(), timeout=max(60, conexiones / 100))
+        except asyncio.TimeoutError:
+            pass
+        segundos_conexion = time.perf_counter() - inicio
+
+        estado["midiendo"] = True
+        votos.start()
+        await asyncio.sleep(segundos)
+        estado["midiendo"] = False
+        detener.set()
+
+        for tarea in tareas:
+            tarea.cancel()
+        await asyncio.gather(*tareas, return_exceptions=True)
+
+        return {
+            "abiertas": estado["abiertas"],
+            "fallidas": estado["fallidas"],
+            "cortadas": estado["cortadas"],
+            "segundos_conexion": round(segundos_conexion, 2),
+            "conexion_ms": percentiles(conexion),
+            "deltas": estado["deltas"],
+            "pings": estado["pings"],
+            "deltas_por_segundo": round(estado["deltas"] / segundos, 1),
+            "retraso_ms": percentiles(retrasos),
+        }
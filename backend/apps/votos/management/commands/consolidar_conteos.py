@@ -0,0 +1,39 @@
+import time
+from django.core.management.base import BaseCommand
+from apps.votos.services import consolidar_shards
+
+
+class Command(BaseCommand):
+    help = "Consolida los shards de conteo pendientes en el conteo autoritativo"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--intervalo",
+            type=float,
+            default=0.5,
+            help="Segundos entre consolidaciones (por defecto 0.5)",
+        )
+        parser.add_argument(
+            "--una-vez",
+            action="store_true",
+            help="Consolida una sola vez y termina",
+        )
+
+    def handle(self, *args, **options):
+        intervalo = options["intervalo"]
+
+        if options["una_vez"]:
+            votos = consolidar_shards()
+            self.stdout.write(self.style.SUCCESS(f"{votos} votos consolidados."))
+            return
+
+        self.stdout.write(f"Consolidando shards cada {intervalo}s (Ctrl+C para salir)...")
+        try:
+            while True:
+                inicio = time.monotonic()
+                votos = consolidar_shards()
+                if votos:
+                    self.stdout.write(f"  ✓ {votos} votos consolidados")
+                time.sleep(max(0.0, intervalo - (time.monotonic() - inicio)))
+        except KeyboardInterrupt:
+            self.stdout.write("\nConsolidador detenido.")
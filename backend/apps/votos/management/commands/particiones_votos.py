@@ -0,0 +1,66 @@
+from django.core.management.base import BaseCommand, CommandError
+from apps.core.models import Cargo
+from apps.core.referencia import CARGOS
+from apps.votos.particiones import (
+    archivar_particion,
+    crear_particiones,
+    eliminar_archivadas,
+    esta_particionada,
+    listar_particiones,
+)
+from apps.votos.services import recalcular_conteos
+
+
+class Command(BaseCommand):
+    help = (
+        "Administra las particiones de la tabla votos (PostgreSQL, por cargo): crea "
+        "las que falten, archiva los votos de un cargo o elimina los archivados."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--archivar",
+            nargs="+",
+            choices=[nombre for nombre, _ in Cargo.CARGO_CHOICES],
+            help=(
+                "Separa los votos de estos cargos en tablas archivadas (p. ej. tras una "
+                "simulación) y recalcula los conteos. Los usuarios podrán volver a votar"
+            ),
+        )
+        parser.add_argument(
+            "--eliminar-archivadas",
+            action="store_true",
+            help="Elimina (DROP) las tablas archivadas",
+        )
+
+    def handle(self, *args, **options):
+        if not esta_particionada():
+            raise CommandError(
+                "La tabla votos no está particionada (requiere PostgreSQL y la migración "
+                "votos 0006)."
+            )
+
+        for nombre in crear_particiones():
+            self.stdout.write(f"  ✓ Partición creada: {nombre}")
+
+        if options["archivar"]:
+            for nombre_cargo in options["archivar"]:
+                cargo = CARGOS.por_nombre(nombre_cargo)
+                if cargo is None:
+                    raise CommandError(f"No existe el cargo {nombre_cargo}")
+                archivada = archivar_particion(cargo.id)
+                self.stdout.write(f"  ✓ Votos de {nombre_cargo} archivados en {archivada}")
+            recalcular_conteos()
+            self.stdout.write("Conteos y rollup recalculados.")
+
+        if options["eliminar_archivadas"]:
+            for nombre in eliminar_archivadas():
+                self.stdout.write(f"  ✓ Eliminada: {nombre}")
+
+        self.stdout.write(f"\n{'tabla':<42} {'valores':<22} {'filas aprox.':>12} {'tamaño':>10}")
+        for particion in listar_particiones():
+            valores = "archivada" if particion["archivada"] else particion["valores"]
+            self.stdout.write(
+                f"{particion['nombre']:<42} {valores:<22} {particion['filas']:>12} "
+                f"{particion['bytes'] / 2**20:>8.1f}MB"
+            )
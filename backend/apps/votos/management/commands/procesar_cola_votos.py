@@ -0,0 +1,45 @@
+import time
+from django.core.management.base import BaseCommand
+from apps.votos.services import procesar_cola_votos
+
+
+class Command(BaseCommand):
+    help = "Drena la cola de votos asíncronos insertándolos por lotes en la tabla votos"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--lote",
+            type=int,
+            default=500,
+            help="Votos por lote (por defecto 500)",
+        )
+        parser.add_argument(
+            "--intervalo",
+            type=float,
+            default=0.2,
+            help="Segundos de espera cuando la cola está vacía (por defecto 0.2)",
+        )
+        parser.add_argument(
+            "--una-vez",
+            action="store_true",
+            help="Drena la cola hasta vaciarla y termina",
+        )
+
+    def handle(self, *args, **options):
+        lote = options["lote"]
+
+        self.stdout.write(f"Procesando cola de votos en lotes de {lote}...")
+        try:
+            while True:
+                registrados, rechazados = procesar_cola_votos(lote)
+                if registrados or rechazados:
+                    self.stdout.write(
+                        f"  ✓ {registrados} registrados, {rechazados} rechazados"
+                    )
+                if registrados + rechazados >= lote:
+                    continue  # Lote lleno: probablemente quedan más, seguir sin esperar
+                if options["una_vez"]:
+                    break
+                time.sleep(options["intervalo"])
+        except KeyboardInterrupt:
+            self.stdout.write("\nWorker detenido.")
@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand, CommandError
+from apps.votos.services import recalcular_conteos
+
+
+class Command(BaseCommand):
+    help = "Reconstruye (o verifica) los conteos materializados desde la tabla votos"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--verificar",
+            action="store_true",
+            help="Solo verifica los conteos, sin corregirlos (falla si hay diferencias)",
+        )
+
+    def handle(self, *args, **options):
+        verificar = options.get("verificar", False)
+
+        diferencias = recalcular_conteos(corregir=not verificar)
+
+        if not diferencias:
+            self.stdout.write(self.style.SUCCESS("Conteos consistentes con la tabla votos."))
+            return
+
+        for candidato_id, actual, real in diferencias:
+            actual_str = "sin conteo" if actual is None else actual
+            self.stdout.write(f"  • Candidato {candidato_id}: {actual_str} → {real}")
+
+        if verificar:
+            raise CommandError(f"{len(diferencias)} conteos no coinciden con la tabla votos")
+
+        self.stdout.write(
+            self.style.SUCCESS(f"\n{len(diferencias)} conteos reconstruidos.")
+        )
@@ -0,0 +1,49 @@
+# Generated by Django 5.2.7 on 2026-10-18 15:29
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def poblar_conteos(apps, schema_editor):
+    """Inicializa los conteos con los votos ya existentes."""
+    Voto = apps.get_model("votos", "Voto")
+    ConteoCandidato = apps.get_model("votos", "ConteoCandidato")
+
+    totales = (
+        Voto.objects.values("candidato_id")
+        .annotate(total=Count("id"))
+        .values_list("candidato_id", "total")
+    )
+    ConteoCandidato.objects.bulk_create(
+        [
+            ConteoCandidato(candidato_id=candidato_id, total_votos=total)
+            for candidato_id, total in totales
+        ]
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('candidatos', '0002_alter_candidato_foto_url'),
+        ('votos', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ConteoCandidato',
+            fields=[
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Fecha de creación')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Fecha de actualización')),
+                ('candidato', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='conteo', serialize=False, to='candidatos.candidato', verbose_name='Candidato')),
+                ('total_votos', models.PositiveIntegerField(default=0, verbose_name='Total de votos')),
+            ],
+            options={
+                'verbose_name': 'Conteo de candidato',
+                'verbose_name_plural': 'Conteos de candidatos',
+                'db_table': 'conteo_candidatos',
+            },
+        ),
+        migrations.RunPython(poblar_conteos, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.7 on 2026-10-18 15:33
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('candidatos', '0002_alter_candidato_foto_url'),
+        ('votos', '0002_conteo_candidatos'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ConteoShard',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('shard', models.PositiveSmallIntegerField(verbose_name='Número de shard')),
+                ('pendientes', models.IntegerField(default=0, verbose_name='Votos sin consolidar')),
+                ('candidato', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='conteo_shards', to='candidatos.candidato', verbose_name='Candidato')),
+            ],
+            options={
+                'verbose_name': 'Shard de conteo',
+                'verbose_name_plural': 'Shards de conteo',
+                'db_table': 'conteo_shards',
+                'constraints': [models.UniqueConstraint(fields=('candidato', 'shard'), name='unique_shard_por_candidato')],
+            },
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.7 on 2026-10-18 15:35
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('candidatos', '0002_alter_candidato_foto_url'),
+        ('core', '0001_initial'),
+        ('votos', '0003_conteo_shards'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='VotoPendiente',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Fecha de creación')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Fecha de actualización')),
+                ('estado', models.CharField(choices=[('pendiente', 'Pendiente'), ('registrado', 'Registrado'), ('rechazado', 'Rechazado')], default='pendiente', max_length=10, verbose_name='Estado')),
+                ('error', models.CharField(blank=True, max_length=200, verbose_name='Motivo de rechazo')),
+                ('voto_id', models.BigIntegerField(blank=True, null=True, verbose_name='ID del voto registrado')),
+                ('candidato', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='candidatos.candidato', verbose_name='Candidato')),
+                ('cargo', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='core.cargo', verbose_name='Cargo')),
+                ('usuario', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='votos_pendientes', to=settings.AUTH_USER_MODEL, verbose_name='Usuario')),
+            ],
+            options={
+                'verbose_name': 'Voto pendiente',
+                'verbose_name_plural': 'Votos pendientes',
+                'db_table': 'votos_pendientes',
+                'indexes': [models.Index(fields=['estado', 'id'], name='votos_pendi_estado_ab2af6_idx')],
+                'constraints': [models.UniqueConstraint(condition=models.Q(('estado', 'pendiente')), fields=('usuario', 'cargo'), name='unique_voto_pendiente_por_cargo')],
+            },
+        ),
+    ]
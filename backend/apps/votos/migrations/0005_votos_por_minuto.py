@@ -0,0 +1,30 @@
+# Generated by Django 5.2.7 on 2026-10-18 16:10
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_initial'),
+        ('votos', '0004_votos_pendientes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='VotosPorMinuto',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('minuto', models.DateTimeField(verbose_name='Minuto')),
+                ('total', models.PositiveIntegerField(default=0, verbose_name='Votos en el minuto')),
+                ('cargo', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='core.cargo', verbose_name='Cargo')),
+            ],
+            options={
+                'verbose_name': 'Votos por minuto',
+                'verbose_name_plural': 'Votos por minuto',
+                'db_table': 'votos_por_minuto',
+                'constraints': [models.UniqueConstraint(fields=('minuto', 'cargo'), name='unique_votos_por_minuto_cargo')],
+            },
+        ),
+    ]
@@ -0,0 +1,92 @@
+# Generated by Django 5.2.7 on 2026-10-18 18:20
+
+from django.db import migrations
+
+# Particiones de votos en PostgreSQL: LIST (cargo_id), una por cargo más DEFAULT.
+# Los cargos creados después caen en votos_default hasta ejecutar
+# `python manage.py particiones_votos` (ver apps.votos.particiones).
+
+
+def _reconstruir(schema_editor, particionada):
+    """
+    Reemplaza votos por una copia (particionada o no) con los mismos datos,
+    índices y constraints, conservando sus nombres (los que Django espera).
+    Una tabla particionada exige que la PK y los UNIQUE incluyan cargo_id:
+    la PK pasa a ser (id, cargo_id); unique_voto_por_cargo ya lo incluye.
+    """
+    if schema_editor.connection.vendor != "postgresql":
+        return
+
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT conname, contype, pg_get_constraintdef(oid)
+            FROM pg_constraint
+            WHERE conrelid = 'votos'::regclass AND contype IN ('p', 'u', 'f')
+            ORDER BY contype DESC, conname
+            """
+        )
+        restricciones = cursor.fetchall()
+        cursor.execute(
+            """
+            SELECT indexname, indexdef FROM pg_indexes
+            WHERE schemaname = current_schema() AND tablename = 'votos'
+            """
+        )
+        # Los índices de la PK y los UNIQUE se recrean con su constraint
+        nombres_restricciones = {nombre for nombre, _, _ in restricciones}
+        indices = [
+            definicion
+            for nombre, definicion in cursor.fetchall()
+            if nombre not in nombres_restricciones
+        ]
+        cursor.execute("SELECT id FROM cargos ORDER BY id")
+        cargo_ids = [fila[0] for fila in cursor.fetchall()]
+
+    schema_editor.execute(
+        "CREATE TABLE votos_nueva (LIKE votos INCLUDING DEFAULTS INCLUDING IDENTITY)"
+        + (" PARTITION BY LIST (cargo_id)" if particionada else "")
+    )
+    if particionada:
+        for cargo_id in cargo_ids:
+            schema_editor.execute(
+                f"CREATE TABLE votos_cargo_{cargo_id} PARTITION OF votos_nueva "
+                f"FOR VALUES IN ({cargo_id})"
+            )
+        schema_editor.execute("CREATE TABLE votos_default PARTITION OF votos_nueva DEFAULT")
+
+    schema_editor.execute("INSERT INTO votos_nueva SELECT * FROM votos")
+    schema_editor.execute("DROP TABLE votos")
+    schema_editor.execute("ALTER TABLE votos_nueva RENAME TO votos")
+    schema_editor.execute("ALTER SEQUENCE votos_nueva_id_seq RENAME TO votos_id_seq")
+    schema_editor.execute(
+        "SELECT setval('votos_id_seq', COALESCE((SELECT MAX(id) FROM votos), 0) + 1, false)"
+    )
+
+    for nombre, tipo, definicion in restricciones:
+        if tipo == "p":
+            definicion = "PRIMARY KEY (id, cargo_id)" if particionada else "PRIMARY KEY (id)"
+        schema_editor.execute(f'ALTER TABLE votos ADD CONSTRAINT "{nombre}" {definicion}')
+    for definicion in indices:
+        schema_editor.execute(definicion)
+
+
+def particionar(apps, schema_editor):
+    _reconstruir(schema_editor, particionada=True)
+
+
+def desparticionar(apps, schema_editor):
+    # Las particiones archivadas (separadas con particiones_votos) no se tocan
+    _reconstruir(schema_editor, particionada=False)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_initial'),
+        ('votos', '0005_votos_por_minuto'),
+    ]
+
+    operations = [
+        migrations.RunPython(particionar, desparticionar),
+    ]
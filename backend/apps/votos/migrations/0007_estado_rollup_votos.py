@@ -0,0 +1,25 @@
+# Generated by Django 5.2.7 on 2026-10-18 16:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('votos', '0006_votos_particionada'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EstadoRollupVotos',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('horizonte', models.DateTimeField(blank=True, null=True, verbose_name='Votos confirmados hasta')),
+            ],
+            options={
+                'verbose_name': 'Estado del rollup de votos',
+                'verbose_name_plural': 'Estado del rollup de votos',
+                'db_table': 'estado_rollup_votos',
+            },
+        ),
+    ]
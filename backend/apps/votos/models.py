@@ -10,6 +10,11 @@ class Voto(TimeStampedModel):
     Registro de votos emitidos por los usuarios.
     - Un usuario solo puede votar UNA VEZ por cargo.
     - Para Diputados: solo puede votar por candidatos de su región.
+
+    En PostgreSQL la tabla está particionada por cargo (migración 0006, ver
+    apps.votos.particiones): la PK real es (id, cargo_id) y `id` sigue siendo
+    único por su secuencia. No modificar `id` ni `cargo` con migraciones
+    automáticas sin revisar el SQL que generan.
     """
 
     usuario = models.ForeignKey(
@@ -47,37 +52,210 @@ class Voto(TimeStampedModel):
     def __str__(self):
         return f"{self.usuario.dni} votó por {self.candidato.get_full_name()} ({self.cargo.nombre_cargo})"
 
-    def clean(self):
+    @staticmethod
+    def validar_elegibilidad(usuario, candidato):
         """
-        Validaciones antes de guardar el voto.
+        Reglas de negocio del voto que no dependen de otros votos.
         - Usuario debe ser votante.
-        - Para Diputados: validar que sea de la misma región.
         - El candidato debe estar activo.
+        - Para Diputados: validar que sea de la misma región.
+
+        Compara región por ID para no disparar consultas extra; requiere
+        que candidato.cargo venga cargado (select_related).
         """
         # Validar que el usuario puede votar
-        if not self.usuario.puede_votar():
+        if not usuario.puede_votar():
             raise ValidationError(
                 "Los invitados no pueden votar. Debes registrarte primero."
             )
 
         # Validar que el candidato está activo
-        if not self.candidato.activo:
+        if not candidato.activo:
             raise ValidationError("El candidato seleccionado no está disponible.")
 
+        # Validación especial para Diputados: deben ser de la misma región
+        if candidato.cargo.nombre_cargo == "Diputado":
+            if candidato.region_id != usuario.region_id:
+                raise ValidationError(
+                    f"Solo puedes votar por diputados de tu región ({usuario.region.nombre_region})"
+                )
+
+    def clean(self):
+        """
+        Validaciones antes de guardar el voto.
+        - Reglas de elegibilidad (ver validar_elegibilidad).
+        - El cargo del voto debe coincidir con el del candidato.
+        """
         # Validar que el cargo del voto coincide con el cargo del candidato
-        if self.cargo != self.candidato.cargo:
+        if self.cargo_id != self.candidato.cargo_id:
             raise ValidationError(
                 "El cargo del voto no coincide con el cargo del candidato."
             )
 
-        # Validación especial para Diputados: deben ser de la misma región
-        if self.cargo.nombre_cargo == "Diputado":
-            if self.candidato.region != self.usuario.region:
-                raise ValidationError(
-                    f"Solo puedes votar por diputados de tu región ({self.usuario.region.nombre_region})"
-                )
+        self.validar_elegibilidad(self.usuario, self.candidato)
 
-    def save(self, *args, **kwargs):
-        """Ejecuta validaciones antes de guardar"""
-        self.full_clean()  # Llama a clean()
+    def save(self, *args, validar=True, **kwargs):
+        """
+        Ejecuta validaciones antes de guardar.
+        Con validar=False se omite full_clean(): el llamador ya validó la
+        elegibilidad y la unicidad (usuario, cargo) la garantiza el constraint.
+        """
+        if validar:
+            self.full_clean()  # Llama a clean()
         super().save(*args, **kwargs)
+
+
+class ConteoCandidato(TimeStampedModel):
+    """
+    Conteo materializado de votos por candidato.
+    - Se incrementa en la misma transacción que el INSERT del voto.
+    - Los resultados leen de aquí en lugar de contar la tabla votos.
+    - Totales por partido, cargo o región se suman sobre estas filas (una por candidato).
+    """
+
+    candidato = models.OneToOneField(
+        Candidato,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="conteo",
+        verbose_name="Candidato",
+    )
+    total_votos = models.PositiveIntegerField(default=0, verbose_name="Total de votos")
+
+    class Meta:
+        db_table = "conteo_candidatos"
+        verbose_name = "Conteo de candidato"
+        verbose_name_plural = "Conteos de candidatos"
+
+    def __str__(self):
+        return f"{self.candidato_id}: {self.total_votos} votos"
+
+
+class ConteoShard(models.Model):
+    """
+    Fragmento (shard) de conteo pendiente de consolidar.
+    - Con VOTOS_CONTEO_SHARDS > 0 cada voto incrementa un shard al azar del candidato,
+      repartiendo los bloqueos de fila entre N filas en lugar de una sola.
+    - El consolidador (consolidar_conteos) suma los pendientes a ConteoCandidato.
+    """
+
+    candidato = models.ForeignKey(
+        Candidato,
+        on_delete=models.CASCADE,
+        related_name="conteo_shards",
+        verbose_name="Candidato",
+    )
+    shard = models.PositiveSmallIntegerField(verbose_name="Número de shard")
+    pendientes = models.IntegerField(default=0, verbose_name="Votos sin consolidar")
+
+    class Meta:
+        db_table = "conteo_shards"
+        verbose_name = "Shard de conteo"
+        verbose_name_plural = "Shards de conteo"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["candidato", "shard"], name="unique_shard_por_candidato"
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.candidato_id}#{self.shard}: {self.pendientes} pendientes"
+
+
+class VotoPendiente(TimeStampedModel):
+    """
+    Cola de ingesta asíncrona (VOTOS_INGESTA = "asincrona").
+    - votar valida el voto, lo deja aquí y responde 202 con el ID como ticket.
+    - El comando procesar_cola_votos lo pasa a la tabla votos por lotes.
+    - Los rechazos (p. ej. doble voto) quedan registrados para consultarlos.
+    """
+
+    ESTADO_CHOICES = [
+        ("pendiente", "Pendiente"),
+        ("registrado", "Registrado"),
+        ("rechazado", "Rechazado"),
+    ]
+
+    usuario = models.ForeignKey(
+        Usuario,
+        on_delete=models.CASCADE,
+        related_name="votos_pendientes",
+        verbose_name="Usuario",
+    )
+    candidato = models.ForeignKey(
+        Candidato, on_delete=models.CASCADE, verbose_name="Candidato"
+    )
+    cargo = models.ForeignKey(Cargo, on_delete=models.CASCADE, verbose_name="Cargo")
+    estado = models.CharField(
+        max_length=10, choices=ESTADO_CHOICES, default="pendiente", verbose_name="Estado"
+    )
+    error = models.CharField(max_length=200, blank=True, verbose_name="Motivo de rechazo")
+    voto_id = models.BigIntegerField(
+        blank=True, null=True, verbose_name="ID del voto registrado"
+    )
+
+    class Meta:
+        db_table = "votos_pendientes"
+        verbose_name = "Voto pendiente"
+        verbose_name_plural = "Votos pendientes"
+        indexes = [
+            models.Index(fields=["estado", "id"]),  # Para que el worker tome lotes en orden
+        ]
+        # Un solo voto en cola por usuario y cargo
+        constraints = [
+            models.UniqueConstraint(
+                fields=["usuario", "cargo"],
+                condition=models.Q(estado="pendiente"),
+                name="unique_voto_pendiente_por_cargo",
+            )
+        ]
+
+    def __str__(self):
+        return f"Ticket {self.id} ({self.estado})"
+
+
+class VotosPorMinuto(models.Model):
+    """
+    Rollup de votos por minuto y cargo.
+    - Lo actualiza incrementalmente el comando actualizar_rollup_votos, desde el
+      horizonte guardado en EstadoRollupVotos; la tabla votos completa solo se
+      cuenta al construirlo por primera vez (o con --completo).
+    - Alimenta el ritmo de votación (por minuto u hora).
+    """
+
+    minuto = models.DateTimeField(verbose_name="Minuto")
+    cargo = models.ForeignKey(Cargo, on_delete=models.CASCADE, verbose_name="Cargo")
+    total = models.PositiveIntegerField(default=0, verbose_name="Votos en el minuto")
+
+    class Meta:
+        db_table = "votos_por_minuto"
+        verbose_name = "Votos por minuto"
+        verbose_name_plural = "Votos por minuto"
+        # El constraint también indexa (minuto, cargo) para los rangos de tiempo
+        constraints = [
+            models.UniqueConstraint(
+                fields=["minuto", "cargo"], name="unique_votos_por_minuto_cargo"
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.minuto:%Y-%m-%d %H:%M} cargo {self.cargo_id}: {self.total}"
+
+
+class EstadoRollupVotos(models.Model):
+    """
+    Fila única con el horizonte de la última actualización de VotosPorMinuto:
+    la siguiente recuenta solo desde ahí (ver actualizar_rollup_votos).
+    """
+
+    horizonte = models.DateTimeField(
+        blank=True, null=True, verbose_name="Votos confirmados hasta"
+    )
+
+    class Meta:
+        db_table = "estado_rollup_votos"
+        verbose_name = "Estado del rollup de votos"
+        verbose_name_plural = "Estado del rollup de votos"
+
+    def __str__(self):
+        return f"Rollup hasta {self.horizonte}"
@@ -0,0 +1,137 @@
+from django.db import connection, transaction
+from django.utils import timezone
+from apps.core.models import Cargo
+
+# Tabla votos particionada por LIST (cargo_id) en PostgreSQL (migración 0006):
+# votos_cargo_<id> por cargo y votos_default para los cargos sin partición.
+# Los resultados por cargo solo leen su partición, y los votos de un cargo
+# se pueden archivar (DETACH) sin un DELETE de millones de filas.
+DEFAULT = "votos_default"
+
+
+def _nombre(cargo_id):
+    return f"votos_cargo_{cargo_id}"
+
+
+def esta_particionada():
+    """True si la BD es PostgreSQL y votos ya es una tabla particionada."""
+    if connection.vendor != "postgresql":
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table "
+            "WHERE partrelid = to_regclass('votos'))"
+        )
+        return cursor.fetchone()[0]
+
+
+def listar_particiones():
+    """
+    Particiones de votos y tablas archivadas, con filas estimadas (estadísticas
+    del planner, sin COUNT) y tamaño en disco.
+
+    Returns:
+        list: [{"nombre", "valores", "filas", "bytes", "archivada"}]
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT c.relname, pg_get_expr(c.relpartbound, c.oid),
+                   GREATEST(c.reltuples, 0)::bigint, pg_total_relation_size(c.oid),
+                   i.inhparent IS NULL
+            FROM pg_class c
+            LEFT JOIN pg_inherits i ON i.inhrelid = c.oid
+            WHERE c.relkind = 'r' AND c.relnamespace = current_schema()::regnamespace
+              AND (i.inhparent = 'votos'::regclass OR c.relname LIKE 'votos\\_cargo\\_%\\_archivada\\_%')
+            ORDER BY c.relname
+            """
+        )
+        return [
+            {
+                "nombre": nombre,
+                "valores": valores,
+                "filas": filas,
+                "bytes": tamano,
+                "archivada": archivada,
+            }
+            for nombre, valores, filas, tamano, archivada in cursor.fetchall()
+        ]
+
+
+def crear_particiones():
+    """
+    Crea la partición de cada cargo que aún no la tiene. Si ya había votos de
+    ese cargo en votos_default se mueven a la nueva partición (PostgreSQL no
+    permite crearla con filas suyas en DEFAULT).
+
+    Returns:
+        list: Nombres de las particiones creadas (ninguna si votos no está particionada)
+    """
+    if not esta_particionada():
+        return []
+    existentes = {p["nombre"] for p in listar_particiones()}
+    creadas = []
+    for cargo_id in Cargo.objects.order_by("id").values_list("id", flat=True):
+        if _nombre(cargo_id) in existentes:
+            continue
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT EXISTS (SELECT 1 FROM {DEFAULT} WHERE cargo_id = %s)", [cargo_id]
+            )
+            if cursor.fetchone()[0]:
+                cursor.execute(f"ALTER TABLE votos DETACH PARTITION {DEFAULT}")
+                cursor.execute(
+                    f"CREATE TABLE {_nombre(cargo_id)} PARTITION OF votos "
+                    f"FOR VALUES IN ({cargo_id:d})"
+                )
+                cursor.execute(
+                    f"WITH movidos AS (DELETE FROM {DEFAULT} WHERE cargo_id = %s RETURNING *) "
+                    "INSERT INTO votos SELECT * FROM movidos",
+                    [cargo_id],
+                )
+                cursor.execute(f"ALTER TABLE votos ATTACH PARTITION {DEFAULT} DEFAULT")
+                cursor.execute(f"ANALYZE {_nombre(cargo_id)}")
+            else:
+                cursor.execute(
+                    f"CREATE TABLE {_nombre(cargo_id)} PARTITION OF votos "
+                    f"FOR VALUES IN ({cargo_id:d})"
+                )
+        creadas.append(_nombre(cargo_id))
+    return creadas
+
+
+def archivar_particion(cargo_id):
+    """
+    Separa (DETACH) los votos de un cargo en una tabla archivada y deja una
+    partición vacía en su lugar: cambio de metadatos, sin reescribir filas.
+    Pensado para descartar votos de simulaciones. Los usuarios pueden volver a
+    votar por ese cargo; los conteos deben recalcularse después
+    (recalcular_conteos). La tabla archivada queda sin claves foráneas.
+
+    Returns:
+        str: Nombre de la tabla archivada (eliminar con eliminar_archivadas)
+    """
+    archivada = f"{_nombre(cargo_id)}_archivada_{timezone.now():%Y%m%d%H%M%S}"
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(f"ALTER TABLE votos DETACH PARTITION {_nombre(cargo_id)}")
+        cursor.execute(f"ALTER TABLE {_nombre(cargo_id)} RENAME TO {archivada}")
+        # La copia archivada no debe impedir borrar usuarios o candidatos
+        cursor.execute(
+            "SELECT conname FROM pg_constraint WHERE conrelid = %s::regclass AND contype = 'f'",
+            [archivada],
+        )
+        for (restriccion,) in cursor.fetchall():
+            cursor.execute(f'ALTER TABLE {archivada} DROP CONSTRAINT "{restriccion}"')
+        cursor.execute(
+            f"CREATE TABLE {_nombre(cargo_id)} PARTITION OF votos FOR VALUES IN ({cargo_id:d})"
+        )
+    return archivada
+
+
+def eliminar_archivadas():
+    """Elimina las tablas archivadas por archivar_particion. Returns: sus nombres."""
+    archivadas = [p["nombre"] for p in listar_particiones() if p["archivada"]]
+    with transaction.atomic(), connection.cursor() as cursor:
+        for nombre in archivadas:
+            cursor.execute(f"DROP TABLE {nombre}")
+    return archivadas
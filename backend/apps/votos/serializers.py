@@ -1,5 +1,6 @@
 from rest_framework import serializers
-from apps.votos.models import Voto
+from apps.votos.models import Voto, VotoPendiente
+from apps.votos.services import emitir_voto, emitir_votos_lote, encolar_voto
 from apps.candidatos.serializers import CandidatoListSerializer
 
 
@@ -11,34 +12,90 @@ class VotarSerializer(serializers.Serializer):
 
     candidato_id = serializers.IntegerField()
 
-    def validate_candidato_id(self, value):
-        """Valida que el candidato exista y esté activo"""
+    def validate(self, attrs):
+        """
+        Valida que el candidato exista y esté activo.
+        Carga el candidato (con su cargo) una sola vez para todo el flujo.
+        """
         from apps.candidatos.models import Candidato
 
         try:
-            candidato = Candidato.objects.get(id=value, activo=True)
+            candidato = Candidato.objects.select_related("cargo").get(
+                id=attrs["candidato_id"], activo=True
+            )
         except Candidato.DoesNotExist:
             raise serializers.ValidationError(
-                "El candidato seleccionado no existe o no está disponible"
+                {"candidato_id": "El candidato seleccionado no existe o no está disponible"}
             )
 
-        return value
+        attrs["candidato"] = candidato
+        return attrs
 
     def create(self, validated_data):
         """
-        Crea el voto con las validaciones del modelo.
-        El modelo Voto.clean() se encarga de validar región, cargo, etc.
+        Valida la elegibilidad (región, rol) y crea el voto confiando en el
+        constraint unique_voto_por_cargo para detectar el doble voto.
+        Los errores de negocio se lanzan como django ValidationError.
         """
-        from apps.candidatos.models import Candidato
+        usuario = self.context["request"].user
+        candidato = validated_data["candidato"]
+
+        Voto.validar_elegibilidad(usuario, candidato)
+        return emitir_voto(usuario, candidato)
+
+    def encolar(self):
+        """
+        Variante asíncrona de save(): valida la elegibilidad y deja el voto
+        en la cola de ingesta (ver procesar_cola_votos).
+        """
+        usuario = self.context["request"].user
+        candidato = self.validated_data["candidato"]
+
+        Voto.validar_elegibilidad(usuario, candidato)
+        return encolar_voto(usuario, candidato)
+
+
+class VotarLoteSerializer(serializers.Serializer):
+    """
+    Serializer para emitir todos los votos de una cédula en una sola petición.
+    Body: {"candidato_ids": [3, 27, 58]}
+    """
+
+    candidato_ids = serializers.ListField(
+        child=serializers.IntegerField(), allow_empty=False, max_length=10
+    )
 
+    def create(self, validated_data):
+        """
+        Devuelve el resultado por candidato (ver emitir_votos_lote).
+        """
         usuario = self.context["request"].user
-        candidato = Candidato.objects.get(id=validated_data["candidato_id"])
+        return emitir_votos_lote(usuario, validated_data["candidato_ids"])
+
+
+class VotoEmitidoSerializer(serializers.ModelSerializer):
+    """
+    Respuesta compacta tras emitir un voto (sin anidar partido/cargo/región).
+    """
+
+    candidato_id = serializers.IntegerField(read_only=True)
+    cargo = serializers.CharField(source="candidato.cargo.nombre_cargo", read_only=True)
 
-        # Crear voto (el modelo se encarga de validaciones)
-        voto = Voto(usuario=usuario, candidato=candidato, cargo=candidato.cargo)
-        voto.save()  # Llama a clean() internamente
+    class Meta:
+        model = Voto
+        fields = ["id", "candidato_id", "cargo", "created_at"]
+
+
+class VotoPendienteSerializer(serializers.ModelSerializer):
+    """
+    Estado de un voto enviado a la cola de ingesta asíncrona.
+    """
 
-        return voto
+    ticket = serializers.IntegerField(source="id", read_only=True)
+
+    class Meta:
+        model = VotoPendiente
+        fields = ["ticket", "candidato_id", "estado", "error", "voto_id", "created_at"]
 
 
 class MiVotoSerializer(serializers.ModelSerializer):
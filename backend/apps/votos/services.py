@@ -0,0 +1,706 @@
+import random
+from collections import Counter, defaultdict
+from datetime import timedelta
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, connection, transaction
+from django.db.models import Count, F, Max, OuterRef, Q, Subquery, Sum
+from django.db.models.functions import Coalesce, Now, TruncHour, TruncMinute
+from django.utils import timezone
+from apps.candidatos.models import Candidato
+from apps.core.referencia import CARGOS
+from apps.votos.models import (
+    ConteoCandidato,
+    ConteoShard,
+    EstadoRollupVotos,
+    Voto,
+    VotoPendiente,
+    VotosPorMinuto,
+)
+
+
+# Los candidatos habilitados casi no cambian durante la elección
+ELEGIBLES_CACHE_SEGUNDOS = 300
+
+# Margen sobre el horizonte del rollup: created_at lo pone la aplicación, con su
+# reloj, un instante antes del INSERT
+ROLLUP_MARGEN = timedelta(minutes=2)
+
+# Inicio de la transacción abierta más antigua (o ahora): ningún voto aún no
+# confirmado puede tener un created_at anterior
+SQL_HORIZONTE_ROLLUP = """
+    SELECT LEAST(now(), MIN(xact_start))
+    FROM pg_stat_activity
+    WHERE datname = current_database()
+      AND xact_start IS NOT NULL
+      AND pid <> pg_backend_pid()
+"""
+
+# Serie de ritmo de votación: (truncado, duración del intervalo, intervalos devueltos)
+RITMO_INTERVALOS = {
+    "minuto": (TruncMinute, timedelta(minutes=1), 60),
+    "hora": (TruncHour, timedelta(hours=1), 24),
+}
+
+
+def _sumar_o_crear(modelo, filtros, campo, cantidad, **extra):
+    """
+    UPDATE atómico campo = campo + cantidad; si la fila no existe la crea.
+    Otro proceso puede crear la misma fila a la vez: se reintenta el UPDATE.
+    """
+    actualizar = {campo: F(campo) + cantidad, **extra}
+    if modelo.objects.filter(**filtros).update(**actualizar):
+        return
+
+    try:
+        with transaction.atomic():
+            modelo.objects.create(**filtros, **{campo: cantidad})
+    except IntegrityError:
+        modelo.objects.filter(**filtros).update(**actualizar)
+
+
+def incrementar_conteo(candidato_id, cantidad=1, shards=None):
+    """
+    Suma votos al conteo de un candidato.
+    Debe llamarse dentro de la transacción que inserta el voto para que
+    el conteo y la tabla votos nunca diverjan.
+
+    Args:
+        candidato_id (int): Candidato que recibe los votos
+        cantidad (int): Votos a sumar
+        shards (int): Cantidad de shards; por defecto settings.VOTOS_CONTEO_SHARDS.
+            Con 0 se actualiza ConteoCandidato directamente (conteo exacto).
+    """
+    if shards is None:
+        shards = settings.VOTOS_CONTEO_SHARDS
+
+    if shards > 0:
+        _sumar_o_crear(
+            ConteoShard,
+            {"candidato_id": candidato_id, "shard": random.randrange(shards)},
+            "pendientes",
+            cantidad,
+        )
+    else:
+        _sumar_o_crear(
+            ConteoCandidato,
+            {"candidato_id": candidato_id},
+            "total_votos",
+            cantidad,
+            updated_at=Now(),
+        )
+
+
+# Índices que heredan de cada restricción única (uno por partición de votos)
+_indices_de_restriccion = {}
+
+
+def _viola_restriccion(error, nombre):
+    """
+    True si el IntegrityError lo causó la restricción `nombre`. PostgreSQL
+    informa el nombre (diag.constraint_name), pero en una tabla particionada es
+    el del índice de la partición: se buscan sus índices hijos en el catálogo
+    (una vez por proceso y partición nueva). En otros motores se acepta
+    cualquier violación de UNIQUE.
+    """
+    diag = getattr(error.__cause__, "diag", None)
+    if diag is None:
+        return "UNIQUE" in str(error).upper()
+    violada = diag.constraint_name
+    if violada == nombre:
+        return True
+    if violada not in _indices_de_restriccion.get(nombre, ()):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+                "WHERE i.inhparent = to_regclass(%s)",
+                [nombre],
+            )
+            _indices_de_restriccion[nombre] = {fila[0] for fila in cursor.fetchall()}
+    return violada in _indices_de_restriccion[nombre]
+
+
+def emitir_voto(usuario, candidato):
+    """
+    Inserta el voto y actualiza el conteo en una sola transacción.
+    La elegibilidad ya debe estar validada (Voto.validar_elegibilidad); el doble
+    voto lo detecta el constraint unique_voto_por_cargo, sin consulta previa.
+
+    Args:
+        usuario: Usuario autenticado (solo se usa su ID)
+        candidato (Candidato): Candidato con cargo cargado (select_related)
+
+    Raises:
+        ValidationError: Si el usuario ya votó por ese cargo
+        IntegrityError: Cualquier otra violación (p. ej. el candidato se eliminó)
+    """
+    voto = Voto(usuario=usuario, candidato=candidato, cargo_id=candidato.cargo_id)
+    try:
+        with transaction.atomic():
+            voto.save(validar=False)
+            incrementar_conteo(candidato.id)
+    except IntegrityError as e:
+        if not _viola_restriccion(e, "unique_voto_por_cargo"):
+            raise
+        raise ValidationError(
+            f"Ya emitiste tu voto para {candidato.cargo.nombre_cargo}."
+        )
+    return voto
+
+
+def emitir_votos_lote(usuario, candidato_ids):
+    """
+    Emite varios votos de una misma cédula (p. ej. Presidente, Senador y Diputado).
+    - Una consulta para cargar todos los candidatos y otra para los cargos ya votados.
+    - Los votos válidos se insertan con un solo bulk_create en una transacción.
+    - Cada candidato recibe su propio resultado: un error no invalida al resto.
+
+    Returns:
+        list: [{"candidato_id", "voto" (Voto o None), "error" (str o None)}]
+              en el mismo orden de candidato_ids
+    """
+    candidatos = Candidato.objects.select_related("cargo").in_bulk(candidato_ids)
+    cargos_votados = set(
+        Voto.objects.filter(usuario=usuario).values_list("cargo_id", flat=True)
+    )
+
+    resultados = []
+    nuevos = []
+    for candidato_id in candidato_ids:
+        resultado = {"candidato_id": candidato_id, "voto": None, "error": None}
+        resultados.append(resultado)
+
+        candidato = candidatos.get(candidato_id)
+        if candidato is None or not candidato.activo:
+            resultado["error"] = "El candidato seleccionado no existe o no está disponible"
+            continue
+
+        try:
+            Voto.validar_elegibilidad(usuario, candidato)
+        except ValidationError as e:
+            resultado["error"] = e.messages[0]
+            continue
+
+        if candidato.cargo_id in cargos_votados:
+            resultado["error"] = f"Ya emitiste tu voto para {candidato.cargo.nombre_cargo}."
+            continue
+
+        cargos_votados.add(candidato.cargo_id)
+        resultado["voto"] = Voto(
+            usuario=usuario, candidato=candidato, cargo_id=candidato.cargo_id
+        )
+        nuevos.append(resultado)
+
+    if not nuevos:
+        return resultados
+
+    try:
+        with transaction.atomic():
+            Voto.objects.bulk_create([r["voto"] for r in nuevos])
+            for resultado in nuevos:
+                incrementar_conteo(resultado["candidato_id"])
+    except IntegrityError as e:
+        if not _viola_restriccion(e, "unique_voto_por_cargo"):
+            raise
+        # Otro request votó en paralelo por alguno de los cargos:
+        # reintentar uno por uno para saber cuál falló
+        for resultado in nuevos:
+            try:
+                resultado["voto"] = emitir_voto(usuario, resultado["voto"].candidato)
+            except ValidationError as e:
+                resultado["voto"] = None
+                resultado["error"] = e.messages[0]
+
+    return resultados
+
+
+def encolar_voto(usuario, candidato):
+    """
+    Deja un voto ya validado en la cola de ingesta asíncrona.
+
+    Raises:
+        ValidationError: Si el usuario ya tiene un voto en cola para ese cargo
+    """
+    try:
+        with transaction.atomic():
+            return VotoPendiente.objects.create(
+                usuario=usuario, candidato=candidato, cargo_id=candidato.cargo_id
+            )
+    except IntegrityError:
+        raise ValidationError(
+            f"Ya tienes un voto en proceso para {candidato.cargo.nombre_cargo}."
+        )
+
+
+def procesar_cola_votos(tamano_lote=500):
+    """
+    Pasa un lote de votos pendientes a la tabla votos.
+    - Toma el lote con SKIP LOCKED: varios workers pueden drenar la cola a la vez.
+    - Los dobles votos se detectan con una consulta por lote y se rechazan.
+    - Los votos válidos se insertan con bulk_create y los conteos se suman por candidato.
+
+    Returns:
+        tuple: (registrados, rechazados)
+    """
+    with transaction.atomic():
+        pendientes = list(
+            VotoPendiente.objects.select_for_update(skip_locked=True)
+            .filter(estado="pendiente")
+            .order_by("id")[:tamano_lote]
+        )
+        if not pendientes:
+            return 0, 0
+
+        ya_votados = set(
+            Voto.objects.filter(
+                usuario_id__in={p.usuario_id for p in pendientes}
+            ).values_list("usuario_id", "cargo_id")
+        )
+
+        nuevos = []
+        for pendiente in pendientes:
+            clave = (pendiente.usuario_id, pendiente.cargo_id)
+            if clave in ya_votados:
+                pendiente.estado = "rechazado"
+                pendiente.error = "Ya emitiste tu voto para este cargo."
+                continue
+            ya_votados.add(clave)
+            voto = Voto(
+                usuario_id=pendiente.usuario_id,
+                candidato_id=pendiente.candidato_id,
+                cargo_id=pendiente.cargo_id,
+            )
+            nuevos.append((pendiente, voto))
+
+        try:
+            with transaction.atomic():
+                Voto.objects.bulk_create([voto for _, voto in nuevos])
+        except IntegrityError:
+            # Un voto síncrono (p. ej. votar-lote) entró en paralelo: insertar uno por uno
+            for pendiente, voto in nuevos:
+                try:
+                    with transaction.atomic():
+                        voto.save(validar=False)
+                except IntegrityError:
+                    voto.pk = None
+
+        registrados = Counter()
+        ahora = timezone.now()
+        for pendiente, voto in nuevos:
+            if voto.pk is None:
+                pendiente.estado = "rechazado"
+                pendiente.error = "Ya emitiste tu voto para este cargo."
+            else:
+                pendiente.estado = "registrado"
+                pendiente.voto_id = voto.pk
+                registrados[voto.candidato_id] += 1
+
+        for candidato_id, cantidad in registrados.items():
+            incrementar_conteo(candidato_id, cantidad)
+
+        for pendiente in pendientes:
+            pendiente.updated_at = ahora
+        VotoPendiente.objects.bulk_update(
+            pendientes, ["estado", "error", "voto_id", "updated_at"]
+        )
+
+    total_registrados = sum(registrados.values())
+    return total_registrados, len(pendientes) - total_registrados
+
+
+def consolidar_shards():
+    """
+    Pasa los votos pendientes de los shards al conteo autoritativo.
+    Usa SKIP LOCKED: los shards que un voto tiene bloqueados se consolidan
+    en la siguiente pasada, sin frenar a los votantes.
+
+    Returns:
+        int: Cantidad de votos consolidados
+    """
+    with transaction.atomic():
+        shards = list(
+            ConteoShard.objects.select_for_update(skip_locked=True)
+            .exclude(pendientes=0)
+            .values_list("id", "candidato_id", "pendientes")
+        )
+        if not shards:
+            return 0
+
+        por_candidato = defaultdict(int)
+        for _, candidato_id, pendientes in shards:
+            por_candidato[candidato_id] += pendientes
+
+        ConteoShard.objects.filter(id__in=[s[0] for s in shards]).update(pendientes=0)
+        for candidato_id, cantidad in por_candidato.items():
+            incrementar_conteo(candidato_id, cantidad, shards=0)
+
+    return sum(por_candidato.values())
+
+
+def contar_candidatos_elegibles(region_id):
+    """
+    Candidatos activos por los que puede votar alguien de la región, por cargo
+    (los diputados solo de su región). Cacheado ELEGIBLES_CACHE_SEGUNDOS.
+
+    Returns:
+        dict: {cargo_id: cantidad}
+    """
+    clave = f"candidatos:elegibles:{region_id}"
+    conteos = cache.get(clave)
+    if conteos is None:
+        diputado = [c.id for c in CARGOS.todos() if c.nombre_cargo == "Diputado"]
+        conteos = dict(
+            Candidato.objects.filter(activo=True)
+            .filter(~Q(cargo_id__in=diputado) | Q(region_id=region_id))
+            .values_list("cargo_id")
+            .annotate(total=Count("id"))
+        )
+        cache.set(clave, conteos, ELEGIBLES_CACHE_SEGUNDOS)
+    return conteos
+
+
+def obtener_estado_cedula(usuario):
+    """
+    Estado de la cédula del usuario para todos los cargos: si ya votó, por
+    quién, y cuántos candidatos puede elegir. Una sola consulta (índice
+    usuario, cargo); los cargos y los conteos de candidatos vienen de caché.
+
+    Returns:
+        list: [{"cargo", "cargo_id", "puede_votar", "ya_voto", "voto",
+        "candidatos_elegibles"}, ...]
+    """
+    votos = {
+        voto["cargo_id"]: voto
+        for voto in Voto.objects.filter(usuario=usuario).values(
+            "cargo_id",
+            "candidato_id",
+            "candidato__nombre",
+            "candidato__apellido_paterno",
+            "candidato__apellido_materno",
+            "created_at",
+        )
+    }
+    elegibles = contar_candidatos_elegibles(usuario.region_id)
+    es_votante = usuario.puede_votar()
+
+    estado = []
+    for cargo in CARGOS.todos():
+        voto = votos.get(cargo.id)
+        estado.append(
+            {
+                "cargo": cargo.nombre_cargo,
+                "cargo_id": cargo.id,
+                "puede_votar": es_votante and voto is None,
+                "ya_voto": voto is not None,
+                "voto": voto
+                and {
+                    "candidato_id": voto["candidato_id"],
+                    "candidato": " ".join(
+                        (
+                            voto["candidato__nombre"],
+                            voto["candidato__apellido_paterno"],
+                            voto["candidato__apellido_materno"],
+                        )
+                    ),
+                    "created_at": voto["created_at"],
+                },
+                "candidatos_elegibles": elegibles.get(cargo.id, 0),
+            }
+        )
+    return estado
+
+
+def anotar_total_votos(queryset, exacto=False):
+    """
+    Anota total_votos en un queryset de Candidato desde el conteo materializado.
+
+    Args:
+        exacto (bool): Si es True suma también los shards sin consolidar.
+            Si es False devuelve la vista eventual (retraso = intervalo del consolidador).
+    """
+    total = Coalesce("conteo__total_votos", 0)
+    if exacto:
+        pendientes = (
+            ConteoShard.objects.filter(candidato=OuterRef("pk"))
+            .values("candidato")
+            .annotate(suma=Sum("pendientes"))
+            .values("suma")
+        )
+        total = total + Coalesce(Subquery(pendientes), 0)
+    return queryset.annotate(total_votos=total)
+
+
+def obtener_total_votos(candidato_id):
+    """
+    Conteo consolidado de un candidato activo (una consulta por clave primaria).
+
+    Returns:
+        int: Votos del candidato, o None si no existe o está inactivo
+    """
+    return (
+        anotar_total_votos(Candidato.objects.filter(pk=candidato_id, activo=True))
+        .values_list("total_votos", flat=True)
+        .first()
+    )
+
+
+def calcular_resultados(cargo=None, region=None, exacto=False):
+    """
+    Resultados por candidato ordenados de mayor a menor cantidad de votos.
+
+    Args:
+        cargo (str): Filtrar por nombre de cargo
+        region (int): Filtrar por región (solo para Diputados)
+        exacto (bool): Incluir shards sin consolidar (ver anotar_total_votos)
+
+    Returns:
+        list: Diccionarios listos para serializar como JSON
+    """
+    queryset = anotar_total_votos(
+        Candidato.objects.filter(activo=True).select_related(
+            "partido", "cargo", "region"
+        ),
+        exacto=exacto,
+    )
+
+    # Filtros opcionales
+    if cargo:
+        queryset = queryset.filter(cargo__nombre_cargo=cargo)
+    if region:
+        queryset = queryset.filter(region_id=region)
+
+    # Ordenar por número de votos (descendente)
+    queryset = queryset.order_by("-total_votos", "apellido_paterno")
+
+    # Serializar resultados
+    resultados = []
+    for candidato in queryset:
+        resultados.append(
+            {
+                "id": candidato.id,
+                "nombre_completo": candidato.get_full_name(),
+                "partido": {
+                    "sigla": candidato.partido.sigla,
+                    "nombre": candidato.partido.nombre_partido,
+                    "logo_url": candidato.partido.logo_url,
+                },
+                "cargo": candidato.cargo.nombre_cargo,
+                "region": candidato.region.nombre_region if candidato.region else None,
+                "total_votos": candidato.total_votos,
+                "foto_url": candidato.foto_url,
+            }
+        )
+
+    return resultados
+
+
+def recalcular_conteos(corregir=True):
+    """
+    Reconstruye los conteos materializados a partir de la tabla votos.
+    Los shards pendientes cuentan como parte del conteo actual; al corregir
+    un candidato sus shards se vacían y su conteo pasa a ser el real.
+
+    Args:
+        corregir (bool): Si es False solo verifica, sin escribir cambios.
+            Al corregir también se reconstruye el rollup de votos por minuto.
+
+    Returns:
+        list: Diferencias encontradas [(candidato_id, conteo_actual, votos_reales)]
+    """
+    with transaction.atomic():
+        reales = dict(
+            Voto.objects.values("candidato_id")
+            .annotate(total=Count("id"))
+            .values_list("candidato_id", "total")
+        )
+        actuales = dict(
+            ConteoCandidato.objects.select_for_update().values_list(
+                "candidato_id", "total_votos"
+            )
+        )
+        pendientes = defaultdict(int)
+        for candidato_id, cantidad in ConteoShard.objects.select_for_update().values_list(
+            "candidato_id", "pendientes"
+        ):
+            pendientes[candidato_id] += cantidad
+
+        diferencias = []
+        for candidato_id in Candidato.objects.values_list("id", flat=True):
+            real = reales.get(candidato_id, 0)
+            actual = actuales.get(candidato_id)
+            if actual is not None:
+                actual += pendientes[candidato_id]
+            elif pendientes[candidato_id]:
+                actual = pendientes[candidato_id]
+            if actual != real:
+                diferencias.append((candidato_id, actual, real))
+
+        if corregir and diferencias:
+            ConteoShard.objects.filter(
+                candidato_id__in=[d[0] for d in diferencias]
+            ).update(pendientes=0)
+            for candidato_id, _, real in diferencias:
+                if candidato_id in actuales:
+                    ConteoCandidato.objects.filter(candidato_id=candidato_id).update(
+                        total_votos=real, updated_at=Now()
+                    )
+            ConteoCandidato.objects.bulk_create(
+                [
+                    ConteoCandidato(candidato_id=candidato_id, total_votos=real)
+                    for candidato_id, _, real in diferencias
+                    if candidato_id not in actuales
+                ]
+            )
+
+    if corregir:
+        actualizar_rollup_votos(completo=True)
+
+    return diferencias
+
+
+def _horizonte_rollup():
+    """Instante antes del cual todos los votos ya están confirmados."""
+    if connection.vendor != "postgresql":
+        return timezone.now()
+    with connection.cursor() as cursor:
+        cursor.execute(SQL_HORIZONTE_ROLLUP)
+        return cursor.fetchone()[0]
+
+
+def actualizar_rollup_votos(completo=False):
+    """
+    Acumula en VotosPorMinuto los votos nuevos desde la actualización anterior.
+    Escribe en la primaria: lo ejecuta el comando actualizar_rollup_votos (o
+    recalcular_conteos), nunca una petición de lectura.
+
+    Cada actualización guarda su horizonte en EstadoRollupVotos: el inicio de la
+    transacción abierta más antigua al leer los votos. La siguiente recuenta desde
+    ese horizonte (menos ROLLUP_MARGEN), así que un voto que confirma tarde se
+    cuenta aunque su minuto ya haya pasado. Sin horizonte guardado se parte del
+    último minuto del rollup; solo con el rollup vacío se cuenta toda la tabla.
+    La fila de estado se bloquea: dos actualizaciones simultáneas se turnan.
+
+    Args:
+        completo (bool): Borra el rollup y lo reconstruye desde toda la tabla votos
+            (necesario si se eliminaron votos).
+
+    Returns:
+        int: Filas (minuto, cargo) escritas
+    """
+    with transaction.atomic():
+        estado, _ = EstadoRollupVotos.objects.select_for_update().get_or_create(pk=1)
+        if completo:
+            VotosPorMinuto.objects.all().delete()
+            anterior = None
+        else:
+            anterior = estado.horizonte or VotosPorMinuto.objects.aggregate(
+                ultimo=Max("minuto")
+            )["ultimo"]
+        horizonte = _horizonte_rollup()
+
+        votos = Voto.objects.all()
+        if anterior is not None:
+            # Desde el inicio del minuto: los minutos se recuentan completos
+            desde = (anterior - ROLLUP_MARGEN).replace(second=0, microsecond=0)
+            votos = votos.filter(created_at__gte=desde)
+        filas = [
+            VotosPorMinuto(minuto=fila["minuto"], cargo_id=fila["cargo_id"], total=fila["total"])
+            for fila in votos.annotate(minuto=TruncMinute("created_at"))
+            .values("minuto", "cargo_id")
+            .annotate(total=Count("id"))
+            .order_by()
+        ]
+        VotosPorMinuto.objects.bulk_create(
+            filas,
+            update_conflicts=True,
+            unique_fields=["minuto", "cargo"],
+            update_fields=["total"],
+        )
+        estado.horizonte = horizonte
+        estado.save(update_fields=["horizonte"])
+    return len(filas)
+
+
+def calcular_estadisticas():
+    """
+    Estadísticas generales del sistema, cacheadas ESTADISTICAS_CACHE_SEGUNDOS.
+    Los votos salen de un solo agregado sobre los conteos materializados (total y
+    por cargo, una fila por candidato), así que no dependen del rollup;
+    votantes y candidatos son dos COUNT sobre índices.
+
+    Returns:
+        dict: total_votos, total_votantes, total_candidatos, votos_por_cargo
+    """
+    datos = cache.get("votos:estadisticas")
+    if datos is not None:
+        return datos
+
+    from apps.usuarios.models import Usuario
+
+    cargos = CARGOS.todos()
+    agregados = {
+        f"cargo_{cargo.id}": Coalesce(
+            Sum("total_votos", filter=Q(candidato__cargo_id=cargo.id)), 0
+        )
+        for cargo in cargos
+    }
+    votos = ConteoCandidato.objects.aggregate(
+        total=Coalesce(Sum("total_votos"), 0), **agregados
+    )
+
+    datos = {
+        "total_votos": votos["total"],
+        "total_votantes": Usuario.objects.filter(rol="votante").count(),
+        "total_candidatos": Candidato.objects.filter(activo=True).count(),
+        "votos_por_cargo": {
+            cargo.nombre_cargo: votos[f"cargo_{cargo.id}"] for cargo in cargos
+        },
+    }
+    cache.set("votos:estadisticas", datos, settings.ESTADISTICAS_CACHE_SEGUNDOS)
+    return datos
+
+
+def calcular_ritmo_votacion(intervalo="minuto"):
+    """
+    Votos por minuto (última hora) o por hora (últimas 24 horas), desde el rollup
+    que mantiene el comando actualizar_rollup_votos (sin él la serie queda vacía).
+    Cacheado ESTADISTICAS_CACHE_SEGUNDOS por intervalo.
+
+    Args:
+        intervalo (str): "minuto" u "hora" (ver RITMO_INTERVALOS)
+
+    Returns:
+        list: [{"inicio": datetime, "total": int, "por_cargo": {nombre_cargo: int}}]
+            solo con los intervalos que tienen votos, en orden cronológico
+    """
+    clave = f"votos:ritmo:{intervalo}"
+    serie = cache.get(clave)
+    if serie is not None:
+        return serie
+
+    truncar, paso, cantidad = RITMO_INTERVALOS[intervalo]
+    actual = timezone.localtime().replace(second=0, microsecond=0)
+    if intervalo == "hora":
+        actual = actual.replace(minute=0)
+    desde = actual - paso * (cantidad - 1)
+    nombres = {cargo.id: cargo.nombre_cargo for cargo in CARGOS.todos()}
+
+    filas = (
+        VotosPorMinuto.objects.filter(minuto__gte=desde)
+        .annotate(inicio=truncar("minuto"))
+        .values("inicio", "cargo_id")
+        .annotate(total=Sum("total"))
+        .order_by("inicio")
+    )
+    serie = []
+    for fila in filas:
+        if not serie or serie[-1]["inicio"] != fila["inicio"]:
+            serie.append({"inicio": fila["inicio"], "total": 0, "por_cargo": {}})
+        punto = serie[-1]
+        punto["total"] += fila["total"]
+        nombre = nombres.get(fila["cargo_id"], str(fila["cargo_id"]))
+        punto["por_cargo"][nombre] = fila["total"]
+
+    cache.set(clave, serie, settings.ESTADISTICAS_CACHE_SEGUNDOS)
+    return serie
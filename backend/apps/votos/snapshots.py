@@ -0,0 +1,115 @@
+import hashlib
+import threading
+import time
+from dataclasses import dataclass
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from rest_framework.renderers import JSONRenderer
+from apps.votos.services import calcular_resultados
+
+# Locks por clave: los hilos de un mismo proceso esperan a una sola regeneración
+_locks = {}
+_locks_guard = threading.Lock()
+
+
+@dataclass
+class Snapshot:
+    """Resultados pre-serializados listos para enviar."""
+
+    contenido: bytes
+    etag: str
+    modificado: float  # Última vez que cambió el contenido (epoch)
+    generado: float  # Última vez que se regeneró (epoch)
+    segundos: int  # Vigencia (RESULTADOS_SNAPSHOT_SEGUNDOS o RESULTADOS_EXACTA_SEGUNDOS)
+
+    def vigente(self):
+        return time.time() - self.generado < self.segundos
+
+
+def _clave(cargo, region, exacto=False):
+    return f"resultados{':exacta' if exacto else ''}:{cargo or '*'}:{region or '*'}"
+
+
+def _lock_local(clave):
+    with _locks_guard:
+        return _locks.setdefault(clave, threading.Lock())
+
+
+def _regenerar(clave, cargo, region, anterior, exacto):
+    contenido = JSONRenderer().render(calcular_resultados(cargo, region, exacto=exacto))
+    etag = f'"{hashlib.sha1(contenido).hexdigest()}"'
+    ahora = time.time()
+    segundos = (
+        settings.RESULTADOS_EXACTA_SEGUNDOS if exacto else settings.RESULTADOS_SNAPSHOT_SEGUNDOS
+    )
+
+    # Si los números no cambiaron se conserva la fecha de modificación
+    modificado = anterior.modificado if anterior and anterior.etag == etag else ahora
+    snapshot = Snapshot(contenido, etag, modificado, ahora, segundos)
+
+    # Se guarda más allá del intervalo para poder servirlo mientras otro regenera
+    cache.set(clave, snapshot, segundos * 10)
+    return snapshot
+
+
+def obtener_snapshot_resultados(cargo=None, region=None, exacto=False):
+    """
+    Devuelve el snapshot de resultados para (cargo, región), regenerándolo
+    como máximo una vez por RESULTADOS_SNAPSHOT_SEGUNDOS. Con exacto=True
+    (consistencia=exacta, suma los shards) es un snapshot aparte con vigencia
+    RESULTADOS_EXACTA_SEGUNDOS.
+
+    Protección contra estampidas (single-flight):
+    - Dentro del proceso, un lock por clave: solo un hilo consulta la BD.
+    - Entre procesos, un lock en la caché (cache.add): quien no lo obtiene
+      sirve el snapshot anterior aunque esté vencido.
+    """
+    clave = _clave(cargo, region, exacto)
+    snapshot = cache.get(clave)
+    if snapshot and snapshot.vigente():
+        return snapshot
+
+    with _lock_local(clave):
+        # Otro hilo pudo regenerarlo mientras esperábamos el lock
+        snapshot = cache.get(clave)
+        if snapshot and snapshot.vigente():
+            return snapshot
+
+        clave_lock = f"{clave}:regenerando"
+        if not cache.add(clave_lock, 1, timeout=30):
+            if snapshot:
+                return snapshot  # Otro proceso regenera: servir el anterior
+            # Sin snapshot previo: esperar brevemente a que el otro proceso termine
+            for _ in range(20):
+                time.sleep(0.05)
+                snapshot = cache.get(clave)
+                if snapshot:
+                    return snapshot
+            # El otro proceso tarda demasiado: regenerar sin tocar su lock
+            return _regenerar(clave, cargo, region, snapshot, exacto)
+
+        try:
+            return _regenerar(clave, cargo, region, snapshot, exacto)
+        finally:
+            cache.delete(clave_lock)
+
+
+def responder_snapshot(request, snapshot):
+    """
+    Envía el snapshot con ETag, Last-Modified y Cache-Control.
+    Responde 304 si el cliente ya tiene esa versión (If-None-Match / If-Modified-Since).
+    """
+    ultima_modificacion = int(snapshot.modificado)
+    respuesta = get_conditional_response(
+        request, etag=snapshot.etag, last_modified=ultima_modificacion
+    )
+    if respuesta is None:
+        respuesta = HttpResponse(snapshot.contenido, content_type="application/json")
+
+    respuesta["ETag"] = snapshot.etag
+    respuesta["Last-Modified"] = http_date(ultima_modificacion)
+    respuesta["Cache-Control"] = f"public, max-age={snapshot.segundos}"
+    return respuesta
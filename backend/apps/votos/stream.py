@@ -0,0 +1,229 @@
+import asyncio
+import json
+import logging
+import time
+import weakref
+from django.conf import settings
+from apps.candidatos.models import Candidato
+
+# Stream de resultados en vivo (Server-Sent Events sobre ASGI).
+# Un hub por event loop lee el conteo consolidado una vez por tick
+# (RESULTADOS_STREAM_SEGUNDOS), calcula qué candidatos cambiaron y publica
+# un solo mensaje por tópico (cargo, región). Los suscriptores al día reciben
+# ese mensaje ya serializado; los atrasados, los cambios acumulados desde su
+# última versión. Un candidato que deja de estar activo se publica con total
+# null. Sin suscriptores el hub deja de consultar la BD.
+
+logger = logging.getLogger(__name__)
+
+# Comentario SSE enviado si no hubo cambios: mantiene viva la conexión en proxies
+PING_SEGUNDOS = 15
+PING = b": ping\n\n"
+
+_hubs = weakref.WeakKeyDictionary()
+
+
+def evento_sse(evento, datos, id=None):
+    """Serializa un evento SSE (event/id/data) listo para escribir en la respuesta."""
+    lineas = [f"event: {evento}"]
+    if id is not None:
+        lineas.append(f"id: {id}")
+    lineas.append("data: " + json.dumps(datos, separators=(",", ":")))
+    return ("\n".join(lineas) + "\n\n").encode()
+
+
+def _topicos_de(cargo, region):
+    """Tópicos a los que pertenece un candidato (sin filtro, por cargo, por región)."""
+    topicos = [(None, None), (cargo, None)]
+    if region is not None:
+        topicos += [(None, region), (cargo, region)]
+    return topicos
+
+
+class _Topico:
+    """Estado de un tópico (cargo, región): versión y último mensaje publicado."""
+
+    __slots__ = ("suscriptores", "version", "anterior", "mensaje", "cambios", "evento")
+
+    def __init__(self, version):
+        self.suscriptores = 0
+        self.version = version
+        self.anterior = version
+        self.mensaje = None
+        self.cambios = {}  # candidato_id -> versión en que cambió
+        self.evento = asyncio.Event()
+
+    def publicar(self, version, totales, generado):
+        for candidato_id in totales:
+            self.cambios[candidato_id] = version
+        self.anterior, self.version = self.version, version
+        self.mensaje = evento_sse(
+            "delta",
+            {"version": version, "generado": generado, "candidatos": totales},
+            id=version,
+        )
+        # Despierta a todos los que esperaban y deja un evento nuevo para el próximo tick
+        evento, self.evento = self.evento, asyncio.Event()
+        evento.set()
+
+
+class Suscripcion:
+    """Suscripción de un cliente SSE a un tópico; se itera con siguiente()."""
+
+    def __init__(self, hub, clave, topico, version):
+        self._hub = hub
+        self.clave = clave
+        self._topico = topico
+        self.version = version
+
+    async def siguiente(self, timeout=PING_SEGUNDOS):
+        """
+        Espera el próximo cambio del tópico.
+
+        Returns:
+            bytes: Evento delta, o None si pasaron `timeout` segundos sin cambios
+        """
+        topico = self._topico
+        if topico.version == self.version:
+            try:
+                await asyncio.wait_for(topico.evento.wait(), timeout)
+            except asyncio.TimeoutError:
+                return None
+
+        if topico.anterior == self.version:
+            mensaje = topico.mensaje  # Caso común: un tick, mensaje compartido
+        else:
+            totales = self._hub.totales
+            mensaje = evento_sse(
+                "delta",
+                {
+                    "version": topico.version,
+                    "generado": self._hub.generado,
+                    "candidatos": {
+                        # Los dados de baja ya no están en totales: se informan como null
+                        candidato_id: totales.get(candidato_id, (None,))[0]
+                        for candidato_id, version in topico.cambios.items()
+                        if version > self.version
+                    },
+                },
+                id=topico.version,
+            )
+        self.version = topico.version
+        return mensaje
+
+    def cerrar(self):
+        self._hub.desuscribir(self)
+
+
+class HubResultados:
+    """Difunde los cambios del conteo a los suscriptores de un event loop."""
+
+    def __init__(self):
+        self.totales = {}  # candidato_id -> (total_votos, cargo, region_id)
+        self.version = 0
+        self.generado = None
+        self._topicos = {}
+        self._suscriptores = 0
+        self._tarea = None
+        self._lock = asyncio.Lock()
+
+    @classmethod
+    def actual(cls):
+        """Hub del event loop en curso (las primitivas asyncio no cruzan loops)."""
+        loop = asyncio.get_running_loop()
+        hub = _hubs.get(loop)
+        if hub is None:
+            hub = _hubs[loop] = cls()
+        return hub
+
+    async def suscribir(self, cargo=None, region=None):
+        """
+        Registra un suscriptor para (cargo, región) y arranca el ciclo si estaba detenido.
+
+        Returns:
+            tuple: (Suscripcion, bytes con el evento snapshot inicial del tópico)
+        """
+        async with self._lock:
+            if self._tarea is None:
+                # El hub estuvo inactivo: el estado en memoria puede estar desactualizado
+                await self._actualizar()
+                self._tarea = asyncio.get_running_loop().create_task(self._ciclo())
+
+            clave = (cargo, region)
+            topico = self._topicos.get(clave)
+            if topico is None:
+                topico = self._topicos[clave] = _Topico(self.version)
+            topico.suscriptores += 1
+            self._suscriptores += 1
+
+        snapshot = evento_sse(
+            "snapshot",
+            {
+                "version": topico.version,
+                "generado": self.generado,
+                "candidatos": {
+                    candidato_id: total
+                    for candidato_id, (total, c, r) in self.totales.items()
+                    if clave in _topicos_de(c, r)
+                },
+            },
+            id=topico.version,
+        )
+        return Suscripcion(self, clave, topico, topico.version), snapshot
+
+    def desuscribir(self, suscripcion):
+        topico = self._topicos.get(suscripcion.clave)
+        if topico is not None:
+            topico.suscriptores -= 1
+            if topico.suscriptores == 0:
+                del self._topicos[suscripcion.clave]
+        self._suscriptores -= 1
+
+    @property
+    def suscriptores(self):
+        return self._suscriptores
+
+    async def _ciclo(self):
+        try:
+            while self._suscriptores > 0:
+                await asyncio.sleep(settings.RESULTADOS_STREAM_SEGUNDOS)
+                try:
+                    await self._actualizar()
+                except Exception:
+                    # Un fallo de BD no corta los streams: se reintenta en el próximo tick
+                    logger.exception("No se pudo leer el conteo para el stream de resultados")
+        finally:
+            self._tarea = None
+
+    async def _actualizar(self):
+        """Lee el conteo consolidado (una consulta) y publica los cambios por tópico."""
+        filas = [
+            fila
+            async for fila in Candidato.objects.filter(activo=True).values_list(
+                "id", "cargo__nombre_cargo", "region_id", "conteo__total_votos"
+            )
+        ]
+
+        cambios = {}
+        for candidato_id, cargo, region_id, total in filas:
+            actual = (total or 0, cargo, region_id)
+            if self.totales.get(candidato_id) != actual:
+                self.totales[candidato_id] = actual
+                for clave in _topicos_de(cargo, region_id):
+                    if clave in self._topicos:
+                        cambios.setdefault(clave, {})[candidato_id] = actual[0]
+
+        # Candidatos desactivados o eliminados: se quitan y se publican con total null
+        vigentes = {fila[0] for fila in filas}
+        for candidato_id in self.totales.keys() - vigentes:
+            _, cargo, region_id = self.totales.pop(candidato_id)
+            for clave in _topicos_de(cargo, region_id):
+                if clave in self._topicos:
+                    cambios.setdefault(clave, {})[candidato_id] = None
+
+        self.generado = time.time()
+        if not cambios:
+            return
+        self.version += 1
+        for clave, totales in cambios.items():
+            self._topicos[clave].publicar(self.version, totales, self.generado)
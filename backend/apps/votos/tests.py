@@ -1,3 +1,570 @@
-from django.test import TestCase
+from datetime import timedelta
+import json
+from io import StringIO
+from unittest import mock
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.db import IntegrityError, connection
+from django.db.models import Sum
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.core.exceptions import ValidationError
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from apps.candidatos.models import Candidato, Partido
+from apps.core.models import Cargo, Region
+from apps.core.referencia import invalidar_referencias
+from apps.usuarios.models import Usuario
+from apps.usuarios.tokens import obtener_tokens
+from apps.votos import particiones, services, snapshots
+from apps.votos.models import ConteoCandidato, EstadoRollupVotos, Voto, VotosPorMinuto
+from apps.votos.stream import HubResultados
 
-# Create your tests here.
+
+def crear_eleccion():
+    """
+    Datos mínimos de una elección: dos regiones, los tres cargos, un partido,
+    un candidato por cargo (el diputado en Lima y otro en Cusco) y un votante
+    de Lima. Los conteos ya existen, como tras el primer voto.
+
+    Returns:
+        dict: regiones, cargos, candidatos (por nombre de cargo) y usuario
+    """
+    lima = Region.objects.create(nombre_region="Lima")
+    cusco = Region.objects.create(nombre_region="Cusco")
+    cargos = {
+        nombre: Cargo.objects.create(nombre_cargo=nombre)
+        for nombre in ("Presidente", "Senador", "Diputado")
+    }
+    partido = Partido.objects.create(nombre_partido="Partido de Prueba", sigla="PP")
+
+    def candidato(nombre, cargo, region):
+        return Candidato.objects.create(
+            nombre=nombre,
+            apellido_paterno="Pérez",
+            apellido_materno="Soto",
+            partido=partido,
+            cargo=cargos[cargo],
+            region=region,
+        )
+
+    candidatos = {
+        "Presidente": candidato("Ana", "Presidente", lima),
+        "Senador": candidato("Luis", "Senador", lima),
+        "Diputado": candidato("Rosa", "Diputado", lima),
+        "Diputado Cusco": candidato("Raúl", "Diputado", cusco),
+    }
+    ConteoCandidato.objects.bulk_create(
+        ConteoCandidato(candidato=c) for c in candidatos.values()
+    )
+    usuario = Usuario.objects.create_user(
+        dni="99999991",
+        nombre="María",
+        apellido_paterno="Quispe",
+        apellido_materno="Huamán",
+        region=lima,
+        password="clave-de-prueba-123",
+    )
+    return {
+        "regiones": {"Lima": lima, "Cusco": cusco},
+        "cargos": cargos,
+        "candidatos": candidatos,
+        "usuario": usuario,
+    }
+
+
+def cliente_con_token(usuario):
+    """APIClient autenticado con un access token de obtener_tokens (con claims)."""
+    cliente = APIClient()
+    cliente.credentials(HTTP_AUTHORIZATION=f"Bearer {obtener_tokens(usuario)['access']}")
+    return cliente
+
+
+class VotarConsultasTests(TestCase):
+    """
+    Consultas SQL del voto (el usuario sale del JWT, sin consulta). Los conteos
+    suman aparte los delimitadores de la transacción de emitir_voto, que en
+    tests son SAVEPOINT/RELEASE (más ROLLBACK TO si falla) y en producción
+    BEGIN/COMMIT.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.datos = crear_eleccion()
+
+    def setUp(self):
+        self.cliente = cliente_con_token(self.datos["usuario"])
+
+    def votar(self, candidato):
+        return self.cliente.post(
+            reverse("votar"), {"candidato_id": candidato.id}, format="json"
+        )
+
+    def test_voto_usa_tres_consultas(self):
+        presidente = self.datos["candidatos"]["Presidente"]
+
+        # SELECT candidato (con cargo), INSERT voto y UPDATE conteo
+        with self.assertNumQueries(3 + 2):
+            respuesta = self.votar(presidente)
+
+        self.assertEqual(respuesta.status_code, 201, respuesta.data)
+        self.assertEqual(ConteoCandidato.objects.get(candidato=presidente).total_votos, 1)
+
+    def test_doble_voto_usa_dos_consultas(self):
+        presidente = self.datos["candidatos"]["Presidente"]
+        self.votar(presidente)
+        self.votar(presidente)  # El primer rechazo busca (y memoriza) los índices de las particiones
+
+        # SELECT candidato y el INSERT que rechaza unique_voto_por_cargo
+        with self.assertNumQueries(2 + 3):
+            respuesta = self.votar(presidente)
+
+        self.assertEqual(respuesta.status_code, 400)
+        self.assertEqual(Voto.objects.filter(usuario=self.datos["usuario"]).count(), 1)
+        self.assertEqual(ConteoCandidato.objects.get(candidato=presidente).total_votos, 1)
+
+
+class EmitirVotoErroresTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.datos = crear_eleccion()
+
+    def setUp(self):
+        with connection.cursor() as cursor:
+            # Las FK son diferidas: que fallen en el INSERT, como al confirmar en producción
+            cursor.execute("SET CONSTRAINTS ALL IMMEDIATE")
+
+    def candidato_eliminado(self):
+        candidato = Candidato.objects.select_related("cargo").get(
+            pk=self.datos["candidatos"]["Presidente"].pk
+        )
+        candidato.pk = 987654321
+        return candidato
+
+    def test_doble_voto(self):
+        presidente = Candidato.objects.select_related("cargo").get(
+            pk=self.datos["candidatos"]["Presidente"].pk
+        )
+        services.emitir_voto(self.datos["usuario"], presidente)
+
+        with self.assertRaisesMessage(ValidationError, "Ya emitiste tu voto"):
+            services.emitir_voto(self.datos["usuario"], presidente)
+
+    def test_otra_violacion_no_se_reporta_como_doble_voto(self):
+        with self.assertRaises(IntegrityError):
+            services.emitir_voto(self.datos["usuario"], self.candidato_eliminado())
+
+    def test_lote_no_oculta_otras_violaciones(self):
+        candidato = self.candidato_eliminado()
+
+        with mock.patch.object(Candidato.objects, "select_related") as select_related:
+            select_related.return_value.in_bulk.return_value = {candidato.pk: candidato}
+            with self.assertRaises(IntegrityError):
+                services.emitir_votos_lote(self.datos["usuario"], [candidato.pk])
+
+
+class VotarDiputadoTests(TestCase):
+    """Voto con el usuario armado desde los claims de obtener_tokens."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.datos = crear_eleccion()
+
+    def setUp(self):
+        self.cliente = cliente_con_token(self.datos["usuario"])
+
+    def votar(self, candidato):
+        return self.cliente.post(
+            reverse("votar"), {"candidato_id": candidato.id}, format="json"
+        )
+
+    def test_diputado_de_su_region(self):
+        respuesta = self.votar(self.datos["candidatos"]["Diputado"])
+
+        self.assertEqual(respuesta.status_code, 201, respuesta.data)
+
+    def test_diputado_de_otra_region(self):
+        respuesta = self.votar(self.datos["candidatos"]["Diputado Cusco"])
+
+        self.assertEqual(respuesta.status_code, 400)
+        self.assertIn("Lima", respuesta.data["error"])
+
+
+class EstadoCedulaTests(TestCase):
+    """/api/votos/estado/ con el usuario armado desde los claims del token."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.datos = crear_eleccion()
+
+    def setUp(self):
+        cache.clear()
+        invalidar_referencias()
+        self.cliente = cliente_con_token(self.datos["usuario"])
+
+    def estado(self):
+        respuesta = self.cliente.get(reverse("estado_votacion"))
+        self.assertEqual(respuesta.status_code, 200)
+        return {cargo["cargo"]: cargo for cargo in respuesta.json()["cargos"]}
+
+    def test_elegibles_por_region_del_token(self):
+        estado = self.estado()
+
+        # De los dos diputados solo el de Lima, la región del votante
+        self.assertEqual(
+            {nombre: cargo["candidatos_elegibles"] for nombre, cargo in estado.items()},
+            {"Presidente": 1, "Senador": 1, "Diputado": 1},
+        )
+        self.assertTrue(all(cargo["puede_votar"] for cargo in estado.values()))
+
+    def test_refleja_el_voto_emitido(self):
+        diputado = self.datos["candidatos"]["Diputado"]
+        self.cliente.post(reverse("votar"), {"candidato_id": diputado.id}, format="json")
+
+        estado = self.estado()["Diputado"]
+
+        self.assertTrue(estado["ya_voto"])
+        self.assertFalse(estado["puede_votar"])
+        self.assertEqual(estado["voto"]["candidato_id"], diputado.id)
+
+
+class ResultadosSnapshotTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.datos = crear_eleccion()
+
+    def setUp(self):
+        cache.clear()
+        invalidar_referencias()
+
+    def test_region_inexistente_no_crea_snapshot(self):
+        locks = set(snapshots._locks)
+
+        respuesta = self.client.get(reverse("resultados_generales"), {"region": "987654"})
+
+        self.assertEqual(respuesta.status_code, 400)
+        self.assertEqual(set(snapshots._locks), locks)
+
+    def test_region_existente(self):
+        lima = self.datos["regiones"]["Lima"]
+
+        respuesta = self.client.get(
+            reverse("resultados_generales"), {"cargo": "Diputado", "region": str(lima.id)}
+        )
+
+        self.assertEqual(respuesta.status_code, 200)
+        self.assertEqual(
+            [c["id"] for c in respuesta.json()],
+            [self.datos["candidatos"]["Diputado"].id],
+        )
+
+    def test_exacta_se_sirve_desde_su_propio_snapshot(self):
+        with mock.patch.object(
+            snapshots, "calcular_resultados", wraps=snapshots.calcular_resultados
+        ) as calcular:
+            for _ in range(3):
+                respuesta = self.client.get(
+                    reverse("resultados_generales"), {"consistencia": "exacta"}
+                )
+                self.assertEqual(respuesta.status_code, 200)
+            self.client.get(reverse("resultados_generales"))
+
+        self.assertEqual(
+            [llamada.kwargs["exacto"] for llamada in calcular.call_args_list], [True, False]
+        )
+        self.assertIn("ETag", respuesta)
+
+    def test_lock_ajeno_no_se_borra(self):
+        clave_lock = f"{snapshots._clave(None, None)}:regenerando"
+        cache.add(clave_lock, 1, timeout=30)  # Otro proceso está regenerando
+
+        with mock.patch.object(snapshots.time, "sleep"):
+            snapshot = snapshots.obtener_snapshot_resultados()
+
+        self.assertTrue(snapshot.contenido)
+        self.assertEqual(cache.get(clave_lock), 1)
+
+
+class RollupVotosTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.datos = crear_eleccion()
+
+    def setUp(self):
+        cache.clear()
+        invalidar_referencias()
+
+    def crear_voto(self, cargo, creado):
+        voto = Voto(
+            usuario=self.datos["usuario"],
+            candidato=self.datos["candidatos"][cargo],
+            cargo=self.datos["cargos"][cargo],
+        )
+        voto.save(validar=False)
+        Voto.objects.filter(pk=voto.pk).update(created_at=creado)
+
+    def actualizar(self):
+        services.actualizar_rollup_votos()
+
+    def total_rollup(self):
+        return VotosPorMinuto.objects.aggregate(total=Sum("total"))["total"]
+
+    def test_estadisticas_y_ritmo_no_escriben(self):
+        self.crear_voto("Presidente", timezone.now())
+        ConteoCandidato.objects.filter(
+            candidato=self.datos["candidatos"]["Presidente"]
+        ).update(total_votos=1)
+
+        with CaptureQueriesContext(connection) as capturadas:
+            estadisticas = self.client.get(reverse("estadisticas"))
+            ritmo = self.client.get(reverse("ritmo_votacion"))
+
+        self.assertEqual((estadisticas.status_code, ritmo.status_code), (200, 200))
+        escrituras = [
+            q["sql"] for q in capturadas.captured_queries
+            if q["sql"].lstrip().split()[0].upper() in ("INSERT", "UPDATE", "DELETE")
+        ]
+        self.assertEqual(escrituras, [])
+        # Los totales salen de los conteos: correctos aunque el rollup esté vacío
+        self.assertEqual(estadisticas.json()["total_votos"], 1)
+        self.assertEqual(estadisticas.json()["votos_por_cargo"]["Presidente"], 1)
+        self.assertEqual(ritmo.json()["serie"], [])  # El rollup no se actualiza en el GET
+
+    def test_voto_que_confirma_tarde_se_cuenta(self):
+        ahora = timezone.now()
+        self.crear_voto("Presidente", ahora - timedelta(minutes=1))
+
+        # Una transacción abierta hace 10 minutos aún no confirma su voto
+        with mock.patch.object(
+            services, "_horizonte_rollup", return_value=ahora - timedelta(minutes=10)
+        ):
+            self.actualizar()
+        self.assertEqual(self.total_rollup(), 1)
+
+        # Confirma ahora, con el created_at de cuando empezó
+        self.crear_voto("Senador", ahora - timedelta(minutes=9))
+        self.actualizar()
+
+        self.assertEqual(self.total_rollup(), 2)
+        self.assertEqual(
+            VotosPorMinuto.objects.get(cargo=self.datos["cargos"]["Senador"]).total, 1
+        )
+
+    def test_horizonte_no_supera_el_momento_actual(self):
+        self.assertLessEqual(services._horizonte_rollup(), timezone.now())
+
+    def test_comando_una_vez(self):
+        self.crear_voto("Diputado", timezone.now())
+        salida = StringIO()
+
+        call_command("actualizar_rollup_votos", "--una-vez", stdout=salida)
+
+        self.assertIn("1 minutos actualizados", salida.getvalue())
+        self.assertEqual(self.total_rollup(), 1)
+        self.assertIsNotNone(EstadoRollupVotos.objects.get().horizonte)
+
+    def test_segunda_ejecucion_recuenta_solo_desde_el_horizonte(self):
+        self.crear_voto("Diputado", timezone.now())
+        call_command("actualizar_rollup_votos", "--una-vez", stdout=StringIO())
+        # Un voto viejo insertado por fuera: una recuenta completa lo vería
+        self.crear_voto("Senador", timezone.now() - timedelta(hours=3))
+
+        cache.clear()  # Otro proceso (cron, reinicio del worker): caché vacía
+        with CaptureQueriesContext(connection) as capturadas:
+            call_command("actualizar_rollup_votos", "--una-vez", stdout=StringIO())
+
+        self.assertEqual(self.total_rollup(), 1)
+        lectura = next(
+            q["sql"] for q in capturadas.captured_queries
+            if q["sql"].startswith("SELECT") and '"votos"' in q["sql"]
+        )
+        self.assertIn('"votos"."created_at" >=', lectura)
+
+    def test_sin_horizonte_parte_del_ultimo_minuto(self):
+        minuto = timezone.now().replace(second=0, microsecond=0) - timedelta(minutes=30)
+        VotosPorMinuto.objects.create(minuto=minuto, cargo=self.datos["cargos"]["Senador"], total=5)
+        self.crear_voto("Senador", minuto - timedelta(hours=3))  # Ya contado antes
+
+        self.actualizar()
+
+        self.assertEqual(self.total_rollup(), 5)
+
+
+def datos_sse(mensaje):
+    """Campo data de un evento SSE, decodificado."""
+    linea = next(l for l in mensaje.decode().splitlines() if l.startswith("data: "))
+    return json.loads(linea[len("data: "):])
+
+
+async def _sin_ciclo(hub):
+    pass
+
+
+class HubResultadosTests(TestCase):
+    """Difusión del hub SSE; cada test llama a _actualizar() en lugar del ciclo."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.datos = crear_eleccion()
+
+    def setUp(self):
+        parche = mock.patch.object(HubResultados, "_ciclo", _sin_ciclo)
+        parche.start()
+        self.addCleanup(parche.stop)
+        self.hub = HubResultados()
+
+    async def suscribir(self, cargo=None, region=None):
+        suscripcion, snapshot = await self.hub.suscribir(cargo, region)
+        return suscripcion, datos_sse(snapshot)
+
+    async def votos(self, cargo, total):
+        await ConteoCandidato.objects.filter(
+            candidato=self.datos["candidatos"][cargo]
+        ).aupdate(total_votos=total)
+
+    async def test_un_mensaje_compartido_por_todos_los_suscriptores(self):
+        (primera, snapshot), (segunda, _) = await self.suscribir(), await self.suscribir()
+        self.assertEqual(len(snapshot["candidatos"]), 4)
+
+        await self.votos("Presidente", 7)
+        await self.hub._actualizar()
+
+        mensaje = await primera.siguiente(timeout=1)
+        self.assertIs(await segunda.siguiente(timeout=1), mensaje)  # Serializado una vez
+        presidente = str(self.datos["candidatos"]["Presidente"].id)
+        self.assertEqual(datos_sse(mensaje)["candidatos"], {presidente: 7})
+
+    async def test_solo_los_topicos_afectados(self):
+        cusco = self.datos["regiones"]["Cusco"].id
+        diputados_cusco, snapshot = await self.suscribir("Diputado", cusco)
+        self.assertEqual(
+            list(snapshot["candidatos"]), [str(self.datos["candidatos"]["Diputado Cusco"].id)]
+        )
+
+        await self.votos("Diputado", 3)  # El de Lima
+        await self.hub._actualizar()
+
+        self.assertIsNone(await diputados_cusco.siguiente(timeout=0.01))
+
+    async def test_suscriptor_atrasado_recibe_los_cambios_acumulados(self):
+        atrasada, _ = await self.suscribir()
+
+        await self.votos("Presidente", 1)
+        await self.hub._actualizar()
+        await self.votos("Senador", 2)
+        await self.hub._actualizar()
+
+        datos = datos_sse(await atrasada.siguiente(timeout=1))
+        candidatos = self.datos["candidatos"]
+        self.assertEqual(datos["version"], self.hub.version)
+        self.assertEqual(
+            datos["candidatos"],
+            {str(candidatos["Presidente"].id): 1, str(candidatos["Senador"].id): 2},
+        )
+
+    async def test_candidato_desactivado_se_publica_como_baja(self):
+        senado, _ = await self.suscribir("Senador")
+        atrasada, _ = await self.suscribir()
+        senador = self.datos["candidatos"]["Senador"]
+
+        await Candidato.objects.filter(pk=senador.pk).aupdate(activo=False)
+        await self.hub._actualizar()
+
+        self.assertNotIn(senador.id, self.hub.totales)
+        self.assertEqual(
+            datos_sse(await senado.siguiente(timeout=1))["candidatos"], {str(senador.id): None}
+        )
+        await self.votos("Presidente", 4)
+        await self.hub._actualizar()
+        self.assertEqual(
+            datos_sse(await atrasada.siguiente(timeout=1))["candidatos"],
+            {str(senador.id): None, str(self.datos["candidatos"]["Presidente"].id): 4},
+        )
+
+    async def test_sin_suscriptores_libera_los_topicos(self):
+        suscripcion, _ = await self.suscribir("Presidente")
+
+        suscripcion.cerrar()
+
+        self.assertEqual(self.hub.suscriptores, 0)
+        self.assertEqual(self.hub._topicos, {})
+
+
+class ParticionesVotosTests(TestCase):
+    """Ruteo de votos a las particiones por cargo (la BD de tests solo trae votos_default)."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.datos = crear_eleccion()
+
+    def setUp(self):
+        if not particiones.esta_particionada():
+            self.skipTest("La tabla votos no está particionada (requiere PostgreSQL)")
+
+    def votar(self, cargo):
+        return Voto.objects.create(
+            usuario=self.datos["usuario"],
+            candidato=self.datos["candidatos"][cargo],
+            cargo=self.datos["cargos"][cargo],
+        )
+
+    def tabla_de(self, voto):
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT tableoid::regclass::text FROM votos WHERE id = %s", [voto.id])
+            return cursor.fetchone()[0]
+
+    def nombre(self, cargo):
+        return f"votos_cargo_{self.datos['cargos'][cargo].id}"
+
+    def test_crear_particiones_mueve_los_votos_de_default(self):
+        previo = self.votar("Presidente")
+        self.assertEqual(self.tabla_de(previo), particiones.DEFAULT)
+
+        creadas = particiones.crear_particiones()
+
+        self.assertEqual(
+            creadas, [self.nombre(c) for c in ("Presidente", "Senador", "Diputado")]
+        )
+        self.assertEqual(self.tabla_de(previo), self.nombre("Presidente"))
+        self.assertEqual(self.tabla_de(self.votar("Senador")), self.nombre("Senador"))
+        self.assertEqual(particiones.crear_particiones(), [])
+
+    def test_consulta_por_cargo_lee_solo_su_particion(self):
+        particiones.crear_particiones()
+        cargo = self.datos["cargos"]["Diputado"]
+
+        plan = Voto.objects.filter(cargo=cargo).explain()
+
+        self.assertIn(self.nombre("Diputado"), plan)
+        self.assertNotIn(self.nombre("Presidente"), plan)
+        self.assertNotIn(particiones.DEFAULT, plan)
+
+    def test_archivar_libera_el_cargo(self):
+        particiones.crear_particiones()
+        self.votar("Presidente")
+        with connection.cursor() as cursor:
+            # Las FK diferidas del voto se verifican ya, como al confirmar en producción
+            cursor.execute("SET CONSTRAINTS ALL IMMEDIATE")
+
+        archivada = particiones.archivar_particion(self.datos["cargos"]["Presidente"].id)
+
+        self.assertFalse(Voto.objects.filter(cargo=self.datos["cargos"]["Presidente"]).exists())
+        with connection.cursor() as cursor:
+            cursor.execute(f"SELECT COUNT(*) FROM {archivada}")
+            self.assertEqual(cursor.fetchone()[0], 1)
+        self.assertEqual(self.tabla_de(self.votar("Presidente")), self.nombre("Presidente"))
+
+
+@override_settings(DEBUG=False)
+class BenchmarkConteosTests(SimpleTestCase):
+    def test_sin_confirmar_no_se_ejecuta(self):
+        with self.assertRaisesMessage(CommandError, "--confirmar"):
+            call_command("benchmark_conteos", stdout=StringIO())
+
+
+@override_settings(DEBUG=False)
+class BenchmarkStreamTests(SimpleTestCase):
+    def test_incrementos_sin_confirmar_no_se_ejecuta(self):
+        with self.assertRaisesMessage(CommandError, "--confirmar"):
+            call_command("benchmark_stream", "--incrementos", "5", stdout=StringIO())
@@ -1,10 +1,17 @@
 from django.urls import path
-from apps.votos import views
+from apps.votos import async_views, views
 
 urlpatterns = [
     # Votar
     path("votar/", views.votar, name="votar"),
+    path("votar-lote/", views.votar_lote, name="votar_lote"),
+    path(
+        "cola/<int:ticket>/",
+        views.estado_voto_pendiente,
+        name="estado_voto_pendiente",
+    ),
     path("mis-votos/", views.mis_votos, name="mis_votos"),
+    path("estado/", views.estado_votacion, name="estado_votacion"),
     path(
         "puede-votar/<str:cargo_nombre>/",
         views.puede_votar_cargo,
@@ -17,5 +24,11 @@ urlpatterns = [
         views.resultados_por_partido,
         name="resultados_por_partido",
     ),
+    path(
+        "resultados/stream/",
+        async_views.resultados_stream,
+        name="resultados_stream",
+    ),
     path("estadisticas/", views.estadisticas, name="estadisticas"),
+    path("ritmo/", views.ritmo_votacion, name="ritmo_votacion"),
 ]
@@ -2,12 +2,30 @@ from rest_framework import status, generics
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, AllowAny
-from django.db.models import Count, Q
+from django.db.models import Q, Sum
+from django.db.models.functions import Coalesce
+from django.conf import settings
 from django.core.exceptions import ValidationError
-from apps.votos.models import Voto
-from apps.votos.serializers import VotarSerializer, MiVotoSerializer
-from apps.candidatos.models import Candidato
-from apps.core.models import Cargo, Region
+from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from apps.votos.models import Voto, VotoPendiente
+from apps.votos.serializers import (
+    VotarSerializer,
+    VotarLoteSerializer,
+    VotoEmitidoSerializer,
+    VotoPendienteSerializer,
+    MiVotoSerializer,
+)
+from apps.votos.services import (
+    RITMO_INTERVALOS,
+    calcular_estadisticas,
+    calcular_ritmo_votacion,
+    obtener_estado_cedula,
+)
+from apps.votos.snapshots import obtener_snapshot_resultados, responder_snapshot
+from apps.core.models import Cargo
+from apps.core.referencia import CARGOS, REGIONES
+from apps.core.replicas import lectura_replica
 
 
 @api_view(["POST"])
@@ -24,17 +42,34 @@ def votar(request):
     - Usuario debe ser votante (no invitado)
     - No puede votar dos veces por el mismo cargo
     - Para Diputados: solo puede votar por candidatos de su región
+
+    Response: {"message": "...", "voto": {"id", "candidato_id", "cargo", "created_at"}}
+
+    Con VOTOS_INGESTA = "asincrona" el voto se valida y se encola:
+    Response 202: {"message": "...", "ticket": 12, "estado_url": "/api/votos/cola/12/"}
     """
     serializer = VotarSerializer(data=request.data, context={"request": request})
 
     try:
         serializer.is_valid(raise_exception=True)
+
+        if settings.VOTOS_INGESTA == "asincrona":
+            pendiente = serializer.encolar()
+            return Response(
+                {
+                    "message": "Voto recibido, se registrará en unos segundos",
+                    "ticket": pendiente.id,
+                    "estado_url": reverse("estado_voto_pendiente", args=[pendiente.id]),
+                },
+                status=status.HTTP_202_ACCEPTED,
+            )
+
         voto = serializer.save()
 
         return Response(
             {
                 "message": "Voto registrado exitosamente",
-                "voto": MiVotoSerializer(voto).data,
+                "voto": VotoEmitidoSerializer(voto).data,
             },
             status=status.HTTP_201_CREATED,
         )
@@ -47,6 +82,74 @@ def votar(request):
         )
 
 
+@api_view(["POST"])
+@permission_classes([IsAuthenticated])
+def votar_lote(request):
+    """
+    POST /api/votos/votar-lote/
+    Emite los votos de toda la cédula en una sola petición
+    (útil para clientes que encolan votos sin conexión).
+
+    Body: {"candidato_ids": [3, 27, 58]}
+    Headers: Authorization: Bearer <access_token>
+
+    Response: {
+        "message": "...",
+        "resultados": [
+            {"candidato_id": 3, "ok": true, "voto": {...}, "error": null},
+            {"candidato_id": 27, "ok": false, "voto": null, "error": "Ya emitiste..."}
+        ]
+    }
+    Devuelve 201 si se registró al menos un voto, 400 si ninguno.
+    """
+    serializer = VotarLoteSerializer(data=request.data, context={"request": request})
+    serializer.is_valid(raise_exception=True)
+    resultados = serializer.save()
+
+    registrados = 0
+    respuesta = []
+    for resultado in resultados:
+        voto = resultado["voto"]
+        registrados += voto is not None
+        respuesta.append(
+            {
+                "candidato_id": resultado["candidato_id"],
+                "ok": voto is not None,
+                "voto": VotoEmitidoSerializer(voto).data if voto else None,
+                "error": resultado["error"],
+            }
+        )
+
+    return Response(
+        {
+            "message": f"{registrados} de {len(resultados)} votos registrados",
+            "resultados": respuesta,
+        },
+        status=status.HTTP_201_CREATED if registrados else status.HTTP_400_BAD_REQUEST,
+    )
+
+
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+def estado_voto_pendiente(request, ticket):
+    """
+    GET /api/votos/cola/{ticket}/
+    Estado de un voto enviado en modo asíncrono.
+
+    Response: {
+        "ticket": 12,
+        "candidato_id": 5,
+        "estado": "pendiente" | "registrado" | "rechazado",
+        "error": "",
+        "voto_id": 345,
+        "created_at": "..."
+    }
+    """
+    pendiente = get_object_or_404(VotoPendiente, id=ticket, usuario=request.user)
+    return Response(VotoPendienteSerializer(pendiente).data)
+
+
+@lectura_replica
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
 def mis_votos(request):
@@ -55,12 +158,40 @@ def mis_votos(request):
     Lista todos los votos que ha emitido el usuario autenticado.
     """
     votos = Voto.objects.filter(usuario=request.user).select_related(
-        "candidato", "cargo", "candidato__partido"
+        "cargo",
+        "candidato__partido",
+        "candidato__cargo",
+        "candidato__region",
     )
     serializer = MiVotoSerializer(votos, many=True)
     return Response(serializer.data)
 
 
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+def estado_votacion(request):
+    """
+    GET /api/votos/estado/
+    Estado de la cédula del usuario para todos los cargos en una sola llamada
+    (reemplaza las tres llamadas a puede-votar/).
+
+    Response: {
+        "cargos": [
+            {
+                "cargo": "Presidente",
+                "cargo_id": 1,
+                "puede_votar": false,
+                "ya_voto": true,
+                "voto": {"candidato_id": 3, "candidato": "Rafael López Aliaga", "created_at": "..."},
+                "candidatos_elegibles": 10
+            },
+            ...
+        ]
+    }
+    """
+    return Response({"cargos": obtener_estado_cedula(request.user)})
+
+
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
 def puede_votar_cargo(request, cargo_nombre):
@@ -75,9 +206,8 @@ def puede_votar_cargo(request, cargo_nombre):
         "ya_voto": true/false
     }
     """
-    try:
-        cargo = Cargo.objects.get(nombre_cargo=cargo_nombre)
-    except Cargo.DoesNotExist:
+    cargo = CARGOS.por_nombre(cargo_nombre)
+    if cargo is None:
         return Response(
             {"error": "Cargo no válido"}, status=status.HTTP_400_BAD_REQUEST
         )
@@ -89,6 +219,7 @@ def puede_votar_cargo(request, cargo_nombre):
     )
 
 
+@lectura_replica
 @api_view(["GET"])
 @permission_classes([AllowAny])  # Cualquiera puede ver resultados
 def resultados_generales(request):
@@ -99,56 +230,51 @@ def resultados_generales(request):
     Query params:
     - cargo: Filtrar por cargo específico
     - region: Filtrar por región (solo para Diputados)
+    - consistencia: 'eventual' (por defecto) lee solo el conteo consolidado;
+      'exacta' suma además los shards pendientes de consolidar
 
     Response: Lista de candidatos con su conteo de votos ordenados de mayor a menor.
+
+    Ambas se sirven desde un snapshot compartido por todos los clientes, con
+    ETag/Last-Modified (responde 304 si no cambió): la eventual se regenera como
+    máximo cada RESULTADOS_SNAPSHOT_SEGUNDOS y la exacta cada
+    RESULTADOS_EXACTA_SEGUNDOS.
     """
-    queryset = (
-        Candidato.objects.filter(activo=True)
-        .select_related("partido", "cargo", "region")
-        .annotate(total_votos=Count("votos_recibidos"))
-    )
+    consistencia = request.query_params.get("consistencia", "eventual")
+    if consistencia not in ("eventual", "exacta"):
+        return Response(
+            {"error": "consistencia debe ser 'eventual' o 'exacta'"},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
 
-    # Filtros opcionales
     cargo = request.query_params.get("cargo", None)
-    if cargo:
-        queryset = queryset.filter(cargo__nombre_cargo=cargo)
-
     region = request.query_params.get("region", None)
-    if region:
-        queryset = queryset.filter(region_id=region)
 
-    # Ordenar por número de votos (descendente)
-    queryset = queryset.order_by("-total_votos", "apellido_paterno")
-
-    # Serializar resultados
-    resultados = []
-    for candidato in queryset:
-        resultados.append(
-            {
-                "id": candidato.id,
-                "nombre_completo": candidato.get_full_name(),
-                "partido": {
-                    "sigla": candidato.partido.sigla,
-                    "nombre": candidato.partido.nombre_partido,
-                    "logo_url": candidato.partido.logo_url,
-                },
-                "cargo": candidato.cargo.nombre_cargo,
-                "region": candidato.region.nombre_region if candidato.region else None,
-                "total_votos": candidato.total_votos,
-                "foto_url": candidato.foto_url,
-            }
+    # Validar filtros: cada combinación es una clave de caché
+    if cargo and cargo not in dict(Cargo.CARGO_CHOICES):
+        return Response(
+            {"error": "Cargo no válido"}, status=status.HTTP_400_BAD_REQUEST
+        )
+    # Solo regiones existentes: así las claves de caché (y sus locks) son finitas
+    if region and not (region.isdigit() and REGIONES.por_id(int(region))):
+        return Response(
+            {"error": "Región no válida"}, status=status.HTTP_400_BAD_REQUEST
         )
+    region = int(region) if region else None
 
-    return Response(resultados)
+    # Snapshot JSON precalculado: una sola consulta por clave y vigencia
+    snapshot = obtener_snapshot_resultados(cargo, region, exacto=consistencia == "exacta")
+    return responder_snapshot(request, snapshot)
 
 
+@lectura_replica
 @api_view(["GET"])
 @permission_classes([AllowAny])
 def resultados_por_partido(request):
     """
     GET /api/votos/resultados/por-partido/
     Resultados agrupados por partido político.
-    Suma todos los votos de candidatos del mismo partido.
+    Suma los conteos materializados de los candidatos del mismo partido.
 
     Query param:
     - cargo: Filtrar por cargo específico
@@ -160,10 +286,13 @@ def resultados_por_partido(request):
     partidos = (
         Partido.objects.filter(activo=True)
         .annotate(
-            total_votos=Count(
-                "candidatos__votos_recibidos",
-                filter=Q(candidatos__activo=True)
-                & (Q(candidatos__cargo__nombre_cargo=cargo) if cargo else Q()),
+            total_votos=Coalesce(
+                Sum(
+                    "candidatos__conteo__total_votos",
+                    filter=Q(candidatos__activo=True)
+                    & (Q(candidatos__cargo__nombre_cargo=cargo) if cargo else Q()),
+                ),
+                0,
             )
         )
         .order_by("-total_votos")
@@ -185,12 +314,13 @@ def resultados_por_partido(request):
     return Response(resultados)
 
 
+@lectura_replica
 @api_view(["GET"])
 @permission_classes([AllowAny])
 def estadisticas(request):
     """
     GET /api/votos/estadisticas/
-    Estadísticas generales del sistema.
+    Estadísticas generales del sistema (cacheadas, ver calcular_estadisticas).
 
     Response: {
         "total_votos": 1234,
@@ -199,22 +329,30 @@ def estadisticas(request):
         "total_candidatos": 100
     }
     """
-    from apps.usuarios.models import Usuario
+    return Response(calcular_estadisticas())
 
-    total_votos = Voto.objects.count()
-    total_votantes = Usuario.objects.filter(rol="votante").count()
-    total_candidatos = Candidato.objects.filter(activo=True).count()
 
-    # Votos por cargo
-    votos_por_cargo = {}
-    for cargo in Cargo.objects.all():
-        votos_por_cargo[cargo.nombre_cargo] = Voto.objects.filter(cargo=cargo).count()
+@lectura_replica
+@api_view(["GET"])
+@permission_classes([AllowAny])
+def ritmo_votacion(request):
+    """
+    GET /api/votos/ritmo/?intervalo=minuto
+    Votos por minuto (última hora) o por hora (últimas 24 horas).
 
-    return Response(
-        {
-            "total_votos": total_votos,
-            "total_votantes": total_votantes,
-            "total_candidatos": total_candidatos,
-            "votos_por_cargo": votos_por_cargo,
-        }
-    )
+    Query params:
+    - intervalo: "minuto" (por defecto) u "hora"
+
+    Response: {
+        "intervalo": "minuto",
+        "serie": [{"inicio": "...", "total": 12, "por_cargo": {"Presidente": 7, ...}}]
+    }
+    """
+    intervalo = request.query_params.get("intervalo", "minuto")
+    if intervalo not in RITMO_INTERVALOS:
+        return Response(
+            {"error": f"intervalo debe ser uno de: {', '.join(RITMO_INTERVALOS)}"},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+    return Response({"intervalo": intervalo, "serie": calcular_ritmo_votacion(intervalo)})
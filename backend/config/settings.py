@@ -1,6 +1,7 @@
 from pathlib import Path
 from datetime import timedelta
-from decouple import config  # type: ignore
+from decouple import Csv, config  # type: ignore
+from django.core.exceptions import ImproperlyConfigured
 
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -22,6 +23,7 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",  # Búsqueda full-text y trigramas
     # Third party apps
     "rest_framework",
     "rest_framework_simplejwt",
@@ -35,6 +37,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "apps.core.middleware.InstrumentacionMiddleware",  # Primero: mide la petición completa
+    "apps.core.middleware.ReplicaMiddleware",  # Solo con DB_REPLICAS
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "corsheaders.middleware.CorsMiddleware",  # CORS debe estar antes de CommonMiddleware
@@ -77,6 +81,63 @@ DATABASES = {
     }
 }
 
+# Conexiones a PostgreSQL: DB_CONEXIONES = persistente | pool | pgbouncer | directa
+# - persistente: cada hilo reutiliza su conexión hasta DB_CONN_MAX_AGE segundos.
+# - pool: pool de psycopg3 compartido por los hilos del proceso (DB_POOL_*).
+#   Recomendado con ASGI, donde las vistas sync corren en hilos que van cambiando.
+# - pgbouncer: conexiones persistentes hacia PgBouncer en modo transaction, que
+#   no admite cursores del lado del servidor entre transacciones.
+# - directa: una conexión nueva por petición (lo que hace Django sin configurar).
+# DB_CONN_HEALTH_CHECKS verifica la conexión reutilizada (o tomada del pool) antes
+# de usarla, a costa de una consulta mínima por petición.
+# Medir con: python manage.py benchmark_conexiones
+DB_CONEXIONES = config("DB_CONEXIONES", default="persistente")
+DB_CONN_MAX_AGE = config("DB_CONN_MAX_AGE", default=60, cast=int)
+DB_POOL = {
+    "min_size": config("DB_POOL_MIN", default=2, cast=int),
+    "max_size": config("DB_POOL_MAX", default=20, cast=int),
+    # Segundos esperando una conexión libre antes de fallar (PoolTimeout)
+    "timeout": config("DB_POOL_TIMEOUT", default=10, cast=float),
+}
+DATABASES["default"]["CONN_HEALTH_CHECKS"] = config(
+    "DB_CONN_HEALTH_CHECKS", default=True, cast=bool
+)
+if DB_CONEXIONES in ("persistente", "pgbouncer"):
+    DATABASES["default"]["CONN_MAX_AGE"] = DB_CONN_MAX_AGE
+    DATABASES["default"]["DISABLE_SERVER_SIDE_CURSORS"] = DB_CONEXIONES == "pgbouncer"
+elif DB_CONEXIONES == "pool":
+    # Django exige CONN_MAX_AGE = 0 con pool: close() devuelve la conexión al pool
+    DATABASES["default"]["OPTIONS"] = {"pool": DB_POOL}
+elif DB_CONEXIONES != "directa":
+    raise ImproperlyConfigured(
+        "DB_CONEXIONES debe ser persistente, pool, pgbouncer o directa"
+    )
+
+# Réplicas de lectura: DB_REPLICAS=host1:5432,host2:5432 (misma BD, usuario y
+# contraseña que la primaria). Solo leen de ellas las vistas marcadas con
+# lectura_replica (resultados, estadísticas, candidatos, partidos, mis_votos);
+# ver apps.core.replicas. Sin réplicas todo va a "default".
+# - DB_REPLICA_MAX_RETRASO_SEGUNDOS: una réplica más atrasada deja de usarse.
+# - DB_REPLICA_VERIFICAR_SEGUNDOS: cada cuánto mide el retraso cada proceso.
+# - DB_REPLICA_PRIMARIA_SEGUNDOS: tras escribir (p. ej. votar), el usuario lee
+#   de la primaria este tiempo. Debe superar retraso máximo + verificación.
+DATABASE_REPLICAS = []
+for _numero, _servidor in enumerate(config("DB_REPLICAS", default="", cast=Csv()), 1):
+    _host, _, _puerto = _servidor.partition(":")
+    DATABASES[f"replica{_numero}"] = {
+        **DATABASES["default"],
+        "HOST": _host,
+        "PORT": _puerto or DATABASES["default"]["PORT"],
+        "TEST": {"MIRROR": "default"},  # En tests la réplica es la misma BD
+    }
+    DATABASE_REPLICAS.append(f"replica{_numero}")
+DATABASE_ROUTERS = ["apps.core.replicas.ReplicaRouter"]
+DB_REPLICA_MAX_RETRASO_SEGUNDOS = config(
+    "DB_REPLICA_MAX_RETRASO_SEGUNDOS", default=2, cast=float
+)
+DB_REPLICA_VERIFICAR_SEGUNDOS = config("DB_REPLICA_VERIFICAR_SEGUNDOS", default=5, cast=float)
+DB_REPLICA_PRIMARIA_SEGUNDOS = config("DB_REPLICA_PRIMARIA_SEGUNDOS", default=10, cast=int)
+
 
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
@@ -94,6 +155,33 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# Hash de contraseñas
+# PASSWORD_HASHER elige el algoritmo para contraseñas nuevas: pbkdf2 | argon2 | scrypt.
+# Los demás se mantienen para verificar hashes existentes, que se re-hashean con
+# el algoritmo y costo actuales en el siguiente login correcto.
+# Medir con: python manage.py benchmark_hashers
+_HASHERS = {
+    "pbkdf2": "apps.usuarios.hashers.PBKDF2AjustadoHasher",
+    "argon2": "apps.usuarios.hashers.Argon2AjustadoHasher",
+    "scrypt": "apps.usuarios.hashers.ScryptAjustadoHasher",
+}
+PASSWORD_HASHER = config("PASSWORD_HASHER", default="pbkdf2")
+if PASSWORD_HASHER not in _HASHERS:
+    raise ImproperlyConfigured("PASSWORD_HASHER debe ser pbkdf2, argon2 o scrypt")
+PASSWORD_HASHERS = [_HASHERS[PASSWORD_HASHER]] + [
+    ruta for nombre, ruta in _HASHERS.items() if nombre != PASSWORD_HASHER
+]
+PASSWORD_PBKDF2_ITERACIONES = config(
+    "PASSWORD_PBKDF2_ITERACIONES", default=1_000_000, cast=int
+)  # Valor por defecto de Django 5.2
+# Argon2id y scrypt: parámetros mínimos recomendados por OWASP
+PASSWORD_ARGON2_TIEMPO = config("PASSWORD_ARGON2_TIEMPO", default=2, cast=int)
+PASSWORD_ARGON2_MEMORIA_KIB = config("PASSWORD_ARGON2_MEMORIA_KIB", default=19456, cast=int)
+PASSWORD_ARGON2_PARALELISMO = config("PASSWORD_ARGON2_PARALELISMO", default=1, cast=int)
+PASSWORD_SCRYPT_N = config("PASSWORD_SCRYPT_N", default=2**14, cast=int)
+PASSWORD_SCRYPT_R = config("PASSWORD_SCRYPT_R", default=8, cast=int)
+PASSWORD_SCRYPT_P = config("PASSWORD_SCRYPT_P", default=1, cast=int)
+
 # Internationalization
 LANGUAGE_CODE = "es-pe"
 TIME_ZONE = "America/Lima"
@@ -106,7 +194,8 @@ STATIC_URL = "static/"
 # REST Framework Configuration
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework_simplejwt.authentication.JWTAuthentication",  # JWT como auth principal
+        # JWT como auth principal; arma el usuario con los claims del token, sin consultar la BD
+        "apps.usuarios.authentication.JWTSinConsultaAuthentication",
     ],
     "DEFAULT_PERMISSION_CLASSES": [
         "rest_framework.permissions.IsAuthenticatedOrReadOnly",  # Permite ver sin auth, pero votar requiere login
@@ -122,12 +211,27 @@ SIMPLE_JWT = {
     "ROTATE_REFRESH_TOKENS": True,  # Genera nuevo refresh token al renovar
     "BLACKLIST_AFTER_ROTATION": False,
     "AUTH_HEADER_TYPES": ("Bearer",),  # Formato: Authorization: Bearer <token>
+    # Al renovar relee al usuario: claims actualizados y sin renovar a inactivos
+    "TOKEN_REFRESH_SERIALIZER": "apps.usuarios.serializers.RefreshVotanteSerializer",
 }
 
 # CORS Configuration (permite peticiones desde tu app móvil)
 CORS_ALLOW_ALL_ORIGINS = True  # En producción, especifica solo tus dominios
 CORS_ALLOW_CREDENTIALS = True
 
+# Cache (por defecto en memoria del proceso; en producción usar Redis o Memcached
+# para compartir snapshots entre procesos, p. ej.
+# CACHE_BACKEND=django.core.cache.backends.redis.RedisCache
+# CACHE_LOCATION=redis://127.0.0.1:6379/1)
+CACHES = {
+    "default": {
+        "BACKEND": config(
+            "CACHE_BACKEND", default="django.core.cache.backends.locmem.LocMemCache"
+        ),
+        "LOCATION": config("CACHE_LOCATION", default="vota-informado"),
+    }
+}
+
 # Default primary key field type
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
@@ -136,6 +240,67 @@ RENIEC_API_URL = config(
     "RENIEC_API_URL", default="https://api.decolecta.com/v1/reniec/dni"
 )
 RENIEC_API_TOKEN = config("RENIEC_API_TOKEN", default="")  # Si la API requiere token
+# Cliente HTTP de RENIEC: timeouts (segundos), reintentos de conexión/5xx y pool
+RENIEC_TIMEOUT_CONEXION = config("RENIEC_TIMEOUT_CONEXION", default=3, cast=float)
+RENIEC_TIMEOUT_LECTURA = config("RENIEC_TIMEOUT_LECTURA", default=5, cast=float)
+RENIEC_REINTENTOS = config("RENIEC_REINTENTOS", default=2, cast=int)
+RENIEC_BACKOFF_SEGUNDOS = config("RENIEC_BACKOFF_SEGUNDOS", default=0.2, cast=float)
+RENIEC_POOL_CONEXIONES = config("RENIEC_POOL_CONEXIONES", default=10, cast=int)
+# Conexiones simultáneas a RENIEC por event loop en las vistas async
+RENIEC_POOL_CONEXIONES_ASYNC = config("RENIEC_POOL_CONEXIONES_ASYNC", default=200, cast=int)
+# Circuit breaker: tras N fallos seguidos responde 503 sin llamar a RENIEC
+# durante S segundos; luego deja pasar una consulta de prueba
+RENIEC_CIRCUITO_FALLOS = config("RENIEC_CIRCUITO_FALLOS", default=5, cast=int)
+RENIEC_CIRCUITO_SEGUNDOS = config("RENIEC_CIRCUITO_SEGUNDOS", default=30, cast=int)
+# Caché de consultas a RENIEC (0 = no guardar)
+RENIEC_CACHE_SEGUNDOS = config("RENIEC_CACHE_SEGUNDOS", default=86400, cast=int)
+# DNI inexistentes: menos tiempo, por si RENIEC lo registra después
+RENIEC_CACHE_NEGATIVO_SEGUNDOS = config(
+    "RENIEC_CACHE_NEGATIVO_SEGUNDOS", default=300, cast=int
+)
 
 # Custom user model
-AUTH_USER_MODEL = "usuarios.Usuario"
\ No newline at end of file
+AUTH_USER_MODEL = "usuarios.Usuario"
+
+# Conteo de votos
+# 0 = cada voto actualiza directamente el conteo del candidato (exacto).
+# N > 0 = los votos se reparten en N shards por candidato y el comando
+# consolidar_conteos los pasa al conteo autoritativo (evita filas calientes).
+VOTOS_CONTEO_SHARDS = config("VOTOS_CONTEO_SHARDS", default=0, cast=int)
+
+# Ingesta de votos
+# "sincrona" = votar inserta el voto en la misma petición (201).
+# "asincrona" = votar valida y encola (202); procesar_cola_votos inserta por lotes.
+VOTOS_INGESTA = config("VOTOS_INGESTA", default="sincrona")
+if VOTOS_INGESTA not in ("sincrona", "asincrona"):
+    raise ImproperlyConfigured("VOTOS_INGESTA debe ser sincrona o asincrona")
+
+# Snapshots de resultados: segundos máximos entre regeneraciones de /api/votos/resultados/
+RESULTADOS_SNAPSHOT_SEGUNDOS = config("RESULTADOS_SNAPSHOT_SEGUNDOS", default=2, cast=int)
+# Idem para ?consistencia=exacta (suma los shards): más corto, pero con el mismo single-flight
+RESULTADOS_EXACTA_SEGUNDOS = config("RESULTADOS_EXACTA_SEGUNDOS", default=1, cast=int)
+
+# Stream SSE de resultados: segundos entre lecturas del conteo (un mensaje por tópico y tick)
+RESULTADOS_STREAM_SEGUNDOS = config("RESULTADOS_STREAM_SEGUNDOS", default=1, cast=float)
+
+# Caché de /api/votos/estadisticas/ y /api/votos/ritmo/ (se recalculan desde el rollup por minuto)
+ESTADISTICAS_CACHE_SEGUNDOS = config("ESTADISTICAS_CACHE_SEGUNDOS", default=10, cast=int)
+
+# Instrumentación por vista (apps.core.middleware, exportada en /api/metricas/)
+# MUESTREO: fracción de peticiones con medición de SQL (0 = solo latencia).
+# MAX_MS / MAX_CONSULTAS: sobre estos límites se registra un warning; el de
+# consultas se reemplaza por el presupuesto_consultas de la vista si lo declara.
+INSTRUMENTACION_MUESTREO = config("INSTRUMENTACION_MUESTREO", default=0.1, cast=float)
+INSTRUMENTACION_MAX_MS = config("INSTRUMENTACION_MAX_MS", default=500, cast=int)
+INSTRUMENTACION_MAX_CONSULTAS = config("INSTRUMENTACION_MAX_CONSULTAS", default=20, cast=int)
+# Token para /api/metricas/ (vacío = solo accesible con DEBUG=True)
+METRICAS_TOKEN = config("METRICAS_TOKEN", default="")
+
+# Tablas de referencia en memoria (regiones, cargos, partidos): cada cuántos segundos
+# se revisa el sello de versión en la caché compartida (ver apps.core.referencia)
+REFERENCIA_VERIFICAR_SEGUNDOS = config("REFERENCIA_VERIFICAR_SEGUNDOS", default=5, cast=int)
+
+# Caché del detalle de candidato (se invalida por señales al editar candidato/partido/antecedentes)
+CANDIDATO_DETALLE_CACHE_SEGUNDOS = config(
+    "CANDIDATO_DETALLE_CACHE_SEGUNDOS", default=3600, cast=int
+)
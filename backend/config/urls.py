@@ -1,5 +1,6 @@
 from django.contrib import admin
 from django.urls import path, include
+from apps.core import views as core_views
 
 urlpatterns = [
     path("admin/", admin.site.urls),
@@ -7,4 +8,6 @@ urlpatterns = [
     path("api/usuarios/", include("apps.usuarios.urls")),
     path("api/candidatos/", include("apps.candidatos.urls")),
     path("api/votos/", include("apps.votos.urls")),
+    # Métricas internas (Prometheus)
+    path("api/metricas/", core_views.metricas, name="metricas"),
 ]
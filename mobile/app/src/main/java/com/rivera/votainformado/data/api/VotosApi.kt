@@ -3,10 +3,13 @@ package com.rivera.votainformado.data.api
 import com.rivera.votainformado.data.model.votos.Voto
 import com.rivera.votainformado.data.model.votos.VotoRequest
 import com.rivera.votainformado.data.model.votos.VotoResponse
+import com.rivera.votainformado.data.model.votos.VotoLoteRequest
+import com.rivera.votainformado.data.model.votos.VotoLoteResponse
 import com.rivera.votainformado.data.model.votos.ResultadoGeneral
 import com.rivera.votainformado.data.model.votos.ResultadoPorPartido
 import com.rivera.votainformado.data.model.votos.Estadisticas
 import com.rivera.votainformado.data.model.votos.PuedeVotarResponse
+import com.rivera.votainformado.data.model.votos.EstadoCedulaResponse
 import retrofit2.Response
 import retrofit2.http.Body
 import retrofit2.http.GET
@@ -25,6 +28,17 @@ interface VotosApi {
         @Body request: VotoRequest
     ): Response<VotoResponse>
     
+    /**
+     * POST /api/votos/votar-lote/
+     * Emite todos los votos de la cédula en una sola petición.
+     * Permite encolar votos sin conexión y enviarlos juntos.
+     * Requiere autenticación (JWT token)
+     */
+    @POST("votos/votar-lote/")
+    suspend fun votarLote(
+        @Body request: VotoLoteRequest
+    ): Response<VotoLoteResponse>
+    
     /**
      * GET /api/votos/mis-votos/
      * Lista todos los votos que ha emitido el usuario autenticado.
@@ -33,6 +47,14 @@ interface VotosApi {
     @GET("votos/mis-votos/")
     suspend fun getMisVotos(): Response<List<Voto>>
     
+    /**
+     * GET /api/votos/estado/
+     * Estado de la cédula para todos los cargos (ya votó, por quién, candidatos elegibles).
+     * Requiere autenticación (JWT token)
+     */
+    @GET("votos/estado/")
+    suspend fun getEstado(): Response<EstadoCedulaResponse>
+    
     /**
      * GET /api/votos/puede-votar/{cargo_nombre}/
      * Verifica si el usuario ya votó por un cargo específico.
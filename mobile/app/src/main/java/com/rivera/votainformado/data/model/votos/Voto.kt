@@ -31,11 +31,12 @@ data class VotoRequest(
 )
 
 /**
- * Detalle del voto en la respuesta
+ * Detalle compacto del voto en la respuesta
  */
 data class VotoDetalle(
     val id: Int,
-    val candidato: CandidatoItem,
+    @SerializedName("candidato_id")
+    val candidatoId: Int,
     @SerializedName("cargo")
     val cargo: String,
     @SerializedName("created_at")
@@ -50,6 +51,34 @@ data class VotoResponse(
     val voto: VotoDetalle
 )
 
+/**
+ * Request para emitir todos los votos de la cédula
+ * Body: {"candidato_ids": [3, 27, 58]}
+ */
+data class VotoLoteRequest(
+    @SerializedName("candidato_ids")
+    val candidatoIds: List<Int>
+)
+
+/**
+ * Resultado individual de cada voto del lote
+ */
+data class VotoLoteResultado(
+    @SerializedName("candidato_id")
+    val candidatoId: Int,
+    val ok: Boolean,
+    val voto: VotoDetalle?,
+    val error: String?
+)
+
+/**
+ * Response después de emitir un lote de votos
+ */
+data class VotoLoteResponse(
+    val message: String,
+    val resultados: List<VotoLoteResultado>
+)
+
 /**
  * Response para verificar si puede votar
  */
@@ -60,6 +89,37 @@ data class PuedeVotarResponse(
     val yaVoto: Boolean
 )
 
+/**
+ * Response de GET /api/votos/estado/: estado de la cédula para todos los cargos
+ */
+data class EstadoCedulaResponse(
+    val cargos: List<EstadoCargo>
+)
+
+data class EstadoCargo(
+    val cargo: String,
+    @SerializedName("cargo_id")
+    val cargoId: Int,
+    @SerializedName("puede_votar")
+    val puedeVotar: Boolean,
+    @SerializedName("ya_voto")
+    val yaVoto: Boolean,
+    val voto: VotoCedula?,
+    @SerializedName("candidatos_elegibles")
+    val candidatosElegibles: Int
+)
+
+/**
+ * Voto ya emitido para un cargo (dentro de EstadoCargo)
+ */
+data class VotoCedula(
+    @SerializedName("candidato_id")
+    val candidatoId: Int,
+    val candidato: String,
+    @SerializedName("created_at")
+    val createdAt: String
+)
+
 /**
  * Resultado general de elecciones
  */
@@ -49,6 +49,28 @@ class VotosRepository {
         }
     }
 
+    /**
+     * Emite varios votos (toda la cédula) en una sola petición
+     * Requiere autenticación (JWT token)
+     */
+    suspend fun votarLote(candidatoIds: List<Int>): Resource<VotoLoteResponse> {
+        return try {
+            val response = api.votarLote(VotoLoteRequest(candidatoIds))
+            val body = response.body()
+            if (response.isSuccessful && body != null) {
+                Resource.Success(body)
+            } else {
+                val errorMessage = parseErrorMessage(
+                    response.errorBody()?.string(),
+                    "No se pudieron registrar los votos"
+                )
+                Resource.Error(errorMessage)
+            }
+        } catch (e: Exception) {
+            Resource.Error("Error de conexión: ${e.localizedMessage ?: "Inténtalo nuevamente"}")
+        }
+    }
+
     /**
      * Obtiene todos los votos que ha emitido el usuario autenticado
      * Requiere autenticación (JWT token)
@@ -71,6 +93,28 @@ class VotosRepository {
         }
     }
 
+    /**
+     * Obtiene el estado de la cédula para todos los cargos en una sola llamada
+     * Requiere autenticación (JWT token)
+     */
+    suspend fun getEstadoCedula(): Resource<EstadoCedulaResponse> {
+        return try {
+            val response = api.getEstado()
+            val body = response.body()
+            if (response.isSuccessful && body != null) {
+                Resource.Success(body)
+            } else {
+                val errorMessage = parseErrorMessage(
+                    response.errorBody()?.string(),
+                    "Error al verificar si puedes votar"
+                )
+                Resource.Error(errorMessage)
+            }
+        } catch (e: Exception) {
+            Resource.Error("Error de conexión: ${e.localizedMessage ?: "Inténtalo nuevamente"}")
+        }
+    }
+
     /**
      * Verifica si el usuario ya votó por un cargo específico
      * Requiere autenticación (JWT token)
@@ -92,37 +92,19 @@ class VotarViewModel : ViewModel() {
     }
 
     suspend fun verificarEstadoVotos() {
-        // Verificar si puede votar por cada cargo
-        when (val result = votosRepository.puedeVotar("Presidente")) {
+        // Una sola llamada para los tres cargos
+        when (val result = votosRepository.getEstadoCedula()) {
             is Resource.Success -> {
-                result.data?.let {
-                    _votarState.value = _votarState.value.copy(
-                        puedeVotarPresidente = it.puedeVotar,
-                        yaVotoPresidente = it.yaVoto
-                    )
-                }
-            }
-            else -> {}
-        }
-
-        when (val result = votosRepository.puedeVotar("Senador")) {
-            is Resource.Success -> {
-                result.data?.let {
-                    _votarState.value = _votarState.value.copy(
-                        puedeVotarSenador = it.puedeVotar,
-                        yaVotoSenador = it.yaVoto
-                    )
-                }
-            }
-            else -> {}
-        }
-
-        when (val result = votosRepository.puedeVotar("Diputado")) {
-            is Resource.Success -> {
-                result.data?.let {
-                    _votarState.value = _votarState.value.copy(
-                        puedeVotarDiputado = it.puedeVotar,
-                        yaVotoDiputado = it.yaVoto
+                result.data?.cargos?.let { cargos ->
+                    val porCargo = cargos.associateBy { it.cargo }
+                    val estado = _votarState.value
+                    _votarState.value = estado.copy(
+                        puedeVotarPresidente = porCargo["Presidente"]?.puedeVotar ?: estado.puedeVotarPresidente,
+                        yaVotoPresidente = porCargo["Presidente"]?.yaVoto ?: estado.yaVotoPresidente,
+                        puedeVotarSenador = porCargo["Senador"]?.puedeVotar ?: estado.puedeVotarSenador,
+                        yaVotoSenador = porCargo["Senador"]?.yaVoto ?: estado.yaVotoSenador,
+                        puedeVotarDiputado = porCargo["Diputado"]?.puedeVotar ?: estado.puedeVotarDiputado,
+                        yaVotoDiputado = porCargo["Diputado"]?.yaVoto ?: estado.yaVotoDiputado
                     )
                 }
             }